@@ -1,6 +1,6 @@
 from datetime import datetime, timedelta
 from typing import Optional, Union
-from jose import JWTError, jwt
+from jose import JWTError, jwt, jwk
 from passlib.context import CryptContext
 from pydantic import BaseModel, Field, validator
 from sqlalchemy.orm import Session
@@ -9,6 +9,11 @@ from crypto import encrypt_sensitive_data, decrypt_sensitive_data
 import os
 import re
 import secrets
+import hashlib
+import threading
+import time
+from collections import deque, OrderedDict
+from itertools import islice
 from dotenv import load_dotenv
 from pathlib import Path
 
@@ -19,7 +24,17 @@ load_dotenv(project_root / '.env')
 # Security configuration
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
+# HMAC key object built once; passing a jose Key skips per-call key parsing/construction
+SIGNING_KEY = jwk.construct(SECRET_KEY, ALGORITHM) if SECRET_KEY else SECRET_KEY
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
+IP_HISTORY_LIMIT = 10  # Login IPs remembered per user
+TOKEN_CACHE_TTL = 30  # seconds a verified token is trusted without re-decoding
+TOKEN_CACHE_SIZE = 10000
+
+# Verified access tokens: sha256(token) -> (expires_at, TokenData), LRU ordered.
+# Only successful verifications are stored; sync endpoints run in a threadpool.
+_token_cache: "OrderedDict[str, tuple[float, TokenData]]" = OrderedDict()
+_token_cache_lock = threading.Lock()
 
 # Password hashing context using Argon2 (more secure than bcrypt)
 pwd_context = CryptContext(schemes=["argon2", "bcrypt"], deprecated="auto")
@@ -99,13 +114,37 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     if "sensitive_data" in to_encode:
         to_encode["sensitive_data"] = encrypt_sensitive_data(to_encode["sensitive_data"])
     
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, SIGNING_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 def verify_token(token: str) -> Optional[TokenData]:
-    """Verify and decode a JWT token with enhanced security checks."""
+    """Verify a JWT token, reusing a recent successful verification of the same token."""
+    key = hashlib.sha256(token.encode()).hexdigest()
+    now = time.time()
+    with _token_cache_lock:
+        entry = _token_cache.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                _token_cache.move_to_end(key)
+                return entry[1]
+            del _token_cache[key]
+
+    verified = _decode_access_token(token)
+    if verified is None:
+        return None
+    token_data, token_exp = verified
+    expires_at = min(token_exp, now + TOKEN_CACHE_TTL)
+    with _token_cache_lock:
+        _token_cache[key] = (expires_at, token_data)
+        _token_cache.move_to_end(key)
+        while len(_token_cache) > TOKEN_CACHE_SIZE:
+            _token_cache.popitem(last=False)
+    return token_data
+
+def _decode_access_token(token: str) -> Optional[tuple[TokenData, float]]:
+    """Decode a JWT token with enhanced security checks, returning its data and expiry."""
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, SIGNING_KEY, algorithms=[ALGORITHM])
         
         # Verify token type
         if payload.get("type") != "access_token":
@@ -121,7 +160,7 @@ def verify_token(token: str) -> Optional[TokenData]:
             return None
             
         token_data = TokenData(username=username)
-        return token_data
+        return token_data, float(payload.get("exp", time.time()))
     except JWTError:
         return None
 
@@ -184,16 +223,17 @@ def update_login_ip_history(user: User, client_ip: str):
         "timestamp": datetime.utcnow().isoformat()
     }
     
-    # Remove IP if it already exists
-    ip_history = [entry for entry in ip_history if entry["ip"] != client_ip]
+    # Remove IP if it already exists, keeping only last 10 entries
+    # (bounded deque: appendleft drops the oldest entry in O(1))
+    ip_history = deque(
+        islice((entry for entry in ip_history if entry["ip"] != client_ip), IP_HISTORY_LIMIT),
+        maxlen=IP_HISTORY_LIMIT
+    )
     
     # Add new entry at the beginning
-    ip_history.insert(0, ip_entry)
-    
-    # Keep only last 10 entries
-    ip_history = ip_history[:10]
+    ip_history.appendleft(ip_entry)
     
-    user.login_ip_history = json.dumps(ip_history)
+    user.login_ip_history = json.dumps(list(ip_history))
 
 def create_user(db: Session, user: UserCreate) -> User:
     """Create a new user."""
@@ -279,17 +319,17 @@ def generate_email_verification_token(user_id: int) -> str:
         "type": "email_verification",
         "exp": datetime.utcnow() + timedelta(hours=24)
     }
-    return jwt.encode(data, SECRET_KEY, algorithm=ALGORITHM)
+    return jwt.encode(data, SIGNING_KEY, algorithm=ALGORITHM)
 
 def verify_email_verification_token(db: Session, token: str) -> Optional[User]:
     """Verify email verification token."""
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, SIGNING_KEY, algorithms=[ALGORITHM])
         if payload.get("type") != "email_verification":
             return None
         
         user_id = int(payload.get("sub"))
-        user = db.query(User).filter(User.id == user_id).first()
+        user = db.get(User, user_id)
         
         if user and not user.is_verified:
             user.is_verified = True
@@ -1,4 +1,5 @@
 from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from slowapi import Limiter, _rate_limit_exceeded_handler
@@ -6,10 +7,18 @@ from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 import os
 import sys
+import queue
+import atexit
 import logging
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
 # Add backend directory to path for relative imports
 backend_dir = Path(__file__).parent
 project_root = backend_dir.parent
@@ -21,17 +30,43 @@ if str(project_root) not in sys.path:
 # Load .env from project root (not backend/.env)
 load_dotenv(project_root / '.env')
 
-# Initialize logger
-logging.basicConfig(level=logging.INFO)
+# Initialize logger. Handlers only enqueue records; a listener thread does the
+# stream IO, so logging from request handlers never blocks on stdout/stderr.
+_log_queue = queue.SimpleQueue()
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+_queue_handler = QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter("%(message)s"))  # final format is applied by the listener
+logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
+_log_listener = QueueListener(_log_queue, _log_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger(__name__)
 
 # Router imports
 from backend.routers import auth, prompts, security, temporal, storage, agents
 
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson when it is installed.
+    
+    Most endpoints return plain dicts (security logs, token history, version
+    timelines), which FastAPI encodes with the stdlib json module; orjson
+    produces the same JSON several times faster.
+    """
+    
+    def render(self, content) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
 app = FastAPI(
     title="Secure Authentication API",
     version="1.0.0",
-    description="Production-ready authentication system with end-to-end encryption"
+    description="Production-ready authentication system with end-to-end encryption",
+    default_response_class=FastJSONResponse
 )
 
 # Rate limiting
@@ -1,3 +1,6 @@
+import asyncio
+import logging
+
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
@@ -20,6 +23,7 @@ from auth import (
 # Router configuration
 router = APIRouter(prefix="", tags=["authentication"])
 security = HTTPBearer()
+logger = logging.getLogger(__name__)
 
 # Initialize limiter (will be set from app state)
 limiter = Limiter(key_func=get_remote_address)
@@ -50,7 +54,7 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     if token_data is None:
         raise credentials_exception
     
-    user = get_user_by_username(db, username=token_data.username)
+    user = await asyncio.to_thread(get_user_by_username, db, username=token_data.username)
     if user is None:
         raise credentials_exception
     
@@ -66,7 +70,8 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
 async def register(request: Request, user: UserCreate, db: Session = Depends(get_db)):
     """Register a new user with enhanced validation."""
     try:
-        db_user = create_user(db, user)
+        # Argon2 hashing and the insert run off the event loop
+        db_user = await asyncio.to_thread(create_user, db, user)
         return UserResponse.model_validate(db_user)
     except ValueError as e:
         raise HTTPException(
@@ -81,7 +86,10 @@ async def login(request: Request, login_data: LoginRequest, db: Session = Depend
     # Get client IP for security tracking
     client_ip = get_remote_address(request)
     
-    user = authenticate_user(db, login_data.username, login_data.password, client_ip)
+    # Password verification is deliberately slow; keep it off the event loop
+    user = await asyncio.to_thread(
+        authenticate_user, db, login_data.username, login_data.password, client_ip
+    )
     if not user:
         # Check if account is locked
         potential_user = db.query(User).filter(
@@ -154,7 +162,7 @@ async def request_password_reset(request: Request, reset_request: PasswordResetR
     # In production, send email with token here
     # For demo purposes, we'll log it
     if token:
-        print(f"Password reset token for {reset_request.email}: {token}")
+        logger.info("Password reset token for %s: %s", reset_request.email, token)
     
     return {"message": "If the email exists, a password reset link has been sent"}
 
@@ -170,7 +178,7 @@ async def reset_password(request: Request, reset_data: PasswordResetConfirm, db:
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     
-    success = reset_user_password(db, reset_data.token, reset_data.new_password)
+    success = await asyncio.to_thread(reset_user_password, db, reset_data.token, reset_data.new_password)
     
     if not success:
         raise HTTPException(
@@ -189,14 +197,14 @@ async def change_password(
 ):
     """Change user password (requires authentication)."""
     # Verify current password
-    if not verify_password(change_data.current_password, current_user.hashed_password):
+    if not await asyncio.to_thread(verify_password, change_data.current_password, current_user.hashed_password):
         raise HTTPException(
             status_code=400,
             detail="Current password is incorrect"
         )
     
     # Check password reuse
-    if check_password_reuse(db, current_user, change_data.new_password):
+    if await asyncio.to_thread(check_password_reuse, db, current_user, change_data.new_password):
         raise HTTPException(
             status_code=400,
             detail="New password cannot be the same as current password"
@@ -210,7 +218,7 @@ async def change_password(
         raise HTTPException(status_code=400, detail=str(e))
     
     # Update password
-    current_user.hashed_password = get_password_hash(change_data.new_password)
+    current_user.hashed_password = await asyncio.to_thread(get_password_hash, change_data.new_password)
     current_user.last_password_change = datetime.utcnow()
     db.commit()
     
@@ -1,16 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request
-from fastapi.security import HTTPBearer
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Request
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+from collections import OrderedDict
 from datetime import datetime
 import uuid
+import time
+import hashlib
+import asyncio
 import logging
 
 # Database imports
-from database import get_db, User
+from database import User
 from packages.db.session import get_session
-from packages.db.models import Prompt, PromptVersion, JudgeScore
 from packages.db.crud import (
     create_prompt_row,
     create_version_row,
@@ -21,6 +22,7 @@ from packages.db.crud import (
     get_prompt_by_request_id,
     get_agent_effectiveness_from_feedback,
     get_token_usage_by_user,
+    get_prompt_summaries_by_user,
     maybe_update_best_head
 )
 
@@ -31,7 +33,7 @@ from slowapi.util import get_remote_address
 
 # Agent modules
 from packages.core.agent_registry import AgentRegistry
-from packages.core.agent_coordinator import AgentCoordinator
+from packages.core.agent_coordinator import AgentCoordinator, CoordinatorDecision
 from packages.core.judge import Scorecard
 from packages.core.token_tracker import TokenTracker, TokenUsage
 from packages.core.security_analyzer import SecurityAnalyzer, SecurityAssessment
@@ -46,6 +48,9 @@ limiter = Limiter(key_func=get_remote_address)
 # Router definition (no prefix - endpoints specify full paths)
 router = APIRouter(tags=["prompts"])
 
+# Characters of prompt text shown per prompt in listings
+PROMPT_SUMMARY_LENGTH = 60
+
 # ============================================================================
 # PYDANTIC MODELS
 # ============================================================================
@@ -84,6 +89,10 @@ class FeedbackRequest(BaseModel):
 _multi_agent_coordinator = None
 # Singleton file storage (Week 11 - Phase 2)
 _file_storage = None
+# Recent coordinator decisions keyed by normalized prompt text (LRU + TTL)
+_decision_cache: "OrderedDict[str, Tuple[float, CoordinatorDecision]]" = OrderedDict()
+DECISION_CACHE_TTL = 3600  # seconds
+DECISION_CACHE_SIZE = 2048
 
 def get_multi_agent_coordinator() -> AgentCoordinator:
     """Get coordinator with default agents (syntax, structure, domain)"""
@@ -106,10 +115,181 @@ def get_file_storage() -> FileStorage:
     
     return _file_storage
 
+def decision_cache_key(text: str) -> str:
+    """Cache key for a prompt: hash of the stripped, lower-cased text."""
+    return hashlib.sha256(text.strip().lower().encode("utf-8")).hexdigest()
+
+def get_cached_decision(key: str) -> Optional[CoordinatorDecision]:
+    """Return a cached coordinator decision if present and not expired."""
+    entry = _decision_cache.get(key)
+    if entry is None:
+        return None
+    stored_at, decision = entry
+    if time.monotonic() - stored_at > DECISION_CACHE_TTL:
+        del _decision_cache[key]
+        return None
+    _decision_cache.move_to_end(key)
+    return decision
+
+def cache_decision(key: str, decision: CoordinatorDecision) -> None:
+    """Store a coordinator decision, evicting the least recently used entry when full."""
+    _decision_cache[key] = (time.monotonic(), decision)
+    _decision_cache.move_to_end(key)
+    while len(_decision_cache) > DECISION_CACHE_SIZE:
+        _decision_cache.popitem(last=False)
+
+# Per-agent usage fields that measure spend; anything else (e.g. "model") is kept as-is
+USAGE_SPEND_FIELDS = ("prompt_tokens", "completion_tokens", "total_tokens", "cost_usd")
+
+def _zero_usage(usage: Dict[str, Any]) -> Dict[str, Any]:
+    """Same usage dict with the token counts and cost set to zero."""
+    return {key: type(value)(0) if key in USAGE_SPEND_FIELDS else value for key, value in usage.items()}
+
+def decision_without_spend(decision: CoordinatorDecision) -> CoordinatorDecision:
+    """Copy of a cached decision reporting zero tokens and cost, since no LLM calls were made."""
+    agent_results = [
+        result.model_copy(update={"token_usage": _zero_usage(result.token_usage) if result.token_usage else None})
+        for result in decision.agent_results
+    ]
+    token_usage = {name: _zero_usage(usage) for name, usage in (decision.token_usage or {}).items()}
+    return decision.model_copy(update={
+        "agent_results": agent_results,
+        "token_usage": token_usage or None,
+        "total_cost_usd": 0.0,
+        "total_tokens": 0,
+    })
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
+def save_security_input(user_id: str, text: str, assessment: SecurityAssessment) -> None:
+    """Record the security assessment of an incoming prompt."""
+    with get_session() as session:
+        create_security_input_row(
+            session=session,
+            user_id=user_id,
+            input_text=text,
+            risk_score=assessment.risk_score,
+            label=assessment.label,
+            is_blocked=assessment.is_blocked,
+            analysis_metadata=assessment.analysis_metadata
+        )
+        session.commit()
+
+def save_multi_agent_decision(
+    user_id: str,
+    prompt_data: PromptEnhanceRequest,
+    decision: CoordinatorDecision,
+    request_id: str,
+    record_agent_tokens: bool = True
+) -> str:
+    """
+    Persist a multi-agent run (prompt, agent versions, scores, token usage); returns the prompt id.
+    
+    record_agent_tokens=False skips the per-agent token rows, used when the decision
+    came from the cache and no LLM tokens were spent.
+    """
+    with get_session() as session:
+        # Create prompt record with user_id and request_id
+        prompt = create_prompt_row(
+            session=session,
+            user_id=user_id,  # USER-SPECIFIC
+            original_text=prompt_data.text,
+            request_id=request_id  # For feedback linkage
+        )
+        
+        # Create version for original prompt
+        original_version = create_version_row(
+            session=session,
+            prompt_id=prompt.id,
+            version_no=1,
+            text=prompt_data.text,
+            explanation={"source": "user_input", "enhancement_type": prompt_data.enhancement_type},
+            source="user_input"
+        )
+        
+        # SAVE TOKEN USAGE FOR ORIGINAL PROMPT (Database-First Pattern 2025-12-04)
+        # Track original prompt tokens (estimate based on text)
+        tracker = TokenTracker()
+        original_tokens = tracker.count_tokens(prompt_data.text)
+        original_token_usage = TokenUsage(
+            prompt_tokens=original_tokens,
+            completion_tokens=0,  # No completion for original (just the prompt itself)
+            total_tokens=original_tokens,
+            model="user_input",  # Source is user input
+            timestamp=datetime.now(),
+            cost_usd=0.0  # No cost for user input
+        )
+        create_token_usage_row(session, original_version.id, original_token_usage)
+        
+        # SAVE INDIVIDUAL AGENT VERSIONS (Fix for Agent Effectiveness Dashboard)
+        # Create version for EACH agent (syntax, structure, domain) so dashboard can track effectiveness
+        version_no = 2
+        winning_version_id = None
+        
+        for agent_result in decision.agent_results:
+            agent_version = create_version_row(
+                session=session,
+                prompt_id=prompt.id,
+                version_no=version_no,
+                text=agent_result.suggestions.improved_prompt,
+                explanation={
+                    "source": agent_result.agent_name,
+                    "analysis": {
+                        "score": agent_result.analysis.score,
+                        "strengths": agent_result.analysis.strengths,
+                        "weaknesses": agent_result.analysis.weaknesses
+                    },
+                    "confidence": agent_result.suggestions.confidence,
+                    "suggestions": agent_result.suggestions.suggestions
+                },
+                source=agent_result.agent_name  # ← Key: "syntax"/"structure"/"domain"
+            )
+            
+            # Save token usage for this agent's execution
+            if record_agent_tokens and agent_result.token_usage:
+                agent_token_usage = TokenUsage(
+                    prompt_tokens=agent_result.token_usage.get("prompt_tokens", 0),
+                    completion_tokens=agent_result.token_usage.get("completion_tokens", 0),
+                    total_tokens=agent_result.token_usage.get("total_tokens", 0),
+                    model=agent_result.token_usage.get("model", agent_result.agent_name),
+                    timestamp=datetime.now(),
+                    cost_usd=agent_result.token_usage.get("cost_usd", 0.0)
+                )
+                create_token_usage_row(session, agent_version.id, agent_token_usage)
+            
+            # Create judge score from agent's analysis (map 0-10 score to 0-20 per category)
+            # Agent score is 0-10, judge expects 5 categories each 0-20
+            score_per_category = (agent_result.analysis.score / 10.0) * 20.0
+            agent_scorecard = Scorecard(
+                clarity=score_per_category,
+                specificity=score_per_category,
+                actionability=score_per_category,
+                structure=score_per_category,
+                context_use=score_per_category,
+                feedback={"agent": agent_result.agent_name, "confidence": agent_result.suggestions.confidence},
+                total=agent_result.analysis.score * 10.0  # 0-10 → 0-100
+            )
+            create_judge_score_row(session, agent_version.id, agent_scorecard)
+            
+            # Track winning version for best_head marking
+            if agent_result.agent_name == decision.selected_agent:
+                winning_version_id = agent_version.id
+            
+            version_no += 1
+        
+        # Mark winning agent's version as best_head
+        if winning_version_id:
+            winning_score = next(
+                r.analysis.score * 10.0 for r in decision.agent_results 
+                if r.agent_name == decision.selected_agent
+            )
+            maybe_update_best_head(session, prompt.id, winning_version_id, winning_score)
+        
+        session.commit()
+        return str(prompt.id)
+
 def apply_prompt_enhancement(text: str, enhancement_type: str, context: Optional[str] = None) -> str:
     """Apply prompt enhancement using structured template approach."""
     
@@ -218,6 +398,7 @@ from routers.auth import get_current_user
 async def enhance_prompt(
     request: Request,
     prompt_data: PromptEnhanceRequest,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user)
 ):
     """Enhance a text prompt using AI optimization techniques."""
@@ -226,21 +407,11 @@ async def enhance_prompt(
         analyzer = SecurityAnalyzer()
         security_assessment = analyzer.analyze(prompt_data.text)
         
-        # Save security input to database (PT:2 Database-First)
-        with get_session() as session:
-            create_security_input_row(
-                session=session,
-                user_id=str(current_user.id),
-                input_text=prompt_data.text,
-                risk_score=security_assessment.risk_score,
-                label=security_assessment.label,
-                is_blocked=security_assessment.is_blocked,
-                analysis_metadata=security_assessment.analysis_metadata
-            )
-            session.commit()
-        
-        # Block high-risk prompts
+        # Block high-risk prompts (recorded inline: background tasks don't run on error responses)
         if security_assessment.is_blocked:
+            await asyncio.to_thread(
+                save_security_input, str(current_user.id), prompt_data.text, security_assessment
+            )
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail={
@@ -251,6 +422,11 @@ async def enhance_prompt(
                 }
             )
         
+        # Save security input to database after the response is sent (PT:2 Database-First)
+        background_tasks.add_task(
+            save_security_input, str(current_user.id), prompt_data.text, security_assessment
+        )
+        
         # Encrypt the original prompt for storage
         encrypted_text = encrypt_sensitive_data(prompt_data.text)
         
@@ -284,26 +460,37 @@ async def enhance_prompt(
 @router.get("/api/prompts")
 async def get_user_prompts(
     current_user: User = Depends(get_current_user),
-    limit: int = 50
+    limit: int = 50,
+    offset: int = 0
 ):
-    """Get authenticated user's prompts."""
+    """
+    Get authenticated user's prompts, newest first (paged with limit/offset).
+    
+    Each prompt is listed with a short summary of its text rather than the
+    full text, which is only needed once a prompt is opened.
+    """
     try:
         with get_session() as session:
-            prompts = session.query(Prompt).filter(
-                Prompt.user_id == str(current_user.id)
-            ).order_by(Prompt.created_at.desc()).limit(limit).all()
+            # Fetch one extra row to tell whether another page exists
+            prompts = get_prompt_summaries_by_user(
+                session, str(current_user.id), limit=limit + 1, offset=offset, summary_length=PROMPT_SUMMARY_LENGTH
+            )
+            has_more = len(prompts) > limit
+            prompts = prompts[:limit]
             
             return {
                 "success": True,
                 "data": [
                     {
                         "id": str(p.id),
-                        "original_text": p.original_text,
+                        "summary": p.summary if len(p.summary) <= PROMPT_SUMMARY_LENGTH else p.summary[:PROMPT_SUMMARY_LENGTH] + "...",
                         "created_at": p.created_at.isoformat(),
                         "user_id": p.user_id
                     }
                     for p in prompts
-                ]
+                ],
+                "has_more": has_more,
+                "next_offset": offset + len(prompts) if has_more else None
             }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -311,15 +498,20 @@ async def get_user_prompts(
 @router.get("/api/tokens")
 async def get_user_token_history(
     current_user: User = Depends(get_current_user),
-    limit: int = 100
+    limit: int = 100,
+    offset: int = 0
 ):
     """
     Get authenticated user's token usage history (Database-First Pattern 2025-12-04).
-    Returns all token records for the user across all prompts and versions.
+    Returns token records for the user across all prompts and versions, newest
+    first, one page (limit/offset) at a time; totals cover the returned page.
     """
     try:
         with get_session() as session:
-            token_records = get_token_usage_by_user(session, str(current_user.id), limit=limit)
+            # Fetch one extra row to tell whether another page exists
+            token_records = get_token_usage_by_user(session, str(current_user.id), limit=limit + 1, offset=offset)
+            has_more = len(token_records) > limit
+            token_records = token_records[:limit]
             
             return {
                 "success": True,
@@ -338,10 +530,12 @@ async def get_user_token_history(
                 ],
                 "total_records": len(token_records),
                 "total_tokens": sum(r.total_tokens for r in token_records),
-                "total_cost": sum(r.cost_usd for r in token_records)
+                "total_cost": sum(r.cost_usd for r in token_records),
+                "has_more": has_more,
+                "next_offset": offset + len(token_records) if has_more else None
             }
     except Exception as e:
-        logger.error(f"Failed to get token history: {e}", exc_info=True)
+        logger.error("Failed to get token history: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to get token history: {str(e)}")
 
 @router.post("/prompts/save")
@@ -349,6 +543,7 @@ async def get_user_token_history(
 async def save_prompt(
     request: Request,
     prompt_data: PromptInput,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user)
 ):
     """Save a prompt to user's collection."""
@@ -357,21 +552,11 @@ async def save_prompt(
         analyzer = SecurityAnalyzer()
         security_assessment = analyzer.analyze(prompt_data.text)
         
-        # Save security input to database (PT:2 Database-First)
-        with get_session() as session:
-            create_security_input_row(
-                session=session,
-                user_id=str(current_user.id),
-                input_text=prompt_data.text,
-                risk_score=security_assessment.risk_score,
-                label=security_assessment.label,
-                is_blocked=security_assessment.is_blocked,
-                analysis_metadata=security_assessment.analysis_metadata
-            )
-            session.commit()
-        
-        # Block high-risk prompts
+        # Block high-risk prompts (recorded inline: background tasks don't run on error responses)
         if security_assessment.is_blocked:
+            await asyncio.to_thread(
+                save_security_input, str(current_user.id), prompt_data.text, security_assessment
+            )
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail={
@@ -382,6 +567,11 @@ async def save_prompt(
                 }
             )
         
+        # Save security input to database after the response is sent (PT:2 Database-First)
+        background_tasks.add_task(
+            save_security_input, str(current_user.id), prompt_data.text, security_assessment
+        )
+        
         # Encrypt sensitive prompt data
         encrypted_text = encrypt_sensitive_data(prompt_data.text)
         
@@ -432,21 +622,15 @@ async def multi_agent_enhance(
         analyzer = SecurityAnalyzer()  # Uses default keywords and threshold=80
         security_assessment = analyzer.analyze(prompt_data.text)
         
-        # Save security input to database (PT:2 Database-First)
-        with get_session() as session:
-            create_security_input_row(
-                session=session,
-                user_id=str(current_user.id),
-                input_text=prompt_data.text,
-                risk_score=security_assessment.risk_score,
-                label=security_assessment.label,
-                is_blocked=security_assessment.is_blocked,
-                analysis_metadata=security_assessment.analysis_metadata
-            )
-            session.commit()
+        # Save security input to database (PT:2 Database-First); started now so the
+        # write overlaps the agent LLM calls below
+        save_security = asyncio.create_task(asyncio.to_thread(
+            save_security_input, str(current_user.id), prompt_data.text, security_assessment
+        ))
         
         # Block high-risk prompts (risk_score >= 80)
         if security_assessment.is_blocked:
+            await save_security
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail={
@@ -459,117 +643,32 @@ async def multi_agent_enhance(
             )
         
         # Get coordinator (uses registry internally)
-        coordinator = get_multi_agent_coordinator()
-        decision = await coordinator.coordinate(prompt_data.text)
+        # Identical prompts reuse a recent decision instead of re-running the agents
+        cache_key = decision_cache_key(prompt_data.text)
+        decision = get_cached_decision(cache_key)
+        cached = decision is not None
+        if cached:
+            await save_security
+            decision = decision_without_spend(decision)
+        else:
+            coordinator = get_multi_agent_coordinator()
+            _, decision = await asyncio.gather(save_security, coordinator.coordinate(prompt_data.text))
+            cache_decision(cache_key, decision)
         
         # Generate request ID for tracking (BEFORE database save)
         request_id = str(uuid.uuid4())
         
         # SAVE PROMPT TO DATABASE WITH USER_ID AND REQUEST_ID
-        with get_session() as session:
-            # Create prompt record with user_id and request_id
-            prompt = create_prompt_row(
-                session=session,
-                user_id=str(current_user.id),  # USER-SPECIFIC
-                original_text=prompt_data.text,
-                request_id=request_id  # For feedback linkage
-            )
-            
-            # Create version for original prompt
-            original_version = create_version_row(
-                session=session,
-                prompt_id=prompt.id,
-                version_no=1,
-                text=prompt_data.text,
-                explanation={"source": "user_input", "enhancement_type": prompt_data.enhancement_type},
-                source="user_input"
-            )
-            
-            # SAVE TOKEN USAGE FOR ORIGINAL PROMPT (Database-First Pattern 2025-12-04)
-            # Track original prompt tokens (estimate based on text)
-            tracker = TokenTracker()
-            original_tokens = tracker.count_tokens(prompt_data.text)
-            original_token_usage = TokenUsage(
-                prompt_tokens=original_tokens,
-                completion_tokens=0,  # No completion for original (just the prompt itself)
-                total_tokens=original_tokens,
-                model="user_input",  # Source is user input
-                timestamp=datetime.now(),
-                cost_usd=0.0  # No cost for user input
-            )
-            create_token_usage_row(session, original_version.id, original_token_usage)
-            
-            # SAVE INDIVIDUAL AGENT VERSIONS (Fix for Agent Effectiveness Dashboard)
-            # Create version for EACH agent (syntax, structure, domain) so dashboard can track effectiveness
-            version_no = 2
-            winning_version_id = None
-            
-            for agent_result in decision.agent_results:
-                agent_version = create_version_row(
-                    session=session,
-                    prompt_id=prompt.id,
-                    version_no=version_no,
-                    text=agent_result.suggestions.improved_prompt,
-                    explanation={
-                        "source": agent_result.agent_name,
-                        "analysis": {
-                            "score": agent_result.analysis.score,
-                            "strengths": agent_result.analysis.strengths,
-                            "weaknesses": agent_result.analysis.weaknesses
-                        },
-                        "confidence": agent_result.suggestions.confidence,
-                        "suggestions": agent_result.suggestions.suggestions
-                    },
-                    source=agent_result.agent_name  # ← Key: "syntax"/"structure"/"domain"
-                )
-                
-                # Save token usage for this agent's execution
-                if agent_result.token_usage:
-                    agent_token_usage = TokenUsage(
-                        prompt_tokens=agent_result.token_usage.get("prompt_tokens", 0),
-                        completion_tokens=agent_result.token_usage.get("completion_tokens", 0),
-                        total_tokens=agent_result.token_usage.get("total_tokens", 0),
-                        model=agent_result.token_usage.get("model", agent_result.agent_name),
-                        timestamp=datetime.now(),
-                        cost_usd=agent_result.token_usage.get("cost_usd", 0.0)
-                    )
-                    create_token_usage_row(session, agent_version.id, agent_token_usage)
-                
-                # Create judge score from agent's analysis (map 0-10 score to 0-20 per category)
-                # Agent score is 0-10, judge expects 5 categories each 0-20
-                score_per_category = (agent_result.analysis.score / 10.0) * 20.0
-                agent_scorecard = Scorecard(
-                    clarity=score_per_category,
-                    specificity=score_per_category,
-                    actionability=score_per_category,
-                    structure=score_per_category,
-                    context_use=score_per_category,
-                    feedback={"agent": agent_result.agent_name, "confidence": agent_result.suggestions.confidence},
-                    total=agent_result.analysis.score * 10.0  # 0-10 → 0-100
-                )
-                create_judge_score_row(session, agent_version.id, agent_scorecard)
-                
-                # Track winning version for best_head marking
-                if agent_result.agent_name == decision.selected_agent:
-                    winning_version_id = agent_version.id
-                
-                version_no += 1
-            
-            # Mark winning agent's version as best_head
-            if winning_version_id:
-                winning_score = next(
-                    r.analysis.score * 10.0 for r in decision.agent_results 
-                    if r.agent_name == decision.selected_agent
-                )
-                maybe_update_best_head(session, prompt.id, winning_version_id, winning_score)
-            
-            session.commit()
-            prompt_id = str(prompt.id)
+        # Blocking DB work runs in a worker thread so it doesn't stall the event loop
+        prompt_id = await asyncio.to_thread(
+            save_multi_agent_decision, str(current_user.id), prompt_data, decision, request_id,
+            not cached
+        )
         
         # Add model info to response
         agent_results_with_models = []
         for result in decision.agent_results:
-            result_dict = result.dict()
+            result_dict = result.model_dump()
             
             # Add model info from registry
             metadata = AgentRegistry.get_metadata(result.agent_name)
@@ -600,12 +699,13 @@ async def multi_agent_enhance(
                 "token_usage": decision.token_usage,  # Per-agent token usage
                 "total_cost_usd": decision.total_cost_usd,  # Total cost across all agents
                 "total_tokens": decision.total_tokens,  # Total tokens across all agents
+                "cached": cached,  # True when served from the decision cache (usage above is zero)
                 "created_at": datetime.utcnow().isoformat(),
                 "user_id": current_user.id
             }
         }
     except Exception as e:
-        logger.error(f"Multi-agent enhancement failed: {e}", exc_info=True)
+        logger.error("Multi-agent enhancement failed: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Multi-agent enhancement failed: {str(e)}"
@@ -641,6 +741,8 @@ async def record_user_feedback(
                 detail="Invalid user_choice. Must be 'original', 'single', or 'multi'"
             )
         
+        user_id = str(current_user.id)
+        
         # Database-First Pattern: Save to PostgreSQL (not CSV)
         with get_session() as session:
             # Find prompt by request_id
@@ -653,7 +755,7 @@ async def record_user_feedback(
                 )
             
             # Verify prompt belongs to current user (security)
-            if prompt.user_id != str(current_user.id):
+            if prompt.user_id != user_id:
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="Cannot submit feedback for another user's prompt"
@@ -663,7 +765,7 @@ async def record_user_feedback(
             feedback_record = create_feedback_row(
                 session=session,
                 request_id=feedback.request_id,
-                user_id=str(current_user.id),
+                user_id=user_id,
                 prompt_id=prompt.id,
                 user_choice=feedback.user_choice,
                 judge_winner=feedback.judge_winner,
@@ -686,7 +788,7 @@ async def record_user_feedback(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to record feedback: {e}", exc_info=True)
+        logger.error("Failed to record feedback: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to record feedback: {str(e)}"
@@ -719,7 +821,7 @@ async def get_available_agents(current_user: User = Depends(get_current_user)):
             "data": {"agents": agents}
         }
     except Exception as e:
-        logger.error(f"Failed to get available agents: {e}", exc_info=True)
+        logger.error("Failed to get available agents: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to get available agents"
@@ -747,7 +849,7 @@ async def get_agent_effectiveness(current_user: User = Depends(get_current_user)
             "data": effectiveness
         }
     except Exception as e:
-        logger.error(f"Failed to get agent effectiveness: {e}", exc_info=True)
+        logger.error("Failed to get agent effectiveness: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to get agent effectiveness"
@@ -1,18 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
-import sys
-from pathlib import Path
+from contextlib import ExitStack
+import json
 
-# Add backend directory to path
-backend_dir = Path(__file__).parent.parent
-if str(backend_dir) not in sys.path:
-    sys.path.insert(0, str(backend_dir))
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
 
 from backend.routers.auth import get_current_user
 from database import User
 from packages.db.session import get_session
-from packages.db.crud import create_security_input_row, get_security_inputs
+from packages.db.crud import create_security_input_row, iter_security_input_batches
 
 router = APIRouter(prefix="/v1/security", tags=["security"])
 
@@ -35,6 +36,40 @@ class SecurityInputResponse(BaseModel):
     analysisMetadata: dict | None
     createdAt: str
 
+def encode_security_input(input) -> bytes:
+    """One security input row as compact JSON bytes."""
+    row = {
+        "id": str(input.id),
+        "userId": input.user_id,
+        "inputText": input.input_text,
+        "riskScore": input.risk_score,
+        "label": input.label,
+        "isBlocked": input.is_blocked,
+        "analysisMetadata": input.analysis_metadata,
+        "createdAt": input.created_at.isoformat()
+    }
+    if orjson is not None:
+        return orjson.dumps(row, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(row, separators=(",", ":")).encode("utf-8")
+
+def stream_security_inputs(stack: ExitStack, first_batch, batches):
+    """
+    Yield a JSON array of security inputs one fetched batch at a time.
+    
+    The query has already run and its first batch was fetched by the caller,
+    so only the remaining batches are read here; stack (holding the session)
+    is closed once the array is finished.
+    """
+    try:
+        yield b"[" + b",".join(encode_security_input(input) for input in first_batch)
+        separator = b"," if first_batch else b""
+        for batch in batches:
+            yield separator + b",".join(encode_security_input(input) for input in batch)
+            separator = b","
+        yield b"]"
+    finally:
+        stack.close()
+
 # Endpoints
 
 @router.post("/inputs", response_model=SecurityInputResponse)
@@ -77,29 +112,30 @@ async def get_security_inputs_endpoint(
     filter_high_risk: bool | None = None,
     current_user: User = Depends(get_current_user)
 ):
-    """Get security inputs with optional filtering (authenticated)"""
+    """
+    Get security inputs with optional filtering (authenticated).
+    
+    The JSON array is streamed in batches as rows come off the cursor rather
+    than built as one list of dicts, so large limits stay cheap in memory.
+    """
+    # Run the query and fetch the first batch before any response is sent, so
+    # database errors still surface as a 500 rather than a truncated 200 body
+    stack = ExitStack()
     try:
-        with get_session() as s:
-            inputs = get_security_inputs(
-                s,
-                limit=limit,
-                filter_label=filter_label,
-                filter_blocked=filter_blocked,
-                filter_high_risk=filter_high_risk
-            )
-            
-            return [
-                {
-                    "id": str(input.id),
-                    "userId": input.user_id,
-                    "inputText": input.input_text,
-                    "riskScore": input.risk_score,
-                    "label": input.label,
-                    "isBlocked": input.is_blocked,
-                    "analysisMetadata": input.analysis_metadata,
-                    "createdAt": input.created_at.isoformat()
-                }
-                for input in inputs
-            ]
+        s = stack.enter_context(get_session())
+        batches = iter_security_input_batches(
+            s,
+            limit=limit,
+            filter_label=filter_label,
+            filter_blocked=filter_blocked,
+            filter_high_risk=filter_high_risk
+        )
+        first_batch = next(batches, [])
     except Exception as e:
+        stack.close()
         raise HTTPException(status_code=500, detail=str(e))
+    
+    return StreamingResponse(
+        stream_security_inputs(stack, first_batch, batches),
+        media_type="application/json"
+    )
@@ -2,22 +2,12 @@ from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from slowapi import Limiter
 from slowapi.util import get_remote_address
-import sys
-from pathlib import Path
 import os
 
-# Add backend directory to path
-backend_dir = Path(__file__).parent.parent
-project_root = backend_dir.parent
-if str(backend_dir) not in sys.path:
-    sys.path.insert(0, str(backend_dir))
-if str(project_root) not in sys.path:
-    sys.path.insert(0, str(project_root))
-
 from backend.routers.auth import get_current_user
 from database import User
 from packages.db.session import get_session
-from packages.db.crud import get_all_prompt_versions
+from packages.db.crud import count_prompts_in_versions, count_prompt_versions
 from storage.file_storage import FileStorage
 
 router = APIRouter(prefix="/api/storage", tags=["storage"])
@@ -48,17 +38,11 @@ async def export_multi_agent_csv(
         
         csv_path = storage.export_multi_agent_results_to_csv()
         
-        # Count records
-        versions = get_all_prompt_versions(session, limit=1000)
-        by_prompt = {}
-        for v in versions:
-            if v.prompt_id not in by_prompt:
-                by_prompt[v.prompt_id] = []
-        
+        # Count records (COUNT DISTINCT in SQL instead of loading the versions)
         return {
             "success": True,
             "csv_path": csv_path,
-            "records": len(by_prompt)
+            "records": count_prompts_in_versions(session, limit=1000)
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
@@ -85,12 +69,10 @@ async def export_temporal_csv(
         csv_path = storage.export_temporal_versions_to_csv()
         
         # Count records
-        versions = get_all_prompt_versions(session, limit=1000)
-        
         return {
             "success": True,
             "csv_path": csv_path,
-            "records": len(versions)
+            "records": count_prompt_versions(session, limit=1000)
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
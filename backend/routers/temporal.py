@@ -1,28 +1,101 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
+import sqlalchemy as sa
 from sqlalchemy.orm import Session
-from datetime import datetime
-import sys
-from pathlib import Path
+from datetime import datetime, timedelta
+from collections import OrderedDict
+import asyncio
+import json
+import time
+import threading
 import uuid
 import random
 
-# Add backend directory to path
-backend_dir = Path(__file__).parent.parent
-if str(backend_dir) not in sys.path:
-    sys.path.insert(0, str(backend_dir))
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
 
 from backend.routers.auth import get_current_user
 from database import User
 from packages.db.session import get_session
 from packages.db.models import Prompt, PromptVersion, JudgeScore
-from temporal_analysis import (
-    detect_trend, detect_change_points, compute_statistics, 
-    compute_causal_hints, compute_score_velocity
-)
+from temporal_analysis import detect_trend, compute_statistics, compute_causal_hints
 
 router = APIRouter(prefix="/api/temporal", tags=["temporal"])
 
+# Serialized statistics / causal-hints responses, keyed on the prompt's history
+# freshness so any new version or score produces a new key (LRU + TTL)
+_response_cache: "OrderedDict[tuple, tuple[float, bytes]]" = OrderedDict()
+_response_cache_lock = threading.Lock()  # endpoints run their work in worker threads
+RESPONSE_CACHE_TTL = 60  # seconds
+RESPONSE_CACHE_SIZE = 256
+
+def history_freshness(session: Session, prompt_uuid: uuid.UUID) -> tuple:
+    """Cheap fingerprint of a prompt's version/score history: counts and latest timestamps."""
+    version_ids = sa.select(PromptVersion.id).where(PromptVersion.prompt_id == prompt_uuid)
+    versions = session.execute(
+        sa.select(sa.func.count(PromptVersion.id), sa.func.max(PromptVersion.created_at))
+        .where(PromptVersion.prompt_id == prompt_uuid)
+    ).one()
+    scores = session.execute(
+        sa.select(sa.func.count(JudgeScore.id), sa.func.max(JudgeScore.created_at))
+        .where(JudgeScore.prompt_version_id.in_(version_ids))
+    ).one()
+    return tuple(versions) + tuple(scores)
+
+def get_cached_response(key: tuple) -> Response | None:
+    """Return the cached JSON response for key if present and not expired."""
+    with _response_cache_lock:
+        entry = _response_cache.get(key)
+        if entry is None:
+            return None
+        stored_at, content = entry
+        if time.monotonic() - stored_at > RESPONSE_CACHE_TTL:
+            del _response_cache[key]
+            return None
+        _response_cache.move_to_end(key)
+    return Response(content=content, media_type="application/json")
+
+def scored_version_rows(session: Session, prompt_uuid: uuid.UUID, *columns, where=()) -> list:
+    """
+    Versions of a prompt in creation order, each with its average judge score.
+    
+    One outer-joined query; the score (total / 5) is computed in SQL and is
+    None for unscored versions. A version scored more than once keeps its
+    first score, like get_judge_totals_by_version.
+    """
+    rows = session.execute(
+        sa.select(PromptVersion.id, *columns, (JudgeScore.total / 5.0).label("score"))
+        .outerjoin(JudgeScore, JudgeScore.prompt_version_id == PromptVersion.id)
+        .where(PromptVersion.prompt_id == prompt_uuid, *where)
+        .order_by(PromptVersion.created_at)
+    ).all()
+    seen = set()
+    versions = []
+    for row in rows:
+        if row.id not in seen:
+            seen.add(row.id)
+            versions.append(row)
+    return versions
+
+def json_bytes(payload) -> bytes:
+    """Encode payload as JSON; orjson handles datetime/UUID natively, jsonable_encoder is the fallback."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS, default=jsonable_encoder)
+    return json.dumps(jsonable_encoder(payload), separators=(",", ":")).encode("utf-8")
+
+def cache_response(key: tuple, payload) -> Response:
+    """Serialize payload once, remember the bytes under key and return them as a response."""
+    content = json_bytes(payload)
+    with _response_cache_lock:
+        _response_cache[key] = (time.monotonic(), content)
+        _response_cache.move_to_end(key)
+        while len(_response_cache) > RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+    return Response(content=content, media_type="application/json")
+
 # Pydantic Models
 
 class SyntheticDataRequest(BaseModel):
@@ -32,6 +105,38 @@ class SyntheticDataRequest(BaseModel):
 
 # Endpoints
 
+def load_temporal_timeline(prompt_id: str, user_id: str, start_date: datetime, end_date: datetime):
+    """Timeline rows of a user's prompt between two dates (sync; see get_temporal_timeline)."""
+    with get_session() as session:
+        # SECURITY: Verify prompt belongs to current user
+        prompt = session.get(Prompt, uuid.UUID(prompt_id))
+        
+        if not prompt or prompt.user_id != user_id:
+            raise HTTPException(status_code=404, detail="Prompt not found or access denied")
+        
+        # Read-only: the serialized columns plus the average score, as plain rows
+        versions = scored_version_rows(
+            session, prompt.id, PromptVersion.created_at, PromptVersion.change_type,
+            where=(PromptVersion.created_at >= start_date, PromptVersion.created_at <= end_date)
+        )
+        
+        if not versions:
+            return []
+        
+        timeline = [
+            {
+                "timestamp": version.created_at,
+                "score": version.score,
+                "version_id": version.id,
+                "change_type": version.change_type
+            }
+            for version in versions
+            if version.score is not None
+        ]
+        
+        # Encoded straight to bytes: skips FastAPI's jsonable_encoder pass
+        return Response(content=json_bytes(timeline), media_type="application/json")
+
 @router.get("/timeline")
 async def get_temporal_timeline(
     prompt_id: str,
@@ -56,56 +161,57 @@ async def get_temporal_timeline(
         end_date = datetime.fromisoformat(end.replace('Z', '+00:00'))
         
         # Query database for versions in time range
-        with get_session() as session:
-            # SECURITY: Verify prompt belongs to current user
-            prompt = session.query(Prompt).filter(
-                Prompt.id == uuid.UUID(prompt_id),
-                Prompt.user_id == str(current_user.id)
-            ).first()
-            
-            if not prompt:
-                raise HTTPException(status_code=404, detail="Prompt not found or access denied")
-            
-            versions = session.query(PromptVersion).filter(
-                PromptVersion.prompt_id == uuid.UUID(prompt_id),
-                PromptVersion.created_at >= start_date,
-                PromptVersion.created_at <= end_date
-            ).order_by(PromptVersion.created_at).all()
-            
-            if not versions:
-                return []
-            
-            # Get judge scores for each version
-            timeline = []
-            for version in versions:
-                judge_score = session.query(JudgeScore).filter(
-                    JudgeScore.prompt_version_id == version.id
-                ).first()
-                
-                if judge_score:
-                    # Calculate average score
-                    avg_score = (
-                        judge_score.clarity + 
-                        judge_score.specificity + 
-                        judge_score.actionability + 
-                        judge_score.structure + 
-                        judge_score.context_use
-                    ) / 5.0
-                    
-                    timeline.append({
-                        "timestamp": version.created_at.isoformat(),
-                        "score": avg_score,
-                        "version_id": str(version.id),
-                        "change_type": version.change_type
-                    })
-            
-            return timeline
-            
+        # Blocking DB queries and number crunching run in a worker thread
+        return await asyncio.to_thread(load_temporal_timeline, prompt_id, str(current_user.id), start_date, end_date)
+
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"Invalid date format: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def load_temporal_statistics(prompt_id: str, user_id: str):
+    """Score statistics of a user's prompt history (sync; see get_temporal_statistics)."""
+    with get_session() as session:
+        # SECURITY: Verify prompt belongs to current user
+        prompt = session.get(Prompt, uuid.UUID(prompt_id))
+        
+        if not prompt or prompt.user_id != user_id:
+            raise HTTPException(status_code=404, detail="Prompt not found or access denied")
+        
+        # Unchanged history -> serve the previously serialized response
+        cache_key = ("statistics", prompt.id, history_freshness(session, prompt.id))
+        cached = get_cached_response(cache_key)
+        if cached is not None:
+            return cached
+        
+        # Query all versions for this prompt with their scores (only the columns used below)
+        versions = scored_version_rows(session, prompt.id, PromptVersion.created_at)
+        
+        if not versions:
+            raise HTTPException(status_code=404, detail="No versions found for this prompt")
+        
+        # Get scores and timestamps
+        scores = []
+        timestamps = []
+        
+        for version in versions:
+            if version.score is not None:
+                scores.append(version.score)
+                timestamps.append(version.created_at)
+        
+        # Compute statistics
+        stats = compute_statistics(scores)
+        trend = detect_trend(scores, timestamps)
+        
+        return cache_response(cache_key, {
+            "trend": trend,
+            "avg_score": stats["avg"],
+            "score_std": stats["std"],
+            "total_versions": len(versions),
+            "min_score": stats["min"],
+            "max_score": stats["max"]
+        })
+
 @router.get("/statistics")
 async def get_temporal_statistics(
     prompt_id: str,
@@ -121,63 +227,58 @@ async def get_temporal_statistics(
         Dict with trend, avg_score, score_std, total_versions
     """
     try:
-        with get_session() as session:
-            # SECURITY: Verify prompt belongs to current user
-            prompt = session.query(Prompt).filter(
-                Prompt.id == uuid.UUID(prompt_id),
-                Prompt.user_id == str(current_user.id)
-            ).first()
-            
-            if not prompt:
-                raise HTTPException(status_code=404, detail="Prompt not found or access denied")
-            
-            # Query all versions for this prompt
-            versions = session.query(PromptVersion).filter(
-                PromptVersion.prompt_id == uuid.UUID(prompt_id)
-            ).order_by(PromptVersion.created_at).all()
-            
-            if not versions:
-                raise HTTPException(status_code=404, detail="No versions found for this prompt")
-            
-            # Get scores and timestamps
-            scores = []
-            timestamps = []
-            
-            for version in versions:
-                judge_score = session.query(JudgeScore).filter(
-                    JudgeScore.prompt_version_id == version.id
-                ).first()
-                
-                if judge_score:
-                    avg_score = (
-                        judge_score.clarity + 
-                        judge_score.specificity + 
-                        judge_score.actionability + 
-                        judge_score.structure + 
-                        judge_score.context_use
-                    ) / 5.0
-                    
-                    scores.append(avg_score)
-                    timestamps.append(version.created_at)
-            
-            # Compute statistics
-            stats = compute_statistics(scores)
-            trend = detect_trend(scores, timestamps)
-            
-            return {
-                "trend": trend,
-                "avg_score": stats["avg"],
-                "score_std": stats["std"],
-                "total_versions": len(versions),
-                "min_score": stats["min"],
-                "max_score": stats["max"]
-            }
-            
+        # Blocking DB queries and number crunching run in a worker thread
+        return await asyncio.to_thread(load_temporal_statistics, prompt_id, str(current_user.id))
+
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def load_causal_hints(prompt_id: str, user_id: str):
+    """Change-type / score-delta hints of a user's prompt history (sync; see get_causal_hints)."""
+    with get_session() as session:
+        # SECURITY: Verify prompt belongs to current user
+        prompt = session.get(Prompt, uuid.UUID(prompt_id))
+        
+        if not prompt or prompt.user_id != user_id:
+            raise HTTPException(status_code=404, detail="Prompt not found or access denied")
+        
+        # Unchanged history -> serve the previously serialized response
+        cache_key = ("causal-hints", prompt.id, history_freshness(session, prompt.id))
+        cached = get_cached_response(cache_key)
+        if cached is not None:
+            return cached
+        
+        # Query all versions for this prompt with their scores (only the columns used below)
+        versions = scored_version_rows(
+            session, prompt.id, PromptVersion.parent_version_id, PromptVersion.change_type
+        )
+        
+        if not versions:
+            raise HTTPException(status_code=404, detail="No versions found for this prompt")
+        
+        # Build edges (parent -> child transitions)
+        edges = []
+        
+        # First pass: Get all scores
+        version_scores = {version.id: version.score for version in versions if version.score is not None}
+        
+        # Second pass: Build edges
+        for version in versions:
+            if version.parent_version_id and version.parent_version_id in version_scores:
+                parent_score = version_scores[version.parent_version_id]
+                child_score = version_scores.get(version.id)
+                
+                if child_score is not None:
+                    score_delta = child_score - parent_score
+                    edges.append((version.change_type, score_delta))
+        
+        # Compute causal hints
+        hints = compute_causal_hints(edges)
+        
+        return cache_response(cache_key, hints)
+
 @router.get("/causal-hints")
 async def get_causal_hints(
     prompt_id: str,
@@ -193,59 +294,9 @@ async def get_causal_hints(
         List of dicts: [{"change_type": str, "avg_score_delta": float, "occurrence_count": int}, ...]
     """
     try:
-        with get_session() as session:
-            # SECURITY: Verify prompt belongs to current user
-            prompt = session.query(Prompt).filter(
-                Prompt.id == uuid.UUID(prompt_id),
-                Prompt.user_id == str(current_user.id)
-            ).first()
-            
-            if not prompt:
-                raise HTTPException(status_code=404, detail="Prompt not found or access denied")
-            
-            # Query all versions for this prompt
-            versions = session.query(PromptVersion).filter(
-                PromptVersion.prompt_id == uuid.UUID(prompt_id)
-            ).order_by(PromptVersion.created_at).all()
-            
-            if not versions:
-                raise HTTPException(status_code=404, detail="No versions found for this prompt")
-            
-            # Build edges (parent -> child transitions)
-            edges = []
-            version_scores = {}
-            
-            # First pass: Get all scores
-            for version in versions:
-                judge_score = session.query(JudgeScore).filter(
-                    JudgeScore.prompt_version_id == version.id
-                ).first()
-                
-                if judge_score:
-                    avg_score = (
-                        judge_score.clarity + 
-                        judge_score.specificity + 
-                        judge_score.actionability + 
-                        judge_score.structure + 
-                        judge_score.context_use
-                    ) / 5.0
-                    version_scores[version.id] = avg_score
-            
-            # Second pass: Build edges
-            for version in versions:
-                if version.parent_version_id and version.parent_version_id in version_scores:
-                    parent_score = version_scores[version.parent_version_id]
-                    child_score = version_scores.get(version.id)
-                    
-                    if child_score is not None:
-                        score_delta = child_score - parent_score
-                        edges.append((version.change_type, score_delta))
-            
-            # Compute causal hints
-            hints = compute_causal_hints(edges)
-            
-            return hints
-            
+        # Blocking DB queries and number crunching run in a worker thread
+        return await asyncio.to_thread(load_causal_hints, prompt_id, str(current_user.id))
+
     except HTTPException:
         raise
     except Exception as e:
@@ -268,12 +319,9 @@ async def generate_synthetic_history(
     try:
         with get_session() as session:
             # SECURITY: Verify prompt exists and belongs to current user
-            prompt = session.query(Prompt).filter(
-                Prompt.id == uuid.UUID(request.prompt_id),
-                Prompt.user_id == str(current_user.id)
-            ).first()
+            prompt = session.get(Prompt, uuid.UUID(request.prompt_id))
             
-            if not prompt:
+            if not prompt or prompt.user_id != str(current_user.id):
                 raise HTTPException(status_code=404, detail="Prompt not found or access denied")
             
             # Generate synthetic versions
@@ -288,12 +336,15 @@ async def generate_synthetic_history(
             
             change_types = ["structure", "wording", "length", "other"]
             
+            # Computed once for the whole batch instead of per version
+            now = datetime.utcnow()
+            generated_at = now.isoformat()
+            
             for day in range(request.days):
                 for version_num in range(request.versions_per_day):
                     # Calculate timestamp (spread across days)
-                    from datetime import timedelta
                     hours_offset = day * 24 + (version_num * 24 / request.versions_per_day)
-                    version_date = datetime.utcnow() - timedelta(days=request.days - day, hours=hours_offset)
+                    version_date = now - timedelta(days=request.days - day, hours=hours_offset)
                     
                     # Generate version text (simple modification)
                     version_text = f"{previous_text} [v{created_count + 1}]"
@@ -305,10 +356,10 @@ async def generate_synthetic_history(
                     # Create version
                     new_version = PromptVersion(
                         id=uuid.uuid4(),
-                        prompt_id=uuid.UUID(request.prompt_id),
+                        prompt_id=prompt.id,  # already a UUID; no re-parsing per version
                         version_no=created_count + 1,
                         text=version_text,
-                        explanation={"synthetic": True, "generated_at": datetime.utcnow().isoformat()},
+                        explanation={"synthetic": True, "generated_at": generated_at},
                         source="synthetic_generator",
                         created_at=version_date,
                         parent_version_id=previous_version_id,
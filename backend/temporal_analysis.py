@@ -113,9 +113,7 @@ def compute_causal_hints(edges: List[Tuple[str, float]]) -> List[Dict[str, any]]
     # Group by change_type
     groups: Dict[str, List[float]] = {}
     for change_type, score_delta in edges:
-        if change_type not in groups:
-            groups[change_type] = []
-        groups[change_type].append(score_delta)
+        groups.setdefault(change_type, []).append(score_delta)
     
     # Compute averages
     results = []
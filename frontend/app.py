@@ -3,21 +3,8 @@ Self Learning Prompt Engineering System - Main Application
 Refactored for maintainability - Main orchestrator only
 """
 import streamlit as st
-from auth_client import init_session_state, logout
-from utils.session import check_authentication, show_page_header
-
-# Page imports
-from pages.auth import show_login_page
-from pages.api_testing import show_api_testing, show_export_data
-from pages.token_analytics import show_token_analytics
-from pages.temporal_analysis import show_temporal_analysis
-from pages.agent_effectiveness import show_agent_effectiveness
-from pages.security_dashboard import show_security_dashboard
-
-# Prompt enhancement - refactored into page module
-from pages.prompt_enhancement import show_prompt_enhancement
 
-# Page configuration
+# Page configuration (first Streamlit call, before any page modules load)
 st.set_page_config(
     page_title="Self Learning Prompt Engineering System",
     page_icon="🤖",
@@ -25,9 +12,30 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+from auth_client import init_session_state, logout
+from utils.session import show_page_header, go_to_page
+
 # Initialize session state
 init_session_state()
 
+# Static sidebar content, sent as one element each instead of one per line
+HIDE_PAGE_NAV_CSS = """
+<style>
+    [data-testid="stSidebarNav"] {
+        display: none;
+    }
+</style>
+"""
+
+SECURITY_STATUS_MD = "🔐 Session Active  \n🔄 End-to-End Encrypted  \n✅ Rate Limited"
+
+TROUBLESHOOTING_MD = """
+**If problems persist:**
+1. Check your internet connection
+2. Ensure the backend server is running on port 8001
+3. Clear your browser cache
+"""
+
 
 def main():
     """Main application router"""
@@ -40,22 +48,29 @@ def main():
             # Route to current page
             page = st.session_state.get('current_page', 'dashboard')
             
-            if page == "dashboard":
-                show_prompt_enhancement()
-            elif page == "token_analytics":
+            # Page modules are imported on first visit so pandas/plotly/etc.
+            # only load for the pages that actually need them
+            if page == "token_analytics":
+                from pages.token_analytics import show_token_analytics
                 show_token_analytics()
             elif page == "temporal_analysis":
+                from pages.temporal_analysis import show_temporal_analysis
                 show_temporal_analysis()
             elif page == "agent_effectiveness":
+                from pages.agent_effectiveness import show_agent_effectiveness
                 show_agent_effectiveness()
             elif page == "security_dashboard":
+                from pages.security_dashboard import show_security_dashboard
                 show_security_dashboard()
             elif page == "api_test":
+                from pages.api_testing import show_api_testing
                 show_api_testing()
             else:
+                from pages.prompt_enhancement import show_prompt_enhancement
                 show_prompt_enhancement()
         else:
             # Not authenticated: Show login
+            from pages.auth import show_login_page
             show_login_page()
     
     except Exception as e:
@@ -66,13 +81,7 @@ def main():
 def show_navigation_sidebar():
     """Sidebar navigation"""
     # Hide Streamlit's automatic page navigation
-    st.markdown("""
-    <style>
-        [data-testid="stSidebarNav"] {
-            display: none;
-        }
-    </style>
-    """, unsafe_allow_html=True)
+    st.markdown(HIDE_PAGE_NAV_CSS, unsafe_allow_html=True)
     
     # Header
     show_page_header()
@@ -93,37 +102,23 @@ def show_navigation_sidebar():
     # Navigation buttons
     st.subheader("🧭 Navigation")
     
-    if st.button("📊 Dashboard", key="nav_dashboard", width='stretch'):
-        st.session_state.current_page = "dashboard"
-        st.rerun()
+    st.button("📊 Dashboard", key="nav_dashboard", width='stretch', on_click=go_to_page, args=("dashboard",))
     
-    if st.button("📈 Agent Effectiveness", key="nav_effectiveness", width='stretch'):
-        st.session_state.current_page = "agent_effectiveness"
-        st.rerun()
+    st.button("📈 Agent Effectiveness", key="nav_effectiveness", width='stretch', on_click=go_to_page, args=("agent_effectiveness",))
     
-    if st.button("💰 Token Analytics", key="nav_tokens", width='stretch'):
-        st.session_state.current_page = "token_analytics"
-        st.rerun()
+    st.button("💰 Token Analytics", key="nav_tokens", width='stretch', on_click=go_to_page, args=("token_analytics",))
     
-    if st.button("🔒 Security Dashboard", key="nav_security", width='stretch'):
-        st.session_state.current_page = "security_dashboard"
-        st.rerun()
+    st.button("🔒 Security Dashboard", key="nav_security", width='stretch', on_click=go_to_page, args=("security_dashboard",))
     
-    if st.button("⏱️ Temporal Analysis", key="nav_temporal", width='stretch'):
-        st.session_state.current_page = "temporal_analysis"
-        st.rerun()
+    st.button("⏱️ Temporal Analysis", key="nav_temporal", width='stretch', on_click=go_to_page, args=("temporal_analysis",))
         
-    if st.button("🔧 API Testing", key="nav_api", width='stretch'):
-        st.session_state.current_page = "api_test"
-        st.rerun()
+    st.button("🔧 API Testing", key="nav_api", width='stretch', on_click=go_to_page, args=("api_test",))
     
     st.markdown("---")
     
     # Security status
     st.subheader("🛡️ Security Status")
-    st.success("🔐 Session Active")
-    st.success("🔄 End-to-End Encrypted")
-    st.success("✅ Rate Limited")
+    st.success(SECURITY_STATUS_MD)
     
     if st.button("🚪 Logout", type="primary", width='stretch'):
         logout()
@@ -145,10 +140,7 @@ def show_error_recovery_options():
                 st.rerun()
         
         st.markdown("---")
-        st.markdown("**If problems persist:**")
-        st.markdown("1. Check your internet connection")
-        st.markdown("2. Ensure the backend server is running on port 8001")
-        st.markdown("3. Clear your browser cache")
+        st.markdown(TROUBLESHOOTING_MD)
 
 
 if __name__ == "__main__":
@@ -1,9 +1,10 @@
 import requests
 import streamlit as st
-from typing import Optional, Dict, Any, List
+from typing import Dict, Any, List
 import os
 import re
 from dotenv import load_dotenv
+from utils.api_client import error_detail, parse_json
 
 load_dotenv()
 
@@ -58,9 +59,9 @@ class AuthClient:
                 timeout=10
             )
             if response.status_code == 200:
-                return {"success": True, "data": response.json()}
+                return {"success": True, "data": parse_json(response)}
             else:
-                return {"success": False, "error": response.json().get("detail", "Registration failed")}
+                return {"success": False, "error": error_detail(response, "Registration failed")}
         except requests.exceptions.RequestException as e:
             return {"success": False, "error": f"Connection error: {str(e)}"}
     
@@ -73,10 +74,10 @@ class AuthClient:
                 timeout=10
             )
             if response.status_code == 200:
-                token_data = response.json()
+                token_data = parse_json(response)
                 return {"success": True, "token": token_data["access_token"], "expires_in": token_data["expires_in"]}
             else:
-                return {"success": False, "error": response.json().get("detail", "Login failed")}
+                return {"success": False, "error": error_detail(response, "Login failed")}
         except requests.exceptions.RequestException as e:
             return {"success": False, "error": f"Connection error: {str(e)}"}
     
@@ -90,9 +91,9 @@ class AuthClient:
                 timeout=10
             )
             if response.status_code == 200:
-                return {"success": True, "data": response.json()}
+                return {"success": True, "data": parse_json(response)}
             else:
-                return {"success": False, "error": response.json().get("detail", "Failed to get user info")}
+                return {"success": False, "error": error_detail(response, "Failed to get user info")}
         except requests.exceptions.RequestException as e:
             return {"success": False, "error": f"Connection error: {str(e)}"}
     
@@ -106,9 +107,9 @@ class AuthClient:
                 timeout=10
             )
             if response.status_code == 200:
-                return {"success": True, "data": response.json()}
+                return {"success": True, "data": parse_json(response)}
             else:
-                return {"success": False, "error": response.json().get("detail", "Access denied")}
+                return {"success": False, "error": error_detail(response, "Access denied")}
         except requests.exceptions.RequestException as e:
             return {"success": False, "error": f"Connection error: {str(e)}"}
     
@@ -130,9 +131,9 @@ class AuthClient:
                 timeout=30
             )
             if response.status_code == 200:
-                return {"success": True, "data": response.json()["data"]}
+                return {"success": True, "data": parse_json(response)["data"]}
             else:
-                return {"success": False, "error": response.json().get("detail", "Enhancement failed")}
+                return {"success": False, "error": error_detail(response, "Enhancement failed")}
         except requests.exceptions.RequestException as e:
             return {"success": False, "error": f"Connection error: {str(e)}"}
     
@@ -153,9 +154,9 @@ class AuthClient:
                 timeout=10
             )
             if response.status_code == 200:
-                return {"success": True, "data": response.json()["data"]}
+                return {"success": True, "data": parse_json(response)["data"]}
             else:
-                return {"success": False, "error": response.json().get("detail", "Save failed")}
+                return {"success": False, "error": error_detail(response, "Save failed")}
         except requests.exceptions.RequestException as e:
             return {"success": False, "error": f"Connection error: {str(e)}"}
     
@@ -169,9 +170,9 @@ class AuthClient:
                 timeout=10
             )
             if response.status_code == 200:
-                return {"success": True, "data": response.json()["data"]}
+                return {"success": True, "data": parse_json(response)["data"]}
             else:
-                return {"success": False, "error": response.json().get("detail", "Failed to fetch prompts")}
+                return {"success": False, "error": error_detail(response, "Failed to fetch prompts")}
         except requests.exceptions.RequestException as e:
             return {"success": False, "error": f"Connection error: {str(e)}"}
 
@@ -181,6 +182,8 @@ def init_session_state():
         st.session_state.authenticated = False
     if 'access_token' not in st.session_state:
         st.session_state.access_token = None
+    if 'auth_headers' not in st.session_state:
+        st.session_state.auth_headers = {}
     if 'user_info' not in st.session_state:
         st.session_state.user_info = None
     if 'auth_client' not in st.session_state:
@@ -196,6 +199,7 @@ def logout():
     """Logout user and clear session state."""
     st.session_state.authenticated = False
     st.session_state.access_token = None
+    st.session_state.auth_headers = {}
     st.session_state.user_info = None
     st.session_state.current_page = "dashboard"
     st.session_state.login_attempts = 0
@@ -203,34 +207,6 @@ def logout():
     st.success("Logged out successfully!")
     st.rerun()
 
-def check_authentication() -> bool:
-    """Check if user is authenticated and token is valid."""
-    if not st.session_state.authenticated or not st.session_state.access_token:
-        return False
-    
-    # Check for session timeout (30 minutes of inactivity)
-    import time
-    current_time = time.time()
-    if st.session_state.last_activity:
-        if current_time - st.session_state.last_activity > 1800:  # 30 minutes
-            st.warning("Session expired due to inactivity. Please log in again.")
-            logout()
-            return False
-    
-    # Update last activity
-    st.session_state.last_activity = current_time
-    
-    # Verify token is still valid by checking user info
-    result = st.session_state.auth_client.get_user_info(st.session_state.access_token)
-    if result["success"]:
-        st.session_state.user_info = result["data"]
-        return True
-    else:
-        # Token expired or invalid, logout user
-        st.error("Session expired. Please log in again.")
-        logout()
-        return False
-
 def show_password_strength(password: str):
     """Display password strength indicator."""
     if not password:
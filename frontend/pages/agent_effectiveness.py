@@ -3,11 +3,52 @@ import streamlit as st
 import pandas as pd
 import requests
 import plotly.graph_objects as go
-import plotly.express as px
 from temporal_client import init_temporal_client
-from packages.db.session import get_session
-from packages.db.models import Prompt, PromptVersion, JudgeScore
-from utils.api_client import API_BASE
+from utils.api_client import api_get, fetch_prompts, parse_json
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def fetch_agent_effectiveness(access_token: str) -> dict:
+    """
+    Fetch per-agent effectiveness stats from the backend, cached across reruns.
+    
+    Args:
+        access_token: Current session token (part of the cache key so
+            cached entries are never shared between users)
+    
+    Returns:
+        Effectiveness dict keyed by agent name
+    
+    Raises:
+        requests.HTTPError: If the backend returns a non-2xx status
+            (errors are not cached, so the next rerun retries)
+    """
+    response = api_get("/api/agents/effectiveness")
+    response.raise_for_status()
+    return parse_json(response).get("effectiveness", {})
+
+
+@st.cache_data(show_spinner=False)
+def build_effectiveness_frame(effectiveness: dict) -> pd.DataFrame:
+    """
+    Build a typed effectiveness frame (numeric win rate and score columns).
+    
+    Cached on the stats themselves, so widget reruns reuse the frame instead
+    of rebuilding and re-formatting it.
+    
+    Args:
+        effectiveness: Effectiveness dict from /api/agents/effectiveness
+    
+    Returns:
+        DataFrame with Agent, Wins, Win Rate and Avg Score columns
+    """
+    agents = [name for name in effectiveness if name != '_metadata']
+    return pd.DataFrame({
+        "Agent": [name.title() for name in agents],
+        "Wins": pd.to_numeric([effectiveness[name].get("wins", 0) for name in agents], errors='coerce'),
+        "Win Rate": pd.to_numeric([effectiveness[name].get("win_rate", 0.0) for name in agents], errors='coerce'),
+        "Avg Score": pd.to_numeric([effectiveness[name].get("avg_score", 0.0) for name in agents], errors='coerce')
+    })
 
 
 def show_agent_effectiveness():
@@ -18,17 +59,10 @@ def show_agent_effectiveness():
     # Fetch effectiveness data from backend (queries database, not CSV)
     with st.spinner("Loading agent statistics from database..."):
         try:
-            response = requests.get(
-                f"{API_BASE}/api/agents/effectiveness",
-                headers={"Authorization": f"Bearer {st.session_state.access_token}"}
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                effectiveness = result.get("effectiveness", {})
-            else:
-                st.error(f"Failed to fetch data: {response.status_code}")
-                effectiveness = {}
+            effectiveness = fetch_agent_effectiveness(st.session_state.access_token)
+        except requests.exceptions.HTTPError as e:
+            st.error(f"Failed to fetch data: {e.response.status_code}")
+            effectiveness = {}
         except Exception as e:
             st.error(f"Failed to fetch effectiveness: {e}")
             effectiveness = {}
@@ -205,74 +239,81 @@ def show_agent_effectiveness():
     st.subheader("⏱️ Agent Performance Over Time")
     st.markdown("Track how agent effectiveness evolves")
     
-    with st.expander("📈 View Performance Trends", expanded=False):
-        try:
-            temporal_client = init_temporal_client(token=st.session_state.access_token)
+    # Collapsed by default; with on_change="rerun" the trends (an API call plus
+    # DB queries) only run while the expander is open
+    trends_expander = st.expander(
+        "📈 View Performance Trends",
+        expanded=False,
+        key="agent_trends_expander",
+        on_change="rerun"
+    )
+    with trends_expander:
+        if trends_expander.open:
+            show_agent_performance_trends()
+
+
+def show_agent_performance_trends():
+    """Per-agent score trends from the version history (rendered inside the trends expander)"""
+    try:
+        temporal_client = init_temporal_client(token=st.session_state.access_token)
+        
+        # Get user's prompts from API (for agent effectiveness)
+        if fetch_prompts(st.session_state.access_token, limit=10):
+            st.info("💡 View temporal trends for each agent type to identify which strategies improve over time")
             
-            # Get user's prompts from API (for agent effectiveness)
-            response = requests.get(
-                f"{API_BASE}/api/prompts?limit=10",
-                headers={"Authorization": f"Bearer {st.session_state.access_token}"}
-            )
+            # Database access is only needed here; import on demand
+            import sqlalchemy as sa
+            from packages.db.session import get_session
+            from packages.db.models import PromptVersion
+            from packages.db.crud import get_judge_totals_by_version
             
-            if response.status_code == 200:
-                prompts_data = response.json()
-                if prompts_data.get("success") and prompts_data.get("data"):
-                    prompts_with_agents = prompts_data["data"]
-                    st.info("💡 View temporal trends for each agent type to identify which strategies improve over time")
-                    
-                    # Get agent-specific trends
-                    agent_trends = {}
-                    session = get_session()
-                    
-                    for agent_name in ['syntax', 'structure', 'domain']:
-                        # Get versions for this agent type
-                        agent_versions = session.query(PromptVersion).filter(
-                            PromptVersion.source == agent_name
-                        ).order_by(PromptVersion.created_at).limit(30).all()
-                        
-                        if agent_versions:
-                            # Calculate simple trend
-                            scores = []
-                            for v in agent_versions:
-                                # Get judge score if available
-                                judge = session.query(JudgeScore).filter(
-                                    JudgeScore.prompt_version_id == v.id
-                                ).first()
-                                
-                                if judge:
-                                    avg_score = (judge.clarity + judge.specificity + judge.actionability + judge.structure + judge.context_use) / 5.0
-                                    scores.append(avg_score)
-                            
-                            if scores:
-                                agent_trends[agent_name] = {
-                                    'count': len(scores),
-                                    'avg_score': sum(scores) / len(scores),
-                                    'trend': 'improving' if len(scores) > 1 and scores[-1] > scores[0] else 'stable'
-                                }
+            # Get agent-specific trends
+            agent_trends = {}
+            
+            with get_session() as session:
+                for agent_name in ['syntax', 'structure', 'domain']:
+                    # Get versions for this agent type
+                    version_ids = session.execute(
+                        sa.select(PromptVersion.id)
+                        .where(PromptVersion.source == agent_name)
+                        .order_by(PromptVersion.created_at)
+                        .limit(30)
+                    ).scalars().all()
                     
-                    if agent_trends:
-                        col1, col2, col3 = st.columns(3)
+                    if version_ids:
+                        # Calculate simple trend; all judge totals come from one query
+                        totals = get_judge_totals_by_version(session, version_ids)
+                        scores = [totals[vid] / 5.0 for vid in version_ids if vid in totals]
                         
-                        for col, (agent, stats) in zip([col1, col2, col3], agent_trends.items()):
-                            with col:
-                                trend_icon = "📈" if stats['trend'] == 'improving' else "➡️"
-                                st.metric(
-                                    f"{agent.title()} Agent",
-                                    f"{stats['avg_score']:.1f}",
-                                    f"{trend_icon} {stats['trend'].title()}"
-                                )
-                                st.caption(f"{stats['count']} versions analyzed")
-                        
-                        st.success("💡 **Insight:** Use temporal data to identify which agent types consistently improve and allocate resources accordingly")
-                    else:
-                        st.info("💡 No score data available. Enhance prompts with multi-agent to track trends.")
-                else:
-                    st.info("💡 No agent data found. Use Multi-Agent Enhancement to create agent versions.")
-        
-        except Exception as e:
-            st.warning(f"Performance trends unavailable: {str(e)}")
-            st.info("💡 Use the Temporal Analysis page for detailed agent performance tracking")
+                        if scores:
+                            agent_trends[agent_name] = {
+                                'count': len(scores),
+                                'avg_score': sum(scores) / len(scores),
+                                'trend': 'improving' if len(scores) > 1 and scores[-1] > scores[0] else 'stable'
+                            }
+            
+            if agent_trends:
+                col1, col2, col3 = st.columns(3)
+                
+                for col, (agent, stats) in zip([col1, col2, col3], agent_trends.items()):
+                    with col:
+                        trend_icon = "📈" if stats['trend'] == 'improving' else "➡️"
+                        st.metric(
+                            f"{agent.title()} Agent",
+                            f"{stats['avg_score']:.1f}",
+                            f"{trend_icon} {stats['trend'].title()}"
+                        )
+                        st.caption(f"{stats['count']} versions analyzed")
+                
+                st.success("💡 **Insight:** Use temporal data to identify which agent types consistently improve and allocate resources accordingly")
+            else:
+                st.info("💡 No score data available. Enhance prompts with multi-agent to track trends.")
+        else:
+            st.info("💡 No agent data found. Use Multi-Agent Enhancement to create agent versions.")
+    
+    except Exception as e:
+        st.warning(f"Performance trends unavailable: {str(e)}")
+        st.info("💡 Use the Temporal Analysis page for detailed agent performance tracking")
 
 
 def display_win_rate_chart(effectiveness):
@@ -291,19 +332,17 @@ def display_win_rate_chart(effectiveness):
 
 def display_effectiveness_table(effectiveness):
     """Display effectiveness as detailed table"""
-    # Create DataFrame
-    df = pd.DataFrame([
-        {
-            "Agent": name.title(),
-            "Wins": stats["wins"],
-            "Win Rate": f"{stats['win_rate']:.1%}",
-            "Avg Score": f"{stats['avg_score']:.1f}/10"
-        }
-        for name, stats in effectiveness.items()
-    ])
+    df = build_effectiveness_frame(effectiveness)
     
     # Sort by wins descending
     df = df.sort_values("Wins", ascending=False)
     
-    st.dataframe(df, hide_index=True, width='stretch')
-
+    st.dataframe(
+        df,
+        hide_index=True,
+        width='stretch',
+        column_config={
+            "Win Rate": st.column_config.NumberColumn(format="percent"),
+            "Avg Score": st.column_config.NumberColumn(format="%.1f/10")
+        }
+    )
@@ -1,7 +1,6 @@
 """API Testing page - Test API endpoints and export data"""
 import streamlit as st
-import requests
-from utils.api_client import API_BASE
+from utils.api_client import api_post
 
 
 def show_api_testing():
@@ -74,10 +73,7 @@ def show_export_data():
         if st.button("📊 Export Multi-Agent Data", type="primary", use_container_width=True):
             with st.spinner("Exporting multi-agent results from database..."):
                 try:
-                    response = requests.post(
-                        f"{API_BASE}/api/storage/export-multi-agent",
-                        headers={"Authorization": f"Bearer {st.session_state.access_token}"}
-                    )
+                    response = api_post("/api/storage/export-multi-agent")
                     
                     if response.status_code == 200:
                         result = response.json()
@@ -91,10 +87,7 @@ def show_export_data():
         if st.button("⏰ Export Temporal Data", type="primary", use_container_width=True):
             with st.spinner("Exporting temporal version chains from database..."):
                 try:
-                    response = requests.post(
-                        f"{API_BASE}/api/storage/export-temporal",
-                        headers={"Authorization": f"Bearer {st.session_state.access_token}"}
-                    )
+                    response = api_post("/api/storage/export-temporal")
                     
                     if response.status_code == 200:
                         result = response.json()
@@ -108,10 +101,7 @@ def show_export_data():
         if st.button("📦 Export All Data", type="primary", use_container_width=True):
             with st.spinner("Exporting all data from database..."):
                 try:
-                    response = requests.post(
-                        f"{API_BASE}/api/storage/export-all",
-                        headers={"Authorization": f"Bearer {st.session_state.access_token}"}
-                    )
+                    response = api_post("/api/storage/export-all")
                     
                     if response.status_code == 200:
                         result = response.json()
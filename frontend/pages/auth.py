@@ -2,6 +2,7 @@
 import streamlit as st
 import time
 from auth_client import show_password_strength
+from utils.api_client import prefetch_prompts
 from utils.session import show_page_header
 
 
@@ -34,8 +35,12 @@ def show_login_page():
                 if result["success"]:
                     st.session_state.authenticated = True
                     st.session_state.access_token = result["token"]
+                    # Built once here and reused by every API call (see get_auth_headers)
+                    st.session_state.auth_headers = {"Authorization": f"Bearer {result['token']}"}
                     st.session_state.login_attempts = 0  # Reset attempts
                     st.session_state.last_activity = time.time()
+                    # Load the prompt list during the redirect pause below
+                    prefetch_prompts(result["token"])
                     st.success("✅ Login successful! Redirecting to Prompt Enhancement...")
                     time.sleep(1)
                     st.rerun()
@@ -1,9 +1,135 @@
 """Prompt Enhancement page - Main enhancement interface"""
-import streamlit as st
+import hashlib
 import requests
+import streamlit as st
+import threading
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from components.feedback import submit_feedback
-from utils.api_client import API_BASE
+from utils.api_client import LLM_TIMEOUT, api_post, fetch_prompts, parse_json
+
+
+def safe_ratio(numerator: float, denominator: float) -> float:
+    """Return numerator / denominator, or 0.0 when the denominator is zero (e.g. free mock usage)."""
+    return numerator / denominator if denominator else 0.0
+
+
+class _HeuristicJudgement(Exception):
+    """Carries a heuristic fallback score out of cached_judge_prompt without caching it."""
+    
+    def __init__(self, result):
+        super().__init__("heuristic judge result")
+        self.result = result
+
+
+# Per-thread flag set when _judge_prompt_cached actually runs (a cache miss)
+_judge_memo = threading.local()
+
+
+@st.cache_data(show_spinner=False, max_entries=256, ttl=3600)
+def _judge_prompt_cached(text: str):
+    from packages.core import judge_prompt
+    
+    _judge_memo.miss = True
+    score, usage = judge_prompt(text)
+    if usage.model == "heuristic":
+        # LLM judge was unavailable; raising keeps this out of the cache
+        raise _HeuristicJudgement((score, usage))
+    return score, usage
+
+
+def cached_judge_prompt(text: str):
+    """
+    judge_prompt memoized on the prompt text.
+    
+    Re-submitting the same prompt (or an enhancement that yields the same
+    text) reuses the earlier scorecard instead of another judge LLM call.
+    Cache hits report zero tokens and cost. Heuristic fallback scores are
+    returned but never cached, so the LLM judge is retried once it is
+    reachable again.
+    """
+    from packages.core.token_tracker import memoized_usage
+    
+    _judge_memo.miss = False
+    try:
+        score, usage = _judge_prompt_cached(text)
+    except _HeuristicJudgement as e:
+        return e.result
+    return score, (usage if _judge_memo.miss else memoized_usage(usage))
+
+
+class MultiAgentEnhanceFailed(Exception):
+    """The backend answered but reported the multi-agent enhancement as unsuccessful."""
+
+
+@st.cache_data(ttl=3600, show_spinner=False, max_entries=256)
+def fetch_multi_agent_enhancement(access_token: str, text: str) -> dict:
+    """
+    Run multi-agent enhancement for a prompt, cached on (user, text).
+    
+    Enhancing the same text again (a double click, or re-running a
+    comparison) reuses the earlier result instead of another round of
+    agent LLM calls. Failures raise and are therefore never cached.
+    
+    Args:
+        access_token: Current session token (part of the cache key so
+            results - and their request ids - are never shared between users)
+        text: Prompt text to enhance
+    
+    Returns:
+        Parsed JSON body of /prompts/multi-agent-enhance
+    
+    Raises:
+        requests.HTTPError: If the backend returns a non-2xx status
+        MultiAgentEnhanceFailed: If the backend reports success=False
+    """
+    response = api_post(
+        "/prompts/multi-agent-enhance",
+        json_data={"text": text, "enhancement_type": "general"},
+        timeout=LLM_TIMEOUT
+    )
+    response.raise_for_status()
+    result = parse_json(response)
+    if not result.get("success"):
+        raise MultiAgentEnhanceFailed(result.get("error", "Unknown error"))
+    fetch_prompts.clear()  # the backend saved a new prompt
+    return result
+
+
+# (row label, Scorecard attribute) for the five judge criteria
+SCORE_CRITERIA = [
+    ("Clarity", "clarity"),
+    ("Specificity", "specificity"),
+    ("Actionability", "actionability"),
+    ("Structure", "structure"),
+    ("Context Use", "context_use")
+]
+
+
+def preview_text(text: str, limit: int = 200) -> str:
+    """First `limit` characters of text, with an ellipsis if it was cut."""
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+def show_criteria_table(original_score, enhanced_score):
+    """Render both scorecards' five judge criteria (and the change) as one table."""
+    original = [getattr(original_score, attr) for _, attr in SCORE_CRITERIA]
+    enhanced = [getattr(enhanced_score, attr) for _, attr in SCORE_CRITERIA]
+    st.dataframe(
+        {
+            "Criterion": [label for label, _ in SCORE_CRITERIA],
+            "Original": original,
+            "Enhanced": enhanced,
+            "Change": [e - o for o, e in zip(original, enhanced)]
+        },
+        hide_index=True,
+        width='stretch',
+        column_config={
+            "Original": st.column_config.NumberColumn(format="%.1f"),
+            "Enhanced": st.column_config.NumberColumn(format="%.1f"),
+            "Change": st.column_config.NumberColumn(format="%+.1f")
+        }
+    )
 
 
 def show_prompt_enhancement():
@@ -68,8 +194,8 @@ def show_prompt_enhancement():
     
     if submit_enhance and prompt_text:
         # Clear previous results when submitting new prompt
-        if 'comparison_results' in st.session_state:
-            del st.session_state['comparison_results']
+        for results_key in ('comparison_results', 'single_agent_results', 'multi_agent_results'):
+            st.session_state.pop(results_key, None)
         
         if "Compare All" in enhancement_mode:
             show_three_way_comparison(prompt_text, context)
@@ -100,6 +226,18 @@ def show_prompt_enhancement():
             results['multi_judge_usage'],
             results['multi_metadata']
         )
+    elif 'single_agent_results' in st.session_state:
+        results = st.session_state['single_agent_results']
+        display_single_agent_results(
+            results['prompt_text'],
+            results['enhanced_prompt'],
+            results['original_output'],
+            results['enhanced_output'],
+            results['original_score'],
+            results['enhanced_score']
+        )
+    elif 'multi_agent_results' in st.session_state:
+        display_multi_agent_results(st.session_state['multi_agent_results'])
     elif submit_enhance:
         st.error("❌ Please enter a prompt to enhance")
 
@@ -114,7 +252,6 @@ def show_three_way_comparison(original_prompt: str, context: str = ""):
     try:
         from packages.core import (
             fallback_to_template,
-            judge_prompt,
             TokenTracker,
             generate_llm_output
         )
@@ -132,34 +269,42 @@ def show_three_way_comparison(original_prompt: str, context: str = ""):
             st.error(f"Single-agent enhancement failed: {e}")
             return
         
+        # Steps 3 & 4: the six LLM calls (3 outputs + 3 judgements) are
+        # independent, so run them concurrently. The original and single-agent
+        # calls don't need the multi-agent result, so they start first and
+        # overlap the multi-agent request. Each step still falls back to mocks
+        # on its own if its calls fail.
+        executor = ThreadPoolExecutor(max_workers=6)
+        output_futures = [executor.submit(generate_llm_output, p) for p in (original_prompt, single_enhanced)]
+        judge_futures = [executor.submit(cached_judge_prompt, p) for p in (original_prompt, single_enhanced)]
         # Step 2: Multi-Agent Enhancement (new)
+        multi_error = None
         try:
-            response = requests.post(
-                f"{API_BASE}/prompts/multi-agent-enhance",
-                headers={"Authorization": f"Bearer {st.session_state.access_token}"},
-                json={"text": original_prompt, "enhancement_type": "general"}
-            )
-            
-            if response.status_code == 200:
-                multi_result = response.json()
-                if multi_result.get("success"):
-                    multi_enhanced = multi_result["data"]["enhanced_text"]
-                    multi_metadata = multi_result["data"]  # For agent breakdown
-                else:
-                    st.error("Multi-agent enhancement failed")
-                    return
-            else:
-                st.error(f"Multi-agent API error: {response.status_code}")
-                return
+            multi_result = fetch_multi_agent_enhancement(st.session_state.get("access_token", ""), original_prompt)
+            multi_enhanced = multi_result["data"]["enhanced_text"]
+            multi_metadata = multi_result["data"]  # For agent breakdown
+        except MultiAgentEnhanceFailed:
+            multi_error = "Multi-agent enhancement failed"
+        except requests.HTTPError as e:
+            multi_error = f"Multi-agent API error: {e.response.status_code}"
         except Exception as e:
-            st.error(f"Multi-agent call failed: {e}")
+            multi_error = f"Multi-agent call failed: {e}"
+        else:
+            output_futures.append(executor.submit(generate_llm_output, multi_enhanced))
+            judge_futures.append(executor.submit(cached_judge_prompt, multi_enhanced))
+        finally:
+            executor.shutdown(wait=False)
+        
+        if multi_error is not None:
+            st.error(multi_error)
+            show_original_vs_single(original_prompt, single_enhanced, output_futures, judge_futures)
             return
         
         # Step 3: Generate outputs with all 3 prompts
         try:
-            original_output, original_usage = generate_llm_output(original_prompt)
-            single_output, single_usage = generate_llm_output(single_enhanced)
-            multi_output, multi_usage = generate_llm_output(multi_enhanced)
+            (original_output, original_usage), (single_output, single_usage), (multi_output, multi_usage) = [
+                future.result() for future in output_futures
+            ]
             llm_available = True
         except Exception as e:
             st.warning(f"⚠️ LLM unavailable, using mock outputs: {str(e)}")
@@ -174,9 +319,9 @@ def show_three_way_comparison(original_prompt: str, context: str = ""):
         
         # Step 4: Judge all 3 prompts
         try:
-            original_score, original_judge_usage = judge_prompt(original_prompt)
-            single_score, single_judge_usage = judge_prompt(single_enhanced)
-            multi_score, multi_judge_usage = judge_prompt(multi_enhanced)
+            (original_score, original_judge_usage), (single_score, single_judge_usage), (multi_score, multi_judge_usage) = [
+                future.result() for future in judge_futures
+            ]
         except Exception as e:
             st.warning(f"⚠️ Judge unavailable, using mock scores: {str(e)}")
             from packages.core.judge import Scorecard
@@ -220,6 +365,75 @@ def show_three_way_comparison(original_prompt: str, context: str = ""):
     )
 
 
+def show_original_vs_single(prompt_text: str, enhanced_prompt: str, output_futures, judge_futures):
+    """
+    Show Original vs Single-Agent for a comparison whose multi-agent step failed.
+    
+    Those LLM calls were submitted before the multi-agent request and run to
+    completion anyway, so their results are shown instead of being dropped.
+    """
+    try:
+        (original_output, _), (enhanced_output, _) = [future.result() for future in output_futures]
+        (original_score, _), (enhanced_score, _) = [future.result() for future in judge_futures]
+    except Exception as e:
+        st.warning(f"⚠️ LLM unavailable, no comparison to show: {str(e)}")
+        return
+    
+    st.info("Showing Original vs Single-Agent results instead.")
+    st.session_state['single_agent_results'] = {
+        'prompt_text': prompt_text,
+        'enhanced_prompt': enhanced_prompt,
+        'original_output': original_output,
+        'enhanced_output': enhanced_output,
+        'original_score': original_score,
+        'enhanced_score': enhanced_score
+    }
+    display_single_agent_results(
+        prompt_text, enhanced_prompt,
+        original_output, enhanced_output,
+        original_score, enhanced_score
+    )
+
+
+@st.fragment
+def show_feedback_vote(request_id: str, judge_winner: str):
+    """
+    Render the "which was best" vote buttons for a three-way comparison.
+    
+    Runs as a fragment, so a vote reruns only these buttons instead of
+    redrawing the whole comparison above them.
+    """
+    # Check if feedback already submitted (use session state)
+    feedback_key = f"feedback_submitted_{request_id}"
+    if feedback_key not in st.session_state:
+        st.session_state[feedback_key] = False
+    
+    if not st.session_state[feedback_key]:
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            if st.button("👍 Original was best", key=f"vote_orig_{request_id}", type="secondary"):
+                submit_feedback(request_id, "original", judge_winner, "none")
+                st.session_state[feedback_key] = True
+                # No page refresh - feedback submitted silently
+        
+        with col2:
+            if st.button("👍 Single-Agent was best", key=f"vote_single_{request_id}", type="secondary"):
+                submit_feedback(request_id, "single", judge_winner, "template")
+                st.session_state[feedback_key] = True
+                # No page refresh - feedback submitted silently
+        
+        with col3:
+            if st.button("👍 Multi-Agent was best", key=f"vote_multi_{request_id}", type="primary"):
+                submit_feedback(request_id, "multi", judge_winner, judge_winner)
+                st.session_state[feedback_key] = True
+                # No page refresh - feedback submitted silently
+    
+    # Show confirmation immediately after any button click
+    if st.session_state[feedback_key]:
+        st.success("✅ Thank you! Your feedback has been recorded and will help the system learn.")
+
+
 def display_three_way_results(
     request_id,
     original_prompt, single_enhanced, multi_enhanced,
@@ -231,6 +445,16 @@ def display_three_way_results(
 ):
     """Display three-way comparison results"""
     
+    # Derived totals used by several sections below - compute once
+    original_total = original_usage.cost_usd + original_judge_usage.cost_usd
+    single_total = single_usage.cost_usd + single_judge_usage.cost_usd
+    multi_total = multi_usage.cost_usd + multi_judge_usage.cost_usd
+    single_cost_increase = single_total - original_total
+    multi_cost_increase = multi_total - original_total
+    single_quality_gain = single_score.total - original_score.total
+    multi_quality_gain = multi_score.total - original_score.total
+    multi_vs_single = multi_score.total - single_score.total
+    
     st.success("✅ Comparison complete!")
     st.subheader("📊 Enhancement Comparison")
     
@@ -244,19 +468,12 @@ def display_three_way_results(
         
         # Prompt
         with st.expander("View Prompt", expanded=False):
-            st.text_area("Original Prompt", value=original_prompt, height=100, disabled=True, key="orig_prompt_comp", label_visibility="hidden")
-        
-        # Score
-        st.metric("Quality Score", f"{original_score.total:.1f}/50", help="Judge evaluation")
+            st.code(original_prompt, language=None, wrap_lines=True, height=100)
         
         # LLM Output preview
         st.write("**LLM Response (preview):**")
-        output_preview = original_output[:200] + ("..." if len(original_output) > 200 else "")
-        st.text_area("Original LLM Output Preview", value=output_preview, height=100, disabled=True, key="orig_output_comp", label_visibility="hidden")
-        
-        # Cost
-        total_cost = original_usage.cost_usd + original_judge_usage.cost_usd
-        st.metric("Cost", f"${total_cost:.6f}")
+        output_preview = preview_text(original_output)
+        st.code(output_preview, language=None, wrap_lines=True, height=100)
     
     # Column 2: Single-Agent
     with col2:
@@ -265,21 +482,12 @@ def display_three_way_results(
         
         # Prompt
         with st.expander("View Enhanced Prompt", expanded=False):
-            st.text_area("Single-Agent Enhanced Prompt", value=single_enhanced, height=100, disabled=True, key="single_prompt_comp", label_visibility="hidden")
-        
-        # Score with delta
-        improvement = single_score.total - original_score.total
-        st.metric("Quality Score", f"{single_score.total:.1f}/50", f"+{improvement:.1f}", help="Judge evaluation")
+            st.code(single_enhanced, language=None, wrap_lines=True, height=100)
         
         # LLM Output preview
         st.write("**LLM Response (preview):**")
-        output_preview = single_output[:200] + ("..." if len(single_output) > 200 else "")
-        st.text_area("Single-Agent LLM Output Preview", value=output_preview, height=100, disabled=True, key="single_output_comp", label_visibility="hidden")
-        
-        # Cost
-        total_cost = single_usage.cost_usd + single_judge_usage.cost_usd
-        cost_increase = total_cost - (original_usage.cost_usd + original_judge_usage.cost_usd)
-        st.metric("Cost", f"${total_cost:.6f}", f"+${cost_increase:.6f}")
+        output_preview = preview_text(single_output)
+        st.code(output_preview, language=None, wrap_lines=True, height=100)
     
     # Column 3: Multi-Agent
     with col3:
@@ -288,27 +496,12 @@ def display_three_way_results(
         
         # Prompt
         with st.expander("View Enhanced Prompt", expanded=False):
-            st.text_area("Multi-Agent Enhanced Prompt", value=multi_enhanced, height=100, disabled=True, key="multi_prompt_comp", label_visibility="hidden")
-        
-        # Score with delta (compare to single-agent)
-        improvement_vs_original = multi_score.total - original_score.total
-        improvement_vs_single = multi_score.total - single_score.total
-        
-        # Show winner badge if best
-        if multi_score.total > single_score.total and multi_score.total > original_score.total:
-            st.metric("Quality Score", f"{multi_score.total:.1f}/50 🏆", f"+{improvement_vs_single:.1f} vs Single")
-        else:
-            st.metric("Quality Score", f"{multi_score.total:.1f}/50", f"+{improvement_vs_original:.1f}")
+            st.code(multi_enhanced, language=None, wrap_lines=True, height=100)
         
         # LLM Output preview
         st.write("**LLM Response (preview):**")
-        output_preview = multi_output[:200] + ("..." if len(multi_output) > 200 else "")
-        st.text_area("Multi-Agent LLM Output Preview", value=output_preview, height=100, disabled=True, key="multi_output_comp", label_visibility="hidden")
-        
-        # Cost
-        total_cost = multi_usage.cost_usd + multi_judge_usage.cost_usd
-        cost_increase = total_cost - (original_usage.cost_usd + original_judge_usage.cost_usd)
-        st.metric("Cost", f"${total_cost:.6f}", f"+${cost_increase:.6f}")
+        output_preview = preview_text(multi_output)
+        st.code(output_preview, language=None, wrap_lines=True, height=100)
         
         # Agent breakdown (expandable)
         with st.expander("🔍 See Agent Contributions"):
@@ -320,29 +513,52 @@ def display_three_way_results(
             for agent, score in vote_breakdown.items():
                 st.write(f"- {agent.title()}: {score:.2f}")
     
+    # Quality and cost for all three methods in one table (judge evaluation + LLM cost)
+    st.dataframe(
+        {
+            "Method": ["📄 Original", "🔧 Single-Agent", "🤖 Multi-Agent"],
+            "Quality Score": [original_score.total, single_score.total, multi_score.total],
+            "Δ Quality": [0.0, single_quality_gain, multi_quality_gain],
+            "Cost (USD)": [original_total, single_total, multi_total],
+            "Δ Cost (USD)": [0.0, single_cost_increase, multi_cost_increase]
+        },
+        hide_index=True,
+        width='stretch',
+        column_config={
+            "Quality Score": st.column_config.NumberColumn(format="%.1f/50"),
+            "Δ Quality": st.column_config.NumberColumn(format="%+.1f"),
+            "Cost (USD)": st.column_config.NumberColumn(format="$%.6f"),
+            "Δ Cost (USD)": st.column_config.NumberColumn(format="%+.6f")
+        }
+    )
+    
     # Full LLM execution outputs prominently displayed
     st.divider()
     st.subheader("🚀 LLM Execution Results - Side by Side Comparison")
     st.markdown("**These are the actual responses from executing each prompt with an LLM:**")
     st.caption("All three prompts were sent to the LLM and generated these responses")
     
-    # Three-column layout for outputs
-    output_col1, output_col2, output_col3 = st.columns(3)
-    
-    with output_col1:
-        st.markdown("### 📝 Original Prompt → LLM Output")
-        st.caption("What the LLM generated from your original prompt")
-        st.text_area("Original LLM Response", value=original_output, height=400, disabled=True, key="full_orig_top", label_visibility="hidden")
-    
-    with output_col2:
-        st.markdown("### 🔧 Single-Agent Prompt → LLM Output")
-        st.caption("What the LLM generated from the template-enhanced prompt")
-        st.text_area("Single-Agent LLM Response", value=single_output, height=400, disabled=True, key="full_single_top", label_visibility="hidden")
-    
-    with output_col3:
-        st.markdown("### 🤖 Multi-Agent Prompt → LLM Output")
-        st.caption("What the LLM generated from the multi-agent enhanced prompt")
-        st.text_area("Multi-Agent LLM Response", value=multi_output, height=400, disabled=True, key="full_multi_top", label_visibility="hidden")
+    if not (original_output or single_output or multi_output):
+        # Nothing to compare - skip the three large output blocks
+        st.info("No LLM output was captured for these prompts.")
+    else:
+        # Three-column layout for outputs
+        output_col1, output_col2, output_col3 = st.columns(3)
+        
+        with output_col1:
+            st.markdown("### 📝 Original Prompt → LLM Output")
+            st.caption("What the LLM generated from your original prompt")
+            st.code(original_output, language=None, wrap_lines=True, height=400)
+        
+        with output_col2:
+            st.markdown("### 🔧 Single-Agent Prompt → LLM Output")
+            st.caption("What the LLM generated from the template-enhanced prompt")
+            st.code(single_output, language=None, wrap_lines=True, height=400)
+        
+        with output_col3:
+            st.markdown("### 🤖 Multi-Agent Prompt → LLM Output")
+            st.caption("What the LLM generated from the multi-agent enhanced prompt")
+            st.code(multi_output, language=None, wrap_lines=True, height=400)
     
     # Winner declaration
     st.divider()
@@ -358,11 +574,11 @@ def display_three_way_results(
     
     # Calculate improvements
     if winner == "Multi-Agent":
-        improvement_text = f"+{winner_score - single_score.total:.1f} points vs Single-Agent, +{winner_score - original_score.total:.1f} vs Original"
+        improvement_text = f"+{multi_vs_single:.1f} points vs Single-Agent, +{multi_quality_gain:.1f} vs Original"
         st.success(f"🏆 WINNER: {winner} ({winner_score:.1f}/50 points)")
         st.info(f"📈 Improvement: {improvement_text}")
     elif winner == "Single-Agent":
-        improvement_text = f"+{winner_score - original_score.total:.1f} points vs Original"
+        improvement_text = f"+{single_quality_gain:.1f} points vs Original"
         st.success(f"🏆 WINNER: {winner} ({winner_score:.1f}/50 points)")
         st.info(f"📈 Improvement: {improvement_text}")
     else:
@@ -376,35 +592,7 @@ def display_three_way_results(
     # Map winner to agent for tracking
     judge_winner = multi_metadata["selected_agent"]  # syntax, structure, or domain
     
-    # Check if feedback already submitted (use session state)
-    feedback_key = f"feedback_submitted_{request_id}"
-    if feedback_key not in st.session_state:
-        st.session_state[feedback_key] = False
-    
-    if not st.session_state[feedback_key]:
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            if st.button("👍 Original was best", key=f"vote_orig_{request_id}", type="secondary"):
-                submit_feedback(request_id, "original", judge_winner, "none")
-                st.session_state[feedback_key] = True
-                # No page refresh - feedback submitted silently
-        
-        with col2:
-            if st.button("👍 Single-Agent was best", key=f"vote_single_{request_id}", type="secondary"):
-                submit_feedback(request_id, "single", judge_winner, "template")
-                st.session_state[feedback_key] = True
-                # No page refresh - feedback submitted silently
-        
-        with col3:
-            if st.button("👍 Multi-Agent was best", key=f"vote_multi_{request_id}", type="primary"):
-                submit_feedback(request_id, "multi", judge_winner, judge_winner)
-                st.session_state[feedback_key] = True
-                # No page refresh - feedback submitted silently
-    
-    # Show confirmation immediately after any button click
-    if st.session_state[feedback_key]:
-        st.success("✅ Thank you! Your feedback has been recorded and will help the system learn.")
+    show_feedback_vote(request_id, judge_winner)
     
     # ROI Analysis
     st.divider()
@@ -414,33 +602,25 @@ def display_three_way_results(
     
     with col1:
         st.write("**Cost Comparison:**")
-        original_total = original_usage.cost_usd + original_judge_usage.cost_usd
-        single_total = single_usage.cost_usd + single_judge_usage.cost_usd
-        multi_total = multi_usage.cost_usd + multi_judge_usage.cost_usd
-        
         st.write(f"- Original: ${original_total:.6f}")
-        st.write(f"- Single-Agent: ${single_total:.6f} ({(single_total/original_total):.1f}x)")
-        st.write(f"- Multi-Agent: ${multi_total:.6f} ({(multi_total/original_total):.1f}x)")
+        st.write(f"- Single-Agent: ${single_total:.6f} ({safe_ratio(single_total, original_total):.1f}x)")
+        st.write(f"- Multi-Agent: ${multi_total:.6f} ({safe_ratio(multi_total, original_total):.1f}x)")
     
     with col2:
         st.write("**Quality vs Cost:**")
         
         # Single-Agent ROI
-        single_quality_gain = single_score.total - original_score.total
-        single_cost_increase = single_total - original_total
         if single_cost_increase > 0:
             single_roi = single_quality_gain / (single_cost_increase * 1000000)  # points per micro-dollar
             st.write(f"- Single-Agent: {single_roi:.1f} pts/μ$")
         
         # Multi-Agent ROI
-        multi_quality_gain = multi_score.total - original_score.total
-        multi_cost_increase = multi_total - original_total
         if multi_cost_increase > 0:
             multi_roi = multi_quality_gain / (multi_cost_increase * 1000000)
             st.write(f"- Multi-Agent: {multi_roi:.1f} pts/μ$")
         
         # Recommendation
-        if multi_score.total > single_score.total:
+        if multi_vs_single > 0:
             st.success("💡 Multi-Agent delivers higher quality")
         elif multi_cost_increase > 0 and single_cost_increase > 0 and multi_roi > single_roi:
             st.info("💡 Multi-Agent has better ROI")
@@ -453,24 +633,42 @@ def show_multi_agent_only(prompt_text: str):
     
     with st.spinner("Running multi-agent analysis..."):
         try:
-            response = requests.post(
-                f"{API_BASE}/prompts/multi-agent-enhance",
-                headers={"Authorization": f"Bearer {st.session_state.access_token}"},
-                json={"text": prompt_text, "enhancement_type": "general"}
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                if result.get("success"):
-                    display_multi_agent_results(result["data"])
-                else:
-                    st.error(f"Enhancement failed: {result.get('error', 'Unknown error')}")
-            else:
-                st.error(f"Request failed with status {response.status_code}")
+            result = fetch_multi_agent_enhancement(st.session_state.get("access_token", ""), prompt_text)
+            # Keep the result in session state so it persists across reruns
+            st.session_state['multi_agent_results'] = result["data"]
+            display_multi_agent_results(result["data"])
+        except MultiAgentEnhanceFailed as e:
+            st.error(f"Enhancement failed: {e}")
+        except requests.HTTPError as e:
+            st.error(f"Request failed with status {e.response.status_code}")
         except Exception as e:
             st.error(f"Error calling backend: {e}")
 
 
+@st.fragment
+def show_editable_enhanced_prompt(enhanced_prompt: str, original_score):
+    """
+    Editable enhanced prompt with an explicit re-judge button.
+    
+    Runs as a fragment, so editing the text reruns only this block and the
+    comparison around it stays on screen. The judge runs only when the
+    button is pressed, never on the edit itself. Widget keys are derived
+    from the enhanced prompt, since a keyed text area ignores a new value.
+    """
+    widget_id = hashlib.sha1(enhanced_prompt.encode("utf-8")).hexdigest()[:12]
+    edited_prompt = st.text_area("Enhanced Prompt", value=enhanced_prompt, height=150, key=f"enh_prompt_{widget_id}", label_visibility="hidden")
+    
+    if st.button("🔁 Re-judge edited prompt", key=f"rejudge_enh_prompt_{widget_id}", disabled=edited_prompt == enhanced_prompt):
+        try:
+            with st.spinner("Judging edited prompt..."):
+                edited_score, _ = cached_judge_prompt(edited_prompt)
+        except Exception as e:
+            st.warning(f"⚠️ Could not judge the edited prompt: {e}")
+            return
+        improvement = edited_score.total - original_score.total
+        st.metric("Edited Score", f"{edited_score.total:.1f}/50", f"{improvement:+.1f}", help="Judge score of your edited prompt")
+
+
 def show_single_agent_only(prompt_text: str, context: str = ""):
     """Single-Agent enhancement (existing flow)"""
     
@@ -478,7 +676,6 @@ def show_single_agent_only(prompt_text: str, context: str = ""):
     try:
         from packages.core import (
             fallback_to_template,
-            judge_prompt,
             TokenTracker,
             generate_llm_output
         )
@@ -498,17 +695,19 @@ def show_single_agent_only(prompt_text: str, context: str = ""):
             enhanced_result = fallback_to_template(prompt_text)
             enhanced_prompt = enhanced_result.text
             
-            # Step 2: Generate outputs with both prompts
+            # Step 2 & 3: Generate outputs and judge both prompts.
+            # The four LLM calls are independent, so run them concurrently.
             try:
-                # Generate with original prompt
-                original_output, original_usage = generate_llm_output(prompt_text)
-                
-                # Generate with enhanced prompt
-                enhanced_output, enhanced_usage = generate_llm_output(enhanced_prompt)
-                
-                # Step 3: Judge both prompts
-                original_score, original_judge_usage = judge_prompt(prompt_text)
-                enhanced_score, enhanced_judge_usage = judge_prompt(enhanced_prompt)
+                with ThreadPoolExecutor(max_workers=4) as executor:
+                    original_output_future = executor.submit(generate_llm_output, prompt_text)
+                    enhanced_output_future = executor.submit(generate_llm_output, enhanced_prompt)
+                    original_judge_future = executor.submit(cached_judge_prompt, prompt_text)
+                    enhanced_judge_future = executor.submit(cached_judge_prompt, enhanced_prompt)
+                    
+                    original_output, original_usage = original_output_future.result()
+                    enhanced_output, enhanced_usage = enhanced_output_future.result()
+                    original_score, original_judge_usage = original_judge_future.result()
+                    enhanced_score, enhanced_judge_usage = enhanced_judge_future.result()
                 
                 llm_available = True
             except Exception as e:
@@ -535,85 +734,92 @@ def show_single_agent_only(prompt_text: str, context: str = ""):
                 enhanced_judge_usage = tracker.track_llm_call("judge prompt", "judge result", "mock-model")
                 llm_available = False
         
-        st.success("✅ Prompt enhanced and evaluated successfully!")
-        
-        # Display comparison results
-        st.subheader("📊 Enhancement Comparison")
-        
-        # Prompt comparison
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("### 📝 Original Prompt")
-            st.text_area("Original Prompt", value=prompt_text, height=150, disabled=True, key="orig_prompt", label_visibility="hidden")
-            
-            st.markdown("### 📈 Original Score")
-            st.metric("Total Score", f"{original_score.total:.1f}/50", help="Overall prompt quality score")
-            
-            score_cols = st.columns(5)
-            scores = [
-                ("Clarity", original_score.clarity),
-                ("Specific", original_score.specificity),
-                ("Action", original_score.actionability),
-                ("Structure", original_score.structure),
-                ("Context", original_score.context_use)
-            ]
-            for i, (label, score) in enumerate(scores):
-                with score_cols[i]:
-                    st.metric(label, f"{score:.1f}")
-            
-            with st.expander("💬 Judge Feedback"):
-                st.write("**Strengths:**")
-                for pro in original_score.feedback.get("pros", []):
-                    st.write(f"• {pro}")
-                st.write("**Areas for Improvement:**")
-                for con in original_score.feedback.get("cons", []):
-                    st.write(f"• {con}")
-                st.write(f"**Summary:** {original_score.feedback.get('summary', 'No summary')}")
-        
-        with col2:
-            st.markdown("### ✨ Enhanced Prompt")
-            st.text_area("Enhanced Prompt", value=enhanced_prompt, height=150, key="enh_prompt", label_visibility="hidden")
-            
-            st.markdown("### 📈 Enhanced Score")
-            improvement = enhanced_score.total - original_score.total
-            st.metric("Total Score", f"{enhanced_score.total:.1f}/50", f"+{improvement:.1f}", help="Overall prompt quality score")
-            
-            score_cols = st.columns(5)
-            enhanced_scores = [
-                ("Clarity", enhanced_score.clarity),
-                ("Specific", enhanced_score.specificity),
-                ("Action", enhanced_score.actionability),
-                ("Structure", enhanced_score.structure),
-                ("Context", enhanced_score.context_use)
-            ]
-            for i, (label, score) in enumerate(enhanced_scores):
-                with score_cols[i]:
-                    delta = score - scores[i][1]
-                    st.metric(label, f"{score:.1f}", f"+{delta:.1f}")
-            
-            with st.expander("💬 Judge Feedback"):
-                st.write("**Strengths:**")
-                for pro in enhanced_score.feedback.get("pros", []):
-                    st.write(f"• {pro}")
-                st.write("**Areas for Improvement:**")
-                for con in enhanced_score.feedback.get("cons", []):
-                    st.write(f"• {con}")
-                st.write(f"**Summary:** {enhanced_score.feedback.get('summary', 'No summary')}")
-        
-        # Output comparison
-        st.markdown("---")
-        st.subheader("🎯 Output Comparison")
-        
-        col1, col2 = st.columns(2)
+        # Store results in session state so they persist across reruns
+        st.session_state['single_agent_results'] = {
+            'prompt_text': prompt_text,
+            'enhanced_prompt': enhanced_prompt,
+            'original_output': original_output,
+            'enhanced_output': enhanced_output,
+            'original_score': original_score,
+            'enhanced_score': enhanced_score
+        }
+        
+        display_single_agent_results(
+            prompt_text, enhanced_prompt,
+            original_output, enhanced_output,
+            original_score, enhanced_score
+        )
+
+
+def display_single_agent_results(
+    prompt_text, enhanced_prompt,
+    original_output, enhanced_output,
+    original_score, enhanced_score
+):
+    """Display single-agent enhancement results"""
+    st.success("✅ Prompt enhanced and evaluated successfully!")
+    
+    # Display comparison results
+    st.subheader("📊 Enhancement Comparison")
+    
+    # Prompt comparison
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("### 📝 Original Prompt")
+        st.code(prompt_text, language=None, wrap_lines=True, height=150)
         
-        with col1:
-            st.markdown("### 📄 Original Output")
-            st.text_area("Response to original prompt:", value=original_output, height=200, disabled=True, key="orig_output")
+        st.markdown("### 📈 Original Score")
+        st.metric("Total Score", f"{original_score.total:.1f}/50", help="Overall prompt quality score")
         
-        with col2:
-            st.markdown("### ✨ Enhanced Output")
-            st.text_area("Response to enhanced prompt:", value=enhanced_output, height=200, disabled=True, key="enh_output")
+        with st.expander("💬 Judge Feedback"):
+            st.write("**Strengths:**")
+            for pro in original_score.feedback.get("pros", []):
+                st.write(f"• {pro}")
+            st.write("**Areas for Improvement:**")
+            for con in original_score.feedback.get("cons", []):
+                st.write(f"• {con}")
+            st.write(f"**Summary:** {original_score.feedback.get('summary', 'No summary')}")
+    
+    with col2:
+        st.markdown("### ✨ Enhanced Prompt")
+        show_editable_enhanced_prompt(enhanced_prompt, original_score)
+        
+        st.markdown("### 📈 Enhanced Score")
+        improvement = enhanced_score.total - original_score.total
+        st.metric("Total Score", f"{enhanced_score.total:.1f}/50", f"+{improvement:.1f}", help="Overall prompt quality score")
+        
+        with st.expander("💬 Judge Feedback"):
+            st.write("**Strengths:**")
+            for pro in enhanced_score.feedback.get("pros", []):
+                st.write(f"• {pro}")
+            st.write("**Areas for Improvement:**")
+            for con in enhanced_score.feedback.get("cons", []):
+                st.write(f"• {con}")
+            st.write(f"**Summary:** {enhanced_score.feedback.get('summary', 'No summary')}")
+    
+    st.markdown("### 📋 Criteria Breakdown")
+    show_criteria_table(original_score, enhanced_score)
+    
+    # Output comparison
+    st.markdown("---")
+    st.subheader("🎯 Output Comparison")
+    
+    if not (original_output or enhanced_output):
+        st.info("No LLM output was captured for these prompts.")
+        return
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("### 📄 Original Output")
+        st.caption("Response to original prompt:")
+        st.code(original_output, language=None, wrap_lines=True, height=200)
+    
+    with col2:
+        st.markdown("### ✨ Enhanced Output")
+        st.caption("Response to enhanced prompt:")
+        st.code(enhanced_output, language=None, wrap_lines=True, height=200)
 
 
 def display_multi_agent_results(data):
@@ -621,7 +827,7 @@ def display_multi_agent_results(data):
     st.success("✅ Multi-agent enhancement complete!")
     
     st.subheader("🤖 Enhanced Prompt (Best Agent)")
-    st.text_area("Enhanced Prompt", value=data["enhanced_text"], height=200, disabled=True, key="multi_enhanced")
+    st.code(data["enhanced_text"], language=None, wrap_lines=True, height=200)
     
     st.subheader("🏆 Winning Agent")
     st.info(f"**{data['selected_agent'].title()} Agent** was selected as the winner")
@@ -1,10 +1,210 @@
 """Security Dashboard page - Monitor security inputs and risk scores"""
 import streamlit as st
 import requests
+import numpy as np
 import pandas as pd
 import plotly.express as px
 from datetime import datetime
-from utils.api_client import API_BASE
+from functools import partial
+from utils.api_client import DEFAULT_TIMEOUT, api_url, get_http_session, is_backend_available, parse_json
+
+# Max points sent to the browser for the risk trend chart
+MAX_TREND_POINTS = 300
+
+
+@st.cache_data(ttl=15, show_spinner=False)
+def fetch_security_inputs(
+    access_token: str,
+    filter_label: str,
+    filter_blocked: str,
+    filter_high_risk: bool,
+    limit: int = 1000
+) -> list:
+    """
+    Fetch security inputs from the backend, cached per filter combination.
+    
+    Args:
+        access_token: Current session token (part of the cache key)
+        filter_label: Label filter from the sidebar ("All" for no filter)
+        filter_blocked: Blocked-status filter from the sidebar
+        filter_high_risk: Whether to return high-risk inputs only
+        limit: Maximum number of inputs to return
+    
+    Returns:
+        List of security input dicts
+    
+    Raises:
+        requests.HTTPError: If the backend returns a non-2xx status
+    """
+    params = {"limit": limit}
+    if filter_label != "All":
+        params["filter_label"] = filter_label
+    if filter_blocked == "Blocked Only":
+        params["filter_blocked"] = True
+    elif filter_blocked == "Not Blocked":
+        params["filter_blocked"] = False
+    if filter_high_risk:
+        params["filter_high_risk"] = True
+    
+    response = get_http_session().get(
+        api_url("/v1/security/inputs"),
+        params=params,
+        headers={"Authorization": f"Bearer {access_token}"},
+        timeout=DEFAULT_TIMEOUT
+    )
+    response.raise_for_status()
+    return parse_json(response)
+
+
+@st.cache_data(show_spinner=False)
+def build_security_frames(inputs: list) -> tuple:
+    """
+    Build the raw frame, parsed timestamps and formatted log table from inputs.
+    
+    Cached on the inputs themselves, so reruns with unchanged data (period
+    selector, paging, expanders) skip the timestamp parse and the string
+    slicing/length work over every input text.
+    
+    Args:
+        inputs: Security input dicts from /v1/security/inputs
+    
+    Returns:
+        Tuple of (df_raw, created_ts, log_df)
+    """
+    df_raw = pd.DataFrame(inputs)
+    # Bulk ISO 8601 parse (handles trailing "Z"); unparseable values become NaT
+    created_ts = pd.to_datetime(df_raw["createdAt"], format="ISO8601", errors="coerce", utc=True)
+    
+    # Prepare data for table (column-wise, no per-row Python work)
+    risk = df_raw["riskScore"].fillna(0)
+    risk_emoji = np.select([risk >= 70, risk >= 40], ["🔴", "🟡"], default="🟢")
+    input_text = df_raw["inputText"].fillna("")
+    user_id = df_raw["userId"].fillna("")
+    
+    log_df = pd.DataFrame({
+        "Timestamp": created_ts.dt.strftime("%Y-%m-%d %H:%M:%S").fillna(df_raw["createdAt"].fillna("N/A")),
+        "Input": input_text.str.slice(0, 100) + np.where(input_text.str.len() > 100, "...", ""),
+        "Risk": risk_emoji + " " + risk.map("{:.1f}".format),
+        "Label": df_raw["label"].fillna("unknown"),
+        "Status": np.where(df_raw["isBlocked"].fillna(False).astype(bool), "🚫", "✅"),
+        "User": user_id.str.slice(0, 15).where(user_id != "", "N/A")
+    })
+    return df_raw, created_ts, log_df
+
+
+@st.fragment
+def show_security_log(df: pd.DataFrame, max_rows: int = 100):
+    """
+    Render the paginated security input log and its CSV export.
+    
+    Runs as a fragment, so paging through the log reruns only this table
+    instead of the whole dashboard (metrics, charts and trends).
+    Sidebar filters stay outside since fragments cannot write to the sidebar.
+    
+    Args:
+        df: Formatted security input log
+        max_rows: Rows shown per page
+    """
+    # Display table - page through large logs so only one slice is sent to the browser
+    if len(df) > max_rows:
+        total_pages = -(-len(df) // max_rows)
+        page = st.slider(
+            "Page",
+            min_value=1,
+            max_value=total_pages,
+            value=1,
+            help=f"{max_rows} inputs per page, {len(df)} inputs total"
+        )
+        start_row = (page - 1) * max_rows
+        df_view = df.iloc[start_row:start_row + max_rows]
+    else:
+        df_view = df
+    st.dataframe(df_view, use_container_width=True, hide_index=True)
+    
+    # Export option (CSV is generated only when the button is clicked)
+    st.download_button(
+        label="📥 Download as CSV",
+        data=partial(df.to_csv, index=False),
+        file_name=f"security_inputs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+        mime="text/csv"
+    )
+
+
+def show_risk_trends(created_ts: pd.Series, risk_score: pd.Series):
+    """
+    Risk score evolution chart with simple change-point detection.
+    
+    Args:
+        created_ts: Parsed input timestamps (NaT for unparseable values)
+        risk_score: Risk score per input, aligned with created_ts
+    """
+    try:
+        # Analyze temporal risk trends
+        if len(created_ts) > 1:
+            # Time series from the already-parsed timestamps, oldest first
+            ts_df = pd.DataFrame({
+                'Timestamp': created_ts,
+                'Risk Score': risk_score.fillna(0)
+            }).dropna(subset=['Timestamp']).sort_values('Timestamp', kind='stable')
+            risk_scores = ts_df['Risk Score'].tolist()
+            
+            if risk_scores:
+                # Downsample long histories server-side: consecutive inputs are
+                # bucketed and each bucket keeps its peak risk (so spikes past
+                # the thresholds stay visible)
+                plot_df = ts_df
+                if len(ts_df) > MAX_TREND_POINTS:
+                    bucket = np.arange(len(ts_df)) * MAX_TREND_POINTS // len(ts_df)
+                    plot_df = ts_df.groupby(bucket).agg({'Timestamp': 'last', 'Risk Score': 'max'})
+                    st.caption(f"Showing peak risk across {len(plot_df)} time buckets ({len(ts_df)} inputs)")
+                
+                # Plot risk trend
+                fig = px.line(
+                    plot_df,
+                    x='Timestamp',
+                    y='Risk Score',
+                    title='Risk Score Evolution',
+                    labels={'Risk Score': 'Risk Score (0-100)', 'Timestamp': 'Time'}
+                )
+                
+                # Add threshold lines
+                fig.add_hline(y=70, line_dash="dash", line_color="red", annotation_text="High Risk")
+                fig.add_hline(y=40, line_dash="dash", line_color="orange", annotation_text="Medium Risk")
+                
+                st.plotly_chart(fig, use_container_width=True)
+                
+                # Change-point detection (simple)
+                overall_avg = sum(risk_scores) / len(risk_scores)
+                if len(risk_scores) > 5:
+                    recent_avg = sum(risk_scores[-5:]) / 5
+                    
+                    if recent_avg > overall_avg + 15:
+                        st.error(f"🚨 **Risk Escalation Detected!** Recent average ({recent_avg:.1f}) is significantly higher than overall average ({overall_avg:.1f})")
+                        st.warning("⚠️ **Action Required:** Investigate recent inputs for potential security threats")
+                    elif recent_avg < overall_avg - 15:
+                        st.success(f"✅ **Risk Reduction Observed:** Recent average ({recent_avg:.1f}) is lower than overall average ({overall_avg:.1f})")
+                    else:
+                        st.info(f"ℹ️ **Stable Risk Level:** Recent average ({recent_avg:.1f}) is consistent with overall average ({overall_avg:.1f})")
+                
+                # Statistics
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Current Risk", f"{risk_scores[-1]:.1f}")
+                with col2:
+                    st.metric("Average Risk", f"{overall_avg:.1f}")
+                with col3:
+                    trend = "📈" if len(risk_scores) > 1 and risk_scores[-1] > risk_scores[0] else "📉"
+                    st.metric("Trend", trend)
+                
+                st.info("💡 **Insight:** Use temporal trends to detect security pattern changes and respond proactively")
+            else:
+                st.info("💡 No valid timestamp data for trend analysis")
+        else:
+            st.info("💡 Need more security inputs (2+) to analyze trends")
+    
+    except Exception as e:
+        st.warning(f"Risk trend analysis unavailable: {str(e)}")
+        st.info("💡 Continue monitoring security inputs to enable trend detection")
 
 
 def show_security_dashboard():
@@ -17,8 +217,6 @@ def show_security_dashboard():
         st.error("❌ Not authenticated. Please login first.")
         return
     
-    headers = {"Authorization": f"Bearer {st.session_state.access_token}"}
-    
     # Sidebar filters
     with st.sidebar:
         # Configuration section (Phase 3 - 2025-12-05)
@@ -55,335 +253,210 @@ def show_security_dashboard():
         )
         
         filter_high_risk = st.checkbox("Show High-Risk Only (≥70)", value=False)
+        
+        if st.button("🔄 Refresh Data"):
+            fetch_security_inputs.clear()
     
-    # Build query parameters
-    params = {"limit": 1000}
-    if filter_label != "All":
-        params["filter_label"] = filter_label
-    if filter_blocked == "Blocked Only":
-        params["filter_blocked"] = True
-    elif filter_blocked == "Not Blocked":
-        params["filter_blocked"] = False
-    if filter_high_risk:
-        params["filter_high_risk"] = True
+    if not is_backend_available():
+        st.error("❌ Could not connect to the API. Make sure the backend is running on http://localhost:8001")
+        return
     
-    # Fetch security inputs
+    # Fetch security inputs (cached per filter combination)
     try:
         with st.spinner("Loading security inputs..."):
-            response = requests.get(f"{API_BASE}/v1/security/inputs", params=params, headers=headers)
+            inputs = fetch_security_inputs(
+                st.session_state.access_token,
+                filter_label,
+                filter_blocked,
+                filter_high_risk
+            )
         
-        if response.status_code == 200:
-            inputs = response.json()
+        if not inputs:
+            st.info("No security inputs found matching the selected filters.")
+        else:
+            # Frames are cached on the inputs; summaries below are single vectorized passes
+            df_raw, created_ts, df = build_security_frames(inputs)
+            
+            # Security Effectiveness section with period selector (Phase 3 - 2025-12-05)
+            st.subheader("📊 Security Effectiveness")
+            
+            # Period selector
+            period_col1, period_col2 = st.columns([1, 3])
+            with period_col1:
+                period = st.selectbox(
+                    "Time Period",
+                    ["Last 24h", "Last 7d", "Last 30d", "All Time"],
+                    index=3
+                )
+            
+            # Filter inputs by period
+            from datetime import timedelta
+            now = datetime.now()
             
-            if not inputs:
-                st.info("No security inputs found matching the selected filters.")
+            if period == "Last 24h":
+                cutoff = now - timedelta(hours=24)
+            elif period == "Last 7d":
+                cutoff = now - timedelta(days=7)
+            elif period == "Last 30d":
+                cutoff = now - timedelta(days=30)
             else:
-                # Security Effectiveness section with period selector (Phase 3 - 2025-12-05)
-                st.subheader("📊 Security Effectiveness")
-                
-                # Period selector
-                period_col1, period_col2 = st.columns([1, 3])
-                with period_col1:
-                    period = st.selectbox(
-                        "Time Period",
-                        ["Last 24h", "Last 7d", "Last 30d", "All Time"],
-                        index=3
-                    )
-                
-                # Filter inputs by period
-                from datetime import datetime, timedelta
-                now = datetime.now()
-                
-                if period == "Last 24h":
-                    cutoff = now - timedelta(hours=24)
-                elif period == "Last 7d":
-                    cutoff = now - timedelta(days=7)
-                elif period == "Last 30d":
-                    cutoff = now - timedelta(days=30)
+                cutoff = None
+            
+            # Apply period filter (rows with unparseable timestamps are excluded)
+            if cutoff:
+                df_metrics = df_raw[created_ts.dt.tz_localize(None) >= cutoff]
+            else:
+                df_metrics = df_raw
+            
+            col1, col2, col3, col4 = st.columns(4)
+            
+            total_inputs = len(df_metrics)
+            metric_risk = df_metrics["riskScore"].fillna(0)
+            blocked_count = int(df_metrics["isBlocked"].fillna(False).astype(bool).sum())
+            high_risk_count = int(metric_risk.ge(70).sum())
+            avg_risk_score = float(metric_risk.mean()) if total_inputs > 0 else 0
+            blocked_rate = (blocked_count / total_inputs * 100) if total_inputs > 0 else 0
+            
+            with col1:
+                st.metric("Total Analyzed", total_inputs)
+            
+            with col2:
+                st.metric("Blocked Rate", f"{blocked_rate:.1f}%")
+            
+            with col3:
+                st.metric("High-Risk (≥70)", high_risk_count)
+            
+            with col4:
+                st.metric("Avg Risk Score", f"{avg_risk_score:.1f}")
+            
+            st.divider()
+            
+            # Risk Distribution Chart (Phase 3 - 2025-12-05)
+            st.subheader("📈 Risk Distribution")
+            
+            # Calculate distribution by category (one value_counts pass over df_raw)
+            label_counts = df_raw["label"].fillna("safe").value_counts()
+            distribution = {
+                label: int(label_counts.get(label, 0))
+                for label in ("safe", "low-risk", "medium-risk", "high-risk")
+            }
+            
+            # Color mapping (green, yellow, orange, red)
+            color_map = {
+                'safe': '#28a745',        # green
+                'low-risk': '#ffc107',    # yellow
+                'medium-risk': '#fd7e14',  # orange
+                'high-risk': '#dc3545'     # red
+            }
+            
+            # Create bar chart straight from the four counts (no intermediate DataFrame)
+            categories = list(distribution.keys())
+            fig_dist = px.bar(
+                x=categories,
+                y=list(distribution.values()),
+                title='Security Inputs by Risk Category',
+                labels={'y': 'Number of Inputs', 'x': 'Risk Category', 'color': 'Risk Category'},
+                color=categories,
+                color_discrete_map=color_map
+            )
+            
+            st.plotly_chart(fig_dist, use_container_width=True)
+            
+            st.divider()
+            
+            # Risk indicators
+            st.subheader("⚠️ Risk Indicators")
+            
+            indicator_col1, indicator_col2 = st.columns(2)
+            
+            with indicator_col1:
+                if blocked_count > 0:
+                    st.error(f"🚫 **{blocked_count} Blocked Attempt(s)**")
                 else:
-                    cutoff = None
-                
-                # Apply period filter
-                period_filtered_inputs = inputs
-                if cutoff:
-                    period_filtered_inputs = []
-                    for inp in inputs:
-                        try:
-                            timestamp = datetime.fromisoformat(inp.get("createdAt", "").replace("Z", "+00:00"))
-                            if timestamp.replace(tzinfo=None) >= cutoff:
-                                period_filtered_inputs.append(inp)
-                        except:
-                            continue
-                
-                # Use period-filtered inputs for metrics
-                inputs_for_metrics = period_filtered_inputs
-                
-                col1, col2, col3, col4 = st.columns(4)
-                
-                total_inputs = len(inputs_for_metrics)
-                blocked_count = sum(1 for inp in inputs_for_metrics if inp.get("isBlocked", False))
-                high_risk_count = sum(1 for inp in inputs_for_metrics if inp.get("riskScore", 0) >= 70)
-                avg_risk_score = sum(inp.get("riskScore", 0) for inp in inputs_for_metrics) / total_inputs if total_inputs > 0 else 0
-                blocked_rate = (blocked_count / total_inputs * 100) if total_inputs > 0 else 0
-                
-                with col1:
-                    st.metric("Total Analyzed", total_inputs)
-                
-                with col2:
-                    st.metric("Blocked Rate", f"{blocked_rate:.1f}%")
-                
-                with col3:
-                    st.metric("High-Risk (≥70)", high_risk_count)
-                
-                with col4:
-                    st.metric("Avg Risk Score", f"{avg_risk_score:.1f}")
-                
-                st.divider()
-                
-                # Risk Distribution Chart (Phase 3 - 2025-12-05)
-                st.subheader("📈 Risk Distribution")
-                
-                # Calculate distribution by category
-                distribution = {
-                    "safe": 0,
-                    "low-risk": 0,
-                    "medium-risk": 0,
-                    "high-risk": 0
-                }
-                
-                for inp in inputs:
-                    label = inp.get("label", "safe")
-                    if label in distribution:
-                        distribution[label] += 1
-                
-                # Create bar chart
-                dist_df = pd.DataFrame({
-                    'Category': list(distribution.keys()),
-                    'Count': list(distribution.values())
-                })
-                
-                # Color mapping (green, yellow, orange, red)
-                color_map = {
-                    'safe': '#28a745',        # green
-                    'low-risk': '#ffc107',    # yellow
-                    'medium-risk': '#fd7e14',  # orange
-                    'high-risk': '#dc3545'     # red
-                }
-                
-                fig_dist = px.bar(
-                    dist_df,
-                    x='Category',
-                    y='Count',
-                    title='Security Inputs by Risk Category',
-                    labels={'Count': 'Number of Inputs', 'Category': 'Risk Category'},
-                    color='Category',
-                    color_discrete_map=color_map
-                )
-                
-                st.plotly_chart(fig_dist, use_container_width=True)
-                
-                st.divider()
-                
-                # Risk indicators
-                st.subheader("⚠️ Risk Indicators")
-                
-                indicator_col1, indicator_col2 = st.columns(2)
-                
-                with indicator_col1:
-                    if blocked_count > 0:
-                        st.error(f"🚫 **{blocked_count} Blocked Attempt(s)**")
-                    else:
-                        st.success("✅ No blocked attempts")
-                
-                with indicator_col2:
-                    if high_risk_count > 0:
-                        st.warning(f"⚠️ **{high_risk_count} High-Risk Attempt(s)**")
-                    else:
-                        st.info("ℹ️ No high-risk attempts")
-                
-                st.divider()
-                
-                # API Usage & Token Tracking section
-                st.subheader("💰 API Usage & Token Tracking")
-                
-                if 'latest_multi_agent_result' in st.session_state:
-                    data = st.session_state['latest_multi_agent_result']
-                    token_usage = data.get('token_usage', {})
-                    total_cost = data.get('total_cost_usd', 0)
-                    total_tokens = data.get('total_tokens', 0)
-                    
-                    if token_usage:
-                        api_col1, api_col2, api_col3, api_col4 = st.columns(4)
-                        
-                        with api_col1:
-                            st.metric("Multi-Agent Calls", "1", help="Latest multi-agent enhancement request")
-                        
-                        with api_col2:
-                            st.metric("Total Tokens", f"{total_tokens:,}" if total_tokens else "N/A")
-                        
-                        with api_col3:
-                            st.metric("Total Cost", f"${total_cost:.6f}" if total_cost else "N/A")
-                        
-                        with api_col4:
-                            # Calculate projected monthly cost (assuming 100 requests/day)
-                            requests_per_day = 100
-                            requests_per_month = requests_per_day * 30
-                            projected_cost = total_cost * requests_per_month if total_cost else 0
-                            st.metric("Projected Monthly", f"${projected_cost:.2f}", help="Based on 100 requests/day")
-                        
-                        # Token usage table
-                        token_data = []
-                        for agent_name, usage in token_usage.items():
-                            token_data.append({
-                                "Agent": agent_name.capitalize(),
-                                "Model": usage.get('model', 'N/A'),
-                                "Tokens": usage.get('total_tokens', 0),
-                                "Cost": f"${usage.get('cost_usd', 0):.6f}"
-                            })
-                        
-                        if token_data:
-                            df_tokens = pd.DataFrame(token_data)
-                            st.dataframe(df_tokens, use_container_width=True, hide_index=True)
-                        
-                        st.info("💡 Monitor token usage to optimize costs. View detailed analytics in **Token Analytics** page.")
-                    else:
-                        st.info("No token usage data available. Run a multi-agent enhancement to track API usage.")
+                    st.success("✅ No blocked attempts")
+            
+            with indicator_col2:
+                if high_risk_count > 0:
+                    st.warning(f"⚠️ **{high_risk_count} High-Risk Attempt(s)**")
                 else:
-                    st.info("No multi-agent requests yet. Try the **Multi-Agent Enhancement** page to see token tracking.")
-                
-                st.divider()
-                
-                # Data table
-                st.subheader("📋 Security Input Log")
-                
-                # Prepare data for table
-                table_data = []
-                for inp in inputs:
-                    # Format timestamp
-                    try:
-                        timestamp = datetime.fromisoformat(inp.get("createdAt", "").replace("Z", "+00:00"))
-                        formatted_time = timestamp.strftime("%Y-%m-%d %H:%M:%S")
-                    except:
-                        formatted_time = inp.get("createdAt", "N/A")
+                    st.info("ℹ️ No high-risk attempts")
+            
+            st.divider()
+            
+            # API Usage & Token Tracking section
+            st.subheader("💰 API Usage & Token Tracking")
+            
+            if 'latest_multi_agent_result' in st.session_state:
+                data = st.session_state['latest_multi_agent_result']
+                token_usage = data.get('token_usage', {})
+                total_cost = data.get('total_cost_usd', 0)
+                total_tokens = data.get('total_tokens', 0)
+                
+                if token_usage:
+                    api_col1, api_col2, api_col3, api_col4 = st.columns(4)
                     
-                    # Risk score color coding
-                    risk_score = inp.get("riskScore", 0)
-                    if risk_score >= 70:
-                        risk_emoji = "🔴"
-                    elif risk_score >= 40:
-                        risk_emoji = "🟡"
-                    else:
-                        risk_emoji = "🟢"
+                    with api_col1:
+                        st.metric("Multi-Agent Calls", "1", help="Latest multi-agent enhancement request")
                     
-                    # Blocked indicator
-                    blocked_indicator = "🚫" if inp.get("isBlocked", False) else "✅"
+                    with api_col2:
+                        st.metric("Total Tokens", f"{total_tokens:,}" if total_tokens else "N/A")
                     
-                    table_data.append({
-                        "Timestamp": formatted_time,
-                        "Input": inp.get("inputText", "")[:100] + ("..." if len(inp.get("inputText", "")) > 100 else ""),
-                        "Risk": f"{risk_emoji} {risk_score:.1f}",
-                        "Label": inp.get("label", "unknown"),
-                        "Status": blocked_indicator,
-                        "User": inp.get("userId", "N/A")[:15] if inp.get("userId") else "N/A"
-                    })
-                
-                # Create DataFrame
-                df = pd.DataFrame(table_data)
-                
-                # Display table
-                st.dataframe(df, use_container_width=True, hide_index=True)
-                
-                # Export option
-                csv = df.to_csv(index=False)
-                st.download_button(
-                    label="📥 Download as CSV",
-                    data=csv,
-                    file_name=f"security_inputs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                    mime="text/csv"
-                )
-                
-                # Temporal Analysis Widget (Week 12)
-                st.markdown("---")
-                st.subheader("⏱️ Security Risk Trends Over Time")
-                st.markdown("Monitor risk score evolution and detect escalation patterns")
-                
-                with st.expander("📈 View Risk Trends", expanded=False):
-                    try:
-                        # Analyze temporal risk trends
-                        if len(inputs) > 1:
-                            # Sort by timestamp
-                            sorted_inputs = sorted(inputs, key=lambda x: x.get("createdAt", ""))
-                            
-                            # Prepare time series data
-                            timestamps = []
-                            risk_scores = []
-                            
-                            for inp in sorted_inputs:
-                                try:
-                                    ts = datetime.fromisoformat(inp.get("createdAt", "").replace("Z", "+00:00"))
-                                    timestamps.append(ts)
-                                    risk_scores.append(inp.get("riskScore", 0))
-                                except:
-                                    continue
-                            
-                            if timestamps and risk_scores:
-                                # Create time series DataFrame
-                                ts_df = pd.DataFrame({
-                                    'Timestamp': timestamps,
-                                    'Risk Score': risk_scores
-                                })
-                                
-                                # Plot risk trend
-                                fig = px.line(
-                                    ts_df,
-                                    x='Timestamp',
-                                    y='Risk Score',
-                                    title='Risk Score Evolution',
-                                    labels={'Risk Score': 'Risk Score (0-100)', 'Timestamp': 'Time'}
-                                )
-                                
-                                # Add threshold lines
-                                fig.add_hline(y=70, line_dash="dash", line_color="red", annotation_text="High Risk")
-                                fig.add_hline(y=40, line_dash="dash", line_color="orange", annotation_text="Medium Risk")
-                                
-                                st.plotly_chart(fig, use_container_width=True)
-                                
-                                # Change-point detection (simple)
-                                if len(risk_scores) > 5:
-                                    recent_avg = sum(risk_scores[-5:]) / 5
-                                    overall_avg = sum(risk_scores) / len(risk_scores)
-                                    
-                                    if recent_avg > overall_avg + 15:
-                                        st.error(f"🚨 **Risk Escalation Detected!** Recent average ({recent_avg:.1f}) is significantly higher than overall average ({overall_avg:.1f})")
-                                        st.warning("⚠️ **Action Required:** Investigate recent inputs for potential security threats")
-                                    elif recent_avg < overall_avg - 15:
-                                        st.success(f"✅ **Risk Reduction Observed:** Recent average ({recent_avg:.1f}) is lower than overall average ({overall_avg:.1f})")
-                                    else:
-                                        st.info(f"ℹ️ **Stable Risk Level:** Recent average ({recent_avg:.1f}) is consistent with overall average ({overall_avg:.1f})")
-                                
-                                # Statistics
-                                col1, col2, col3 = st.columns(3)
-                                with col1:
-                                    st.metric("Current Risk", f"{risk_scores[-1]:.1f}")
-                                with col2:
-                                    st.metric("Average Risk", f"{overall_avg:.1f}")
-                                with col3:
-                                    trend = "📈" if len(risk_scores) > 1 and risk_scores[-1] > risk_scores[0] else "📉"
-                                    st.metric("Trend", trend)
-                                
-                                st.info("💡 **Insight:** Use temporal trends to detect security pattern changes and respond proactively")
-                            else:
-                                st.info("💡 No valid timestamp data for trend analysis")
-                        else:
-                            st.info("💡 Need more security inputs (2+) to analyze trends")
+                    with api_col3:
+                        st.metric("Total Cost", f"${total_cost:.6f}" if total_cost else "N/A")
+                    
+                    with api_col4:
+                        # Calculate projected monthly cost (assuming 100 requests/day)
+                        requests_per_day = 100
+                        requests_per_month = requests_per_day * 30
+                        projected_cost = total_cost * requests_per_month if total_cost else 0
+                        st.metric("Projected Monthly", f"${projected_cost:.2f}", help="Based on 100 requests/day")
+                    
+                    # Token usage table
+                    token_data = []
+                    for agent_name, usage in token_usage.items():
+                        token_data.append({
+                            "Agent": agent_name.capitalize(),
+                            "Model": usage.get('model', 'N/A'),
+                            "Tokens": usage.get('total_tokens', 0),
+                            "Cost": f"${usage.get('cost_usd', 0):.6f}"
+                        })
+                    
+                    if token_data:
+                        df_tokens = pd.DataFrame(token_data)
+                        st.dataframe(df_tokens, use_container_width=True, hide_index=True)
                     
-                    except Exception as e:
-                        st.warning(f"Risk trend analysis unavailable: {str(e)}")
-                        st.info("💡 Continue monitoring security inputs to enable trend detection")
+                    st.info("💡 Monitor token usage to optimize costs. View detailed analytics in **Token Analytics** page.")
+                else:
+                    st.info("No token usage data available. Run a multi-agent enhancement to track API usage.")
+            else:
+                st.info("No multi-agent requests yet. Try the **Multi-Agent Enhancement** page to see token tracking.")
+            
+            st.divider()
+            
+            # Data table
+            st.subheader("📋 Security Input Log")
+            
+            show_security_log(df)
+            
+            # Temporal Analysis Widget (Week 12)
+            st.markdown("---")
+            st.subheader("⏱️ Security Risk Trends Over Time")
+            st.markdown("Monitor risk score evolution and detect escalation patterns")
+            
+            # Collapsed by default; with on_change="rerun" the trend analysis only
+            # runs while the expander is open
+            trends_expander = st.expander(
+                "📈 View Risk Trends",
+                expanded=False,
+                key="risk_trends_expander",
+                on_change="rerun"
+            )
+            with trends_expander:
+                if trends_expander.open:
+                    show_risk_trends(created_ts, df_raw["riskScore"])
 
-        else:
-            st.error(f"❌ Error: {response.status_code} - {response.text}")
-    
+    except requests.exceptions.HTTPError as e:
+        st.error(f"❌ Error: {e.response.status_code} - {e.response.text}")
     except requests.exceptions.ConnectionError:
         st.error("❌ Could not connect to the API. Make sure the backend is running on http://localhost:8001")
     except Exception as e:
@@ -1,10 +1,15 @@
 """Temporal Analysis page - Timeline visualization and statistics"""
+import requests
 import streamlit as st
 import pandas as pd
 import plotly.express as px
 from datetime import datetime, timedelta
 from temporal_client import init_temporal_client
-from utils.api_client import api_get
+from utils.api_client import fetch_prompts
+from utils.session import go_to_page
+
+# Prompts listed in the selector per page
+PROMPTS_PER_PAGE = 50
 
 
 def show_temporal_analysis():
@@ -20,29 +25,47 @@ def show_temporal_analysis():
     
     # Get list of user's prompts from API (user-specific)
     try:
-        response = api_get("/api/prompts", params={"limit": 50})
-        
-        if response.status_code != 200:
-            st.error(f"Failed to load prompts: {response.status_code}")
+        # One page of prompts per request; older prompts are reached by paging
+        # instead of fetching (and listing) the whole history
+        page = st.session_state.get("temporal_prompt_page", 1)
+        try:
+            prompts = fetch_prompts(
+                st.session_state.access_token,
+                limit=PROMPTS_PER_PAGE,
+                offset=(page - 1) * PROMPTS_PER_PAGE
+            )
+        except requests.HTTPError as e:
+            st.error(f"Failed to load prompts: {e.response.status_code}")
             return
         
-        prompts_data = response.json()
-        if not prompts_data.get("success") or not prompts_data.get("data"):
+        if not prompts and page == 1:
                 st.warning("⚠️ No prompts found. Create a prompt first using the Dashboard Prompt Enhancement.")
-                if st.button("← Go to Dashboard"):
-                    st.session_state.current_page = "dashboard"
-                    st.rerun()
+                st.button("← Go to Dashboard", on_click=go_to_page, args=("dashboard",))
                 return
-            
-        prompts = prompts_data["data"]
         
-        # Prompt selector
-        prompt_options = {
-            f"{p['original_text'][:60]}... ({p['created_at'][:10]})": p['id'] 
+        # Only offer paging once there may be more than one page
+        if page > 1 or len(prompts) == PROMPTS_PER_PAGE:
+            st.number_input(
+                "Prompt page",
+                min_value=1,
+                key="temporal_prompt_page",
+                help=f"{PROMPTS_PER_PAGE} prompts per page, newest first"
+            )
+        if not prompts:
+            st.info("💡 No prompts on this page.")
+            return
+        
+        # Prompt selector - options are ids, labels are precomputed once so
+        # format_func is a dict lookup (and identical labels can't collide)
+        prompt_labels = {
+            p['id']: f"{p['summary']} ({p['created_at'][:10]})"
             for p in prompts
         }
-        selected_prompt_label = st.selectbox("Select Prompt:", list(prompt_options.keys()))
-        selected_prompt_id = prompt_options[selected_prompt_label]
+        selected_prompt_id = st.selectbox(
+            "Select Prompt:",
+            list(prompt_labels),
+            format_func=prompt_labels.__getitem__
+        )
         
         # Synthetic data generator button
         col1, col2, col3 = st.columns([2, 1, 1])
@@ -57,11 +80,16 @@ def show_temporal_analysis():
                 else:
                     st.error(f"❌ Error: {result['error']}")
         
-        # Tabs for different visualizations
-        tab1, tab2, tab3 = st.tabs(["📈 Timeline", "📊 Statistics", "🔗 Causal Hints"])
+        # View selector - unlike st.tabs, only the selected view runs (and hits the API)
+        selected_view = st.radio(
+            "View",
+            ["📈 Timeline", "📊 Statistics", "🔗 Causal Hints"],
+            horizontal=True,
+            label_visibility="collapsed"
+        )
         
-        # Tab 1: Timeline Visualization
-        with tab1:
+        # View 1: Timeline Visualization
+        if selected_view == "📈 Timeline":
             st.subheader("Prompt Evolution Timeline")
             
             # Date range selector
@@ -92,7 +120,7 @@ def show_temporal_analysis():
                 else:
                     # Convert to DataFrame
                     df = pd.DataFrame(timeline_data)
-                    df['timestamp'] = pd.to_datetime(df['timestamp'])
+                    df['timestamp'] = pd.to_datetime(df['timestamp'], format="ISO8601")
                     
                     # Create interactive line chart with plotly
                     fig = px.line(
@@ -114,14 +142,26 @@ def show_temporal_analysis():
                     
                     st.plotly_chart(fig, width='stretch')
                     
-                    # Data table
-                    with st.expander("📋 View Raw Data"):
-                        st.dataframe(df, width='stretch', hide_index=True)
+                    # Data table - collapsed by default; with on_change="rerun" the
+                    # table is only built and sent while the expander is open
+                    raw_data_expander = st.expander(
+                        "📋 View Raw Data",
+                        expanded=False,
+                        key="temporal_raw_data_expander",
+                        on_change="rerun"
+                    )
+                    with raw_data_expander:
+                        if raw_data_expander.open:
+                            # Partial selection of the newest rows instead of sorting/rendering the full history
+                            max_rows = 100
+                            st.dataframe(df.nlargest(max_rows, 'timestamp'), width='stretch', hide_index=True)
+                            if len(df) > max_rows:
+                                st.caption(f"Showing the latest {max_rows} of {len(df)} versions")
             else:
                 st.error(f"❌ Error loading timeline: {timeline_result['error']}")
         
-        # Tab 2: Statistics
-        with tab2:
+        # View 2: Statistics
+        elif selected_view == "📊 Statistics":
             st.subheader("Temporal Statistics")
             
             stats_result = temporal_client.get_statistics(selected_prompt_id)
@@ -129,31 +169,27 @@ def show_temporal_analysis():
             if stats_result["success"]:
                 stats = stats_result["data"]
                 
-                # Metric cards
-                col1, col2, col3, col4 = st.columns(4)
-                
-                with col1:
-                    trend_icons = {"improving": "🟢", "degrading": "🔴", "stable": "🟡"}
-                    trend_icon = trend_icons.get(stats['trend'], "⚪")
-                    st.metric("Trend", f"{trend_icon} {stats['trend'].title()}")
-                
-                with col2:
-                    st.metric("Average Score", f"{stats['avg_score']:.1f}")
-                
-                with col3:
-                    st.metric("Score Std Dev", f"{stats['score_std']:.1f}")
-                
-                with col4:
-                    st.metric("Total Versions", stats['total_versions'])
-                
-                st.markdown("---")
-                
-                # Additional statistics
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.metric("Min Score", f"{stats.get('min_score', 0):.1f}")
-                with col2:
-                    st.metric("Max Score", f"{stats.get('max_score', 0):.1f}")
+                # Summary statistics in one table
+                trend_icons = {"improving": "🟢", "degrading": "🔴", "stable": "🟡"}
+                trend_icon = trend_icons.get(stats['trend'], "⚪")
+                st.dataframe(
+                    {
+                        "Trend": [f"{trend_icon} {stats['trend'].title()}"],
+                        "Average Score": [stats['avg_score']],
+                        "Score Std Dev": [stats['score_std']],
+                        "Min Score": [stats.get('min_score', 0)],
+                        "Max Score": [stats.get('max_score', 0)],
+                        "Total Versions": [stats['total_versions']]
+                    },
+                    hide_index=True,
+                    width='stretch',
+                    column_config={
+                        "Average Score": st.column_config.NumberColumn(format="%.1f"),
+                        "Score Std Dev": st.column_config.NumberColumn(format="%.1f"),
+                        "Min Score": st.column_config.NumberColumn(format="%.1f"),
+                        "Max Score": st.column_config.NumberColumn(format="%.1f")
+                    }
+                )
                 
                 # Trend interpretation
                 if stats['trend'] == 'improving':
@@ -165,8 +201,8 @@ def show_temporal_analysis():
             else:
                 st.error(f"❌ Error loading statistics: {stats_result['error']}")
         
-        # Tab 3: Causal Hints
-        with tab3:
+        # View 3: Causal Hints
+        elif selected_view == "🔗 Causal Hints":
             st.subheader("Causal Hints: Change Types vs Score Deltas")
             st.markdown("Correlation analysis between change types and score improvements")
             
@@ -186,10 +222,11 @@ def show_temporal_analysis():
                     
                     # Interpretation
                     if not df_hints.empty:
-                        best_type = df_hints.iloc[0]['change_type']
-                        best_delta = df_hints.iloc[0]['avg_score_delta']
-                        worst_type = df_hints.iloc[-1]['change_type']
-                        worst_delta = df_hints.iloc[-1]['avg_score_delta']
+                        # Scalar access on the columns (iat) rather than materializing rows with iloc
+                        change_types = df_hints['change_type']
+                        deltas = df_hints['avg_score_delta']
+                        best_type, best_delta = change_types.iat[0], deltas.iat[0]
+                        worst_type, worst_delta = change_types.iat[-1], deltas.iat[-1]
                         
                         st.success(f"💡 **Best Strategy:** '{best_type}' changes tend to increase scores by **{best_delta:.1f} points** on average")
                         
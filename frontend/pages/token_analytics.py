@@ -1,9 +1,87 @@
 """Token Analytics page - Display token usage and cost tracking"""
+import requests
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-from datetime import datetime
-from utils.api_client import api_get
+from utils.api_client import api_get, is_backend_available, parse_json
+from utils.session import go_to_page
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def fetch_token_history(access_token: str, limit: int = 100) -> dict:
+    """
+    Fetch token usage history from the backend, cached across reruns.
+    
+    Args:
+        access_token: Current session token (part of the cache key so
+            cached entries are never shared between users)
+        limit: Maximum number of records to return
+    
+    Returns:
+        Parsed JSON body of /api/tokens
+    
+    Raises:
+        requests.HTTPError: If the backend returns a non-2xx status
+            (errors are not cached, so the next rerun retries)
+    """
+    response = api_get("/api/tokens", params={"limit": limit})
+    response.raise_for_status()
+    return parse_json(response)
+
+
+@st.cache_data(show_spinner=False)
+def build_token_frames(token_records: list) -> tuple:
+    """
+    Build the history table, chart and per-model frames from token records.
+    
+    Cached on the records themselves, so reruns with unchanged history
+    (e.g. any widget interaction) reuse the frames instead of rebuilding them.
+    
+    Args:
+        token_records: Token usage records from /api/tokens
+    
+    Returns:
+        Tuple of (history_df, chart_df, model_df)
+    """
+    import pandas as pd
+    
+    chart_df = pd.DataFrame(token_records)
+    
+    # Parse timestamps once via the ISO 8601 fast path; reused by the table and the chart
+    created_at = pd.to_datetime(chart_df['created_at'], format="ISO8601", errors="coerce")
+    
+    def numeric_column(name: str, dtype: str):
+        # Ensure numeric types (convert None or invalid to 0)
+        if name not in chart_df:
+            return 0
+        return pd.to_numeric(chart_df[name], errors="coerce").fillna(0).astype(dtype)
+    
+    # Table built column-wise from the records frame
+    history_df = pd.DataFrame({
+        # Format timestamp (unparseable values fall back to the raw prefix)
+        "Date": created_at.dt.strftime("%Y-%m-%d %H:%M").fillna(chart_df['created_at'].astype(str).str[:16]),
+        "Model": chart_df["model"],
+        "Prompt Tokens": numeric_column("prompt_tokens", "int64"),
+        "Completion Tokens": numeric_column("completion_tokens", "int64"),
+        "Total Tokens": numeric_column("total_tokens", "int64"),
+        "Cost (USD)": numeric_column("cost_usd", "float64")
+    })
+    
+    # Per-model breakdown (sort=False keeps first-seen model order)
+    model_df = (
+        chart_df.groupby("model", sort=False)
+        .agg(
+            Requests=("model", "size"),
+            **{"Total Tokens": ("total_tokens", "sum"), "Total Cost": ("cost_usd", "sum")}
+        )
+        .rename_axis("Model")
+        .reset_index()
+    )
+    model_df["Avg Tokens/Request"] = model_df["Total Tokens"] // model_df["Requests"]
+    
+    # Convert for plotly
+    chart_df['created_at'] = created_at
+    chart_df = chart_df.sort_values('created_at')
+    
+    return history_df, chart_df, model_df
 
 
 def show_token_analytics():
@@ -11,19 +89,22 @@ def show_token_analytics():
     st.title("💰 Token Usage & Cost Analytics")
     st.markdown("Real-time token tracking across all AI agents with model-specific pricing")
     
+    if st.button("🔄 Refresh"):
+        fetch_token_history.clear()
+    
+    if not is_backend_available():
+        st.error("❌ Could not connect to the API. Make sure the backend is running on http://localhost:8001")
+        return
+    
     # Query token history from database (not session state)
     try:
-        response = api_get("/api/tokens", params={"limit": 100})
-        
-        if response.status_code != 200:
-            st.error(f"❌ Failed to load token history: {response.status_code}")
-            if st.button("← Go to Dashboard"):
-                st.session_state.current_page = "dashboard"
-                st.rerun()
+        try:
+            result = fetch_token_history(st.session_state.get("access_token", ""), limit=100)
+        except requests.HTTPError as e:
+            st.error(f"❌ Failed to load token history: {e.response.status_code}")
+            st.button("← Go to Dashboard", on_click=go_to_page, args=("dashboard",))
             return
         
-        result = response.json()
-        
         if not result.get("success"):
             st.error("❌ Failed to load token history")
             return
@@ -34,11 +115,12 @@ def show_token_analytics():
         
         if not token_records:
             st.info("📊 No token history yet. Enhance a prompt to start tracking!")
-            if st.button("← Go to Dashboard"):
-                st.session_state.current_page = "dashboard"
-                st.rerun()
+            st.button("← Go to Dashboard", on_click=go_to_page, args=("dashboard",))
             return
         
+        # Deferred until there is data to show - the empty-history path skips this import
+        import plotly.express as px
+        
         # Display aggregate metrics
         st.subheader("📊 Token Usage Summary (All Time)")
         
@@ -63,43 +145,22 @@ def show_token_analytics():
         # Token history table
         st.subheader("📊 Token Usage History")
         
-        # Prepare data for table
-        table_data = {
-            "Date": [],
-            "Model": [],
-            "Prompt Tokens": [],
-            "Completion Tokens": [],
-            "Total Tokens": [],
-            "Cost (USD)": []
-        }
-        
-        for record in token_records:
-            # Format timestamp
-            try:
-                timestamp = datetime.fromisoformat(record["created_at"])
-                formatted_date = timestamp.strftime("%Y-%m-%d %H:%M")
-            except:
-                formatted_date = record["created_at"][:16]
-            
-            table_data["Date"].append(formatted_date)
-            table_data["Model"].append(record["model"])
-            # Ensure numeric types (convert None or invalid to 0)
-            table_data["Prompt Tokens"].append(int(record.get("prompt_tokens", 0) or 0))
-            table_data["Completion Tokens"].append(int(record.get("completion_tokens", 0) or 0))
-            table_data["Total Tokens"].append(int(record.get("total_tokens", 0) or 0))
-            table_data["Cost (USD)"].append(f"${record.get('cost_usd', 0.0):.6f}")
-        
-        df = pd.DataFrame(table_data)
-        st.dataframe(df, width='stretch', hide_index=True)
+        history_df, chart_df, model_df = build_token_frames(token_records)
+        st.dataframe(
+            history_df,
+            width='stretch',
+            hide_index=True,
+            column_config={
+                "Prompt Tokens": st.column_config.NumberColumn(format="localized"),
+                "Completion Tokens": st.column_config.NumberColumn(format="localized"),
+                "Total Tokens": st.column_config.NumberColumn(format="localized"),
+                "Cost (USD)": st.column_config.NumberColumn(format="$%.6f")
+            }
+        )
         
         # Token usage over time chart
         st.subheader("📈 Token Usage Over Time")
         
-        # Convert for plotly
-        chart_df = pd.DataFrame(token_records)
-        chart_df['created_at'] = pd.to_datetime(chart_df['created_at'])
-        chart_df = chart_df.sort_values('created_at')
-        
         fig = px.line(
             chart_df,
             x='created_at',
@@ -120,27 +181,16 @@ def show_token_analytics():
         # Model breakdown
         st.subheader("🤖 Usage by Model")
         
-        model_stats = {}
-        for record in token_records:
-            model = record["model"]
-            if model not in model_stats:
-                model_stats[model] = {"count": 0, "tokens": 0, "cost": 0.0}
-            model_stats[model]["count"] += 1
-            model_stats[model]["tokens"] += record["total_tokens"]
-            model_stats[model]["cost"] += record["cost_usd"]
-        
-        model_df = pd.DataFrame([
-            {
-                "Model": model,
-                "Requests": stats["count"],
-                "Total Tokens": f"{stats['tokens']:,}",
-                "Total Cost": f"${stats['cost']:.6f}",
-                "Avg Tokens/Request": f"{stats['tokens'] // stats['count']:,}"
+        st.dataframe(
+            model_df,
+            width='stretch',
+            hide_index=True,
+            column_config={
+                "Total Tokens": st.column_config.NumberColumn(format="localized"),
+                "Total Cost": st.column_config.NumberColumn(format="$%.6f"),
+                "Avg Tokens/Request": st.column_config.NumberColumn(format="localized")
             }
-            for model, stats in model_stats.items()
-        ])
-        
-        st.dataframe(model_df, width='stretch', hide_index=True)
+        )
     
     except Exception as e:
         st.error(f"❌ Error loading token history: {str(e)}")
@@ -1,11 +1,18 @@
 import requests
-from typing import Optional, Dict, Any, List
+from requests.adapters import HTTPAdapter
+from typing import Optional, Dict, Any
 import os
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
+from utils.api_client import error_detail, parse_json
 
 load_dotenv()
 
+# One connection pool for every TemporalClient. Pages build a new client on
+# each rerun, so mounting this adapter keeps the keep-alive connections to the
+# backend alive across reruns while each client keeps its own headers.
+_POOLED_ADAPTER = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+
 class TemporalClient:
     """
     Client for temporal analysis API endpoints.
@@ -25,6 +32,8 @@ class TemporalClient:
         self.base_url = base_url or os.getenv("API_BASE_URL", "http://localhost:8001")
         self.token = token
         self.session = requests.Session()
+        self.session.mount("http://", _POOLED_ADAPTER)
+        self.session.mount("https://", _POOLED_ADAPTER)
         
         # Add security headers
         self.session.headers.update({
@@ -88,11 +97,11 @@ class TemporalClient:
             )
             
             if response.status_code == 200:
-                return {"success": True, "data": response.json()}
+                return {"success": True, "data": parse_json(response)}
             elif response.status_code == 404:
                 return {"success": False, "error": "Prompt not found"}
             else:
-                return {"success": False, "error": response.json().get("detail", "Failed to get timeline")}
+                return {"success": False, "error": error_detail(response, "Failed to get timeline")}
                 
         except requests.exceptions.RequestException as e:
             return {"success": False, "error": f"Connection error: {str(e)}"}
@@ -128,11 +137,11 @@ class TemporalClient:
             )
             
             if response.status_code == 200:
-                return {"success": True, "data": response.json()}
+                return {"success": True, "data": parse_json(response)}
             elif response.status_code == 404:
                 return {"success": False, "error": "Prompt not found"}
             else:
-                return {"success": False, "error": response.json().get("detail", "Failed to get statistics")}
+                return {"success": False, "error": error_detail(response, "Failed to get statistics")}
                 
         except requests.exceptions.RequestException as e:
             return {"success": False, "error": f"Connection error: {str(e)}"}
@@ -168,11 +177,11 @@ class TemporalClient:
             )
             
             if response.status_code == 200:
-                return {"success": True, "data": response.json()}
+                return {"success": True, "data": parse_json(response)}
             elif response.status_code == 404:
                 return {"success": False, "error": "Prompt not found"}
             else:
-                return {"success": False, "error": response.json().get("detail", "Failed to get causal hints")}
+                return {"success": False, "error": error_detail(response, "Failed to get causal hints")}
                 
         except requests.exceptions.RequestException as e:
             return {"success": False, "error": f"Connection error: {str(e)}"}
@@ -217,11 +226,11 @@ class TemporalClient:
             )
             
             if response.status_code == 200:
-                return {"success": True, "data": response.json()}
+                return {"success": True, "data": parse_json(response)}
             elif response.status_code == 404:
                 return {"success": False, "error": "Prompt not found"}
             else:
-                return {"success": False, "error": response.json().get("detail", "Failed to generate synthetic data")}
+                return {"success": False, "error": error_detail(response, "Failed to generate synthetic data")}
                 
         except requests.exceptions.RequestException as e:
             return {"success": False, "error": f"Connection error: {str(e)}"}
@@ -243,7 +252,7 @@ class TemporalClient:
             )
             
             if response.status_code == 200:
-                return {"success": True, "data": response.json()}
+                return {"success": True, "data": parse_json(response)}
             else:
                 return {"success": False, "error": "Failed to get prompts"}
                 
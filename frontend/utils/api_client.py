@@ -1,46 +1,250 @@
 """Centralized API client for backend communication"""
+import os
+import threading
 import requests
 import streamlit as st
-from typing import Dict, Any, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple, Union
 
-# Single source of truth for API base URL
-API_BASE = "http://localhost:8001"
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    import json
+    _json_loads = json.loads
+
+# Single source of truth for API base URL (same env var as auth_client / temporal_client)
+API_BASE = os.getenv("API_BASE_URL", "http://localhost:8001").rstrip("/")
+
+# (connect, read) timeout in seconds - bounds how long a hung backend can block a rerun
+DEFAULT_TIMEOUT: Tuple[float, float] = (3.05, 30)
+
+# Multi-agent enhancement runs several LLM calls server-side, so allow a longer read
+LLM_TIMEOUT: Tuple[float, float] = (3.05, 120)
+
+# Keep-alive connections kept open to the backend. The shared session serves
+# every user's reruns plus background prefetches, so size it for that
+# concurrency; requests beyond it open a throwaway connection instead.
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", 20))
+
+
+@lru_cache(maxsize=64)
+def api_url(endpoint: str) -> str:
+    """
+    Resolve an endpoint path (e.g. "/api/tokens") to its full backend URL.
+    
+    Memoized, so the handful of endpoints each page hits are resolved once
+    per process instead of being rebuilt on every call and rerun.
+    """
+    if not endpoint.startswith("/"):
+        endpoint = "/" + endpoint
+    return API_BASE + endpoint
+
+
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """
+    Get the shared HTTP session for backend calls.
+    
+    Cached with st.cache_resource so the keep-alive connection pool is
+    reused across reruns instead of opening a new socket per request.
+    Idempotent requests (GET) are retried on transient connection errors.
+    
+    Returns:
+        Shared requests.Session with a pooled HTTPAdapter mounted
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        max_retries=Retry(total=2, backoff_factor=0.1)
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@st.cache_data(ttl=5, show_spinner=False)
+def is_backend_available() -> bool:
+    """
+    Check whether the backend answers its health endpoint.
+    
+    The result is cached for a few seconds, so during an outage reruns fail
+    fast with a message instead of each waiting out a request timeout.
+    
+    Returns:
+        True if /health responded with a 2xx status, False otherwise
+    """
+    try:
+        return get_http_session().get(api_url("/health"), timeout=1).ok
+    except requests.exceptions.RequestException:
+        return False
 
 
 def get_auth_headers() -> Dict[str, str]:
-    """Get authentication headers with current session token"""
-    if 'access_token' not in st.session_state:
-        return {}
-    return {"Authorization": f"Bearer {st.session_state.access_token}"}
+    """
+    Get authentication headers for the current session.
+    
+    The dict is built once at login and kept in session state (cleared on
+    logout) rather than rebuilt on every call. It stays per-session instead
+    of being set on the shared HTTP session, which every user's requests go
+    through.
+    """
+    return st.session_state.get('auth_headers') or {}
+
+
+def parse_json(response: requests.Response) -> Any:
+    """
+    Parse a JSON response body.
+    
+    Decodes the raw bytes with orjson when it is installed - noticeably faster
+    than response.json() on the larger payloads (security logs, token history,
+    multi-agent results with full LLM outputs) - and skips requests' charset
+    detection on the body.
+    
+    Args:
+        response: Response whose body is JSON
+    
+    Returns:
+        Parsed JSON value
+    
+    Raises:
+        requests.exceptions.JSONDecodeError: If the body is not valid JSON -
+            the same error response.json() raises, so callers' RequestException
+            handlers still catch it
+    """
+    try:
+        return _json_loads(response.content)
+    except ValueError as e:
+        raise requests.exceptions.JSONDecodeError(
+            getattr(e, "msg", str(e)), getattr(e, "doc", ""), getattr(e, "pos", 0)
+        ) from e
 
 
-def api_get(endpoint: str, params: Optional[Dict[str, Any]] = None) -> requests.Response:
+def error_detail(response: requests.Response, default: str) -> str:
+    """
+    Get the error message from a failed API response.
+    
+    Reads FastAPI's "detail" field when the body is JSON. Otherwise (e.g. an
+    HTML 502 page from a proxy, or a truncated JSON body) it returns default,
+    so the caller shows its own message instead of a decode error.
+    
+    Args:
+        response: Non-2xx response
+        default: Message to use when the body carries no detail
+    
+    Returns:
+        Error message to show the user
+    """
+    if not response.headers.get("content-type", "").startswith("application/json"):
+        return default
+    try:
+        body = parse_json(response)
+    except requests.exceptions.JSONDecodeError:
+        return default
+    return body.get("detail", default) if isinstance(body, dict) else default
+
+
+def api_get(
+    endpoint: str,
+    params: Optional[Dict[str, Any]] = None,
+    timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT
+) -> requests.Response:
     """
     Make authenticated GET request to backend API
     
     Args:
         endpoint: API endpoint path (e.g., "/api/tokens")
         params: Optional query parameters
+        timeout: Request timeout in seconds (or (connect, read) tuple)
     
     Returns:
         requests.Response object
     """
-    url = f"{API_BASE}{endpoint}"
-    return requests.get(url, headers=get_auth_headers(), params=params or {})
+    url = api_url(endpoint)
+    return get_http_session().get(url, headers=get_auth_headers(), params=params or {}, timeout=timeout)
 
 
-def api_post(endpoint: str, json_data: Optional[Dict[str, Any]] = None) -> requests.Response:
+def api_post(
+    endpoint: str,
+    json_data: Optional[Dict[str, Any]] = None,
+    timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT
+) -> requests.Response:
     """
     Make authenticated POST request to backend API
     
     Args:
         endpoint: API endpoint path (e.g., "/prompts/multi-agent-enhance")
         json_data: Optional JSON payload
+        timeout: Request timeout in seconds (or (connect, read) tuple)
     
     Returns:
         requests.Response object
     """
-    url = f"{API_BASE}{endpoint}"
-    return requests.post(url, headers=get_auth_headers(), json=json_data or {})
+    url = api_url(endpoint)
+    return get_http_session().post(url, headers=get_auth_headers(), json=json_data or {}, timeout=timeout)
 
 
+@st.cache_data(ttl=60, show_spinner=False)
+def fetch_prompts(access_token: str, limit: int = 50, offset: int = 0) -> list:
+    """
+    Fetch the user's most recent prompts, cached across reruns.
+    
+    Shared by the pages that list prompts; call fetch_prompts.clear()
+    after creating a prompt so the new one shows up immediately.
+    
+    Args:
+        access_token: Current session token (part of the cache key so
+            cached entries are never shared between users)
+        limit: Maximum number of prompts to return
+        offset: Number of newer prompts to skip (for paging)
+    
+    Returns:
+        List of prompt dicts (id, summary, created_at, user_id),
+        newest first; empty if the backend reports no prompts
+    
+    Raises:
+        requests.HTTPError: If the backend returns a non-2xx status
+            (errors are not cached, so the next rerun retries)
+    """
+    response = api_get("/api/prompts", params={"limit": limit, "offset": offset})
+    response.raise_for_status()
+    prompts_data = parse_json(response)
+    if not prompts_data.get("success"):
+        return []
+    return prompts_data.get("data") or []
+
+
+@st.cache_resource
+def get_prefetch_executor() -> ThreadPoolExecutor:
+    """Shared worker pool for warming caches in the background."""
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="prefetch")
+
+
+def prefetch_prompts(access_token: str, limit: int = 50) -> Future:
+    """
+    Start loading the user's first page of prompts in the background.
+    
+    Called right after login, so the fetch overlaps the redirect and the
+    first page that lists prompts reads them from the fetch_prompts cache.
+    Failures are left on the returned future (and not cached).
+    
+    Args:
+        access_token: Token the prompts are fetched (and cached) for
+        limit: Page size; must match the caller's so the cache key lines up
+    
+    Returns:
+        Future resolving to the fetched prompt list
+    """
+    ctx = get_script_run_ctx()
+    
+    def warm() -> list:
+        # fetch_prompts reads the auth header from this session's state
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return fetch_prompts(access_token, limit=limit, offset=0)
+    
+    return get_prefetch_executor().submit(warm)
@@ -26,6 +26,19 @@ def check_authentication() -> bool:
     return True
 
 
+def go_to_page(page: str):
+    """
+    Button callback that switches the routed page.
+    
+    Runs before the rerun triggered by the click, so the target page renders
+    in that same run instead of needing a second st.rerun().
+    
+    Args:
+        page: Router key (e.g., "dashboard", "token_analytics")
+    """
+    st.session_state.current_page = page
+
+
 def show_page_header():
     """Show the main page header (reusable across pages)"""
     st.markdown("""
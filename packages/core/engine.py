@@ -1,14 +1,19 @@
 import os
 import time
 import logging
+import functools
+import threading
 from pydantic import BaseModel
 from groq import Groq
 from datetime import datetime
-from packages.core.token_tracker import TokenTracker, TokenUsage
+from packages.core.token_tracker import TokenTracker, TokenUsage, memoized_usage
 
 logger = logging.getLogger(__name__)
 tracker = TokenTracker()
 
+# LLM_DETERMINISTIC=1 improves at temperature 0 and memoizes results per (prompt, strategy)
+LLM_DETERMINISTIC = os.getenv("LLM_DETERMINISTIC") == "1"
+
 TEMPLATE_V1 = """You are a senior {domain} expert.
 Task: {task}
 Deliverables:
@@ -97,7 +102,7 @@ def generate_llm_output(prompt: str, max_retries: int = 3) -> tuple[str, TokenUs
             wait_time = 2 ** attempt if attempt < max_retries - 1 else 0
             
             if attempt == max_retries - 1:
-                logger.error(f"All {max_retries} attempts failed for LLM output generation.", exc_info=True)
+                logger.error("All %s attempts failed for LLM output generation.", max_retries, exc_info=True)
                 # Return error with zero tokens
                 return "[Error: Unable to generate response. Please try again.]", TokenUsage(
                     prompt_tokens=0,
@@ -109,13 +114,35 @@ def generate_llm_output(prompt: str, max_retries: int = 3) -> tuple[str, TokenUs
                 )
             
             if wait_time > 0:
-                logger.info(f"Retrying LLM output generation in {wait_time} seconds...")
+                logger.info("Retrying LLM output generation in %s seconds...", wait_time)
                 time.sleep(wait_time)
 
+class _TemplateFallback(Exception):
+    """Carries a template fallback result out of _improve_prompt_cached without caching it."""
+
+    def __init__(self, result):
+        super().__init__("template fallback result")
+        self.result = result
+
+# Per-thread flag set when _improve_prompt_cached actually runs (a cache miss)
+_memo_state = threading.local()
+
+@functools.lru_cache(maxsize=4096)
+def _improve_prompt_cached(original: str, strategy: str, max_retries: int) -> tuple[ImprovedOut, TokenUsage]:
+    _memo_state.miss = True
+    improved, usage = _improve_prompt(original, strategy, max_retries)
+    if usage.model == "template/fallback":
+        # LLM was unavailable; don't pin the template output in the cache
+        raise _TemplateFallback((improved, usage))
+    return improved, usage
+
 def improve_prompt(original: str, strategy: str = "v1", max_retries: int = 3) -> tuple[ImprovedOut, TokenUsage]:
     """
     Improve a prompt using Groq's LLM API with retry logic and error handling, and track token usage.
     
+    With LLM_DETERMINISTIC=1, results are memoized on (original, strategy);
+    memo hits report zero tokens and cost, and template fallbacks are never cached.
+    
     Args:
         original: The original prompt to improve
         strategy: Strategy to use (v1, v2, ensemble)
@@ -124,6 +151,18 @@ def improve_prompt(original: str, strategy: str = "v1", max_retries: int = 3) ->
     Returns:
         Tuple of (ImprovedOut, token_usage)
     """
+    if not LLM_DETERMINISTIC:
+        return _improve_prompt(original, strategy, max_retries)
+    
+    _memo_state.miss = False
+    try:
+        improved, usage = _improve_prompt_cached(original, strategy, max_retries)
+    except _TemplateFallback as e:
+        return e.result
+    return improved, (usage if _memo_state.miss else memoized_usage(usage))
+
+def _improve_prompt(original: str, strategy: str = "v1", max_retries: int = 3) -> tuple[ImprovedOut, TokenUsage]:
+    """Uncached improve_prompt: one Groq call with retries, template fallback on failure."""
     client = Groq(api_key=os.getenv("GROQ_API_KEY"))
     
     system_prompt = """You are an expert prompt engineer. Your job is to improve prompts by making them:
@@ -156,7 +195,7 @@ Return ONLY the improved prompt, nothing else."""
                     }
                 ],
                 model="llama-3.3-70b-versatile",
-                temperature=0.7,
+                temperature=0.0 if LLM_DETERMINISTIC else 0.7,
                 max_tokens=1024,
             )
             
@@ -221,5 +260,5 @@ Return ONLY the improved prompt, nothing else."""
             
             # Wait before retry
             if wait_time > 0:
-                logger.info(f"Retrying in {wait_time} seconds...")
+                logger.info("Retrying in %s seconds...", wait_time)
                 time.sleep(wait_time)
\ No newline at end of file
@@ -10,6 +10,9 @@ from packages.core.token_tracker import TokenTracker, TokenUsage
 logger = logging.getLogger(__name__)
 tracker = TokenTracker()
 
+# LLM_DETERMINISTIC=1 judges at temperature 0 so repeated scores are stable
+LLM_DETERMINISTIC = os.getenv("LLM_DETERMINISTIC") == "1"
+
 RUBRIC = {
     "clarity": {"weight": 1.0, "checks": ["clear role", "purpose stated", "no ambiguity"]},
     "specificity": {"weight": 1.0, "checks": ["concrete outputs", "constraints", "examples/edge-cases"]},
@@ -118,7 +121,7 @@ Return ONLY a JSON object with this exact structure:
                     {"role": "user", "content": f"Evaluate this prompt:\n\n{text}"}
                 ],
                 model="llama-3.3-70b-versatile",
-                temperature=0.3,
+                temperature=0.0 if LLM_DETERMINISTIC else 0.3,
                 max_tokens=512,
             )
             
@@ -200,6 +203,6 @@ Return ONLY a JSON object with this exact structure:
             
             # Wait before retry
             if wait_time > 0:
-                logger.info(f"Judge: Retrying in {wait_time} seconds...")
+                logger.info("Judge: Retrying in %s seconds...", wait_time)
                 time.sleep(wait_time)
 
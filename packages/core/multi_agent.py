@@ -5,11 +5,12 @@ Base classes and specialized agents
 
 import os
 import json
+import asyncio
 import logging
 from abc import ABC, abstractmethod
 from pydantic import BaseModel
 from typing import Dict, List, Any, Optional
-from groq import Groq
+from groq import AsyncGroq
 
 from packages.core.model_config import ModelConfig, get_model_for_agent
 from packages.core.agent_registry import register_agent
@@ -84,47 +85,47 @@ class AgentInterface(ABC):
         Returns:
             Tuple of (LLM response text, TokenUsage object)
         """
-        client = Groq(api_key=os.getenv("GROQ_API_KEY"))
-        
-        for attempt in range(max_retries):
-            try:
-                response = client.chat.completions.create(
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt}
-                    ],
-                    model=self.model_config.model_id,
-                    temperature=self.model_config.temperature,
-                    max_tokens=self.model_config.max_tokens,
-                )
-                
-                result = response.choices[0].message.content.strip()
-                
-                # Track token usage (capture return value)
-                usage = tracker.track_llm_call(
-                    system_prompt + "\n\n" + user_prompt,
-                    result,
-                    self.model_config.model_id
-                )
-                
-                return result, usage
-                
-            except Exception as e:
-                error_msg = str(e)
-                wait_time = 2 ** attempt if attempt < max_retries - 1 else 0
-                
-                if attempt == max_retries - 1:
-                    logger.error(
-                        f"{self.name} agent: All {max_retries} attempts failed.",
-                        exc_info=True
+        # Async client: awaiting the HTTP call (and the retry backoff) yields to
+        # the event loop, so the coordinator's asyncio.gather really overlaps agents
+        async with AsyncGroq(api_key=os.getenv("GROQ_API_KEY")) as client:
+            for attempt in range(max_retries):
+                try:
+                    response = await client.chat.completions.create(
+                        messages=[
+                            {"role": "system", "content": system_prompt},
+                            {"role": "user", "content": user_prompt}
+                        ],
+                        model=self.model_config.model_id,
+                        temperature=self.model_config.temperature,
+                        max_tokens=self.model_config.max_tokens,
                     )
-                    return f"[Error: {error_msg}]", None
-                
-                if wait_time > 0:
-                    logger.info(f"{self.name} agent: Retrying in {wait_time} seconds...")
-                    import time
-                    time.sleep(wait_time)
-        
+                    
+                    result = response.choices[0].message.content.strip()
+                    
+                    # Track token usage (capture return value)
+                    usage = tracker.track_llm_call(
+                        system_prompt + "\n\n" + user_prompt,
+                        result,
+                        self.model_config.model_id
+                    )
+                    
+                    return result, usage
+                    
+                except Exception as e:
+                    error_msg = str(e)
+                    wait_time = 2 ** attempt if attempt < max_retries - 1 else 0
+                    
+                    if attempt == max_retries - 1:
+                        logger.error(
+                            "%s agent: All %s attempts failed.", self.name, max_retries,
+                            exc_info=True
+                        )
+                        return f"[Error: {error_msg}]", None
+                    
+                    if wait_time > 0:
+                        logger.info("%s agent: Retrying in %s seconds...", self.name, wait_time)
+                        await asyncio.sleep(wait_time)
+            
         return "[Error: Unable to generate response]", None
     
     @abstractmethod
@@ -278,7 +279,7 @@ Return ONLY a JSON object:
                 weaknesses=data.get("weaknesses", [])
             )
         except Exception as e:
-            logger.error(f"Syntax agent analysis parsing error: {e}")
+            logger.error("Syntax agent analysis parsing error: %s", e)
             return AgentAnalysis(
                 score=5.0,
                 strengths=["Unable to parse response"],
@@ -313,7 +314,7 @@ Return ONLY a JSON object:
                 confidence=float(data.get("confidence", 0.5))
             )
         except Exception as e:
-            logger.error(f"Syntax agent improvement parsing error: {e}")
+            logger.error("Syntax agent improvement parsing error: %s", e)
             return AgentSuggestions(
                 suggestions=["Unable to generate improvements"],
                 improved_prompt=prompt,
@@ -396,7 +397,7 @@ Return ONLY a JSON object:
                 weaknesses=data.get("weaknesses", [])
             )
         except Exception as e:
-            logger.error(f"Structure agent analysis parsing error: {e}")
+            logger.error("Structure agent analysis parsing error: %s", e)
             return AgentAnalysis(
                 score=5.0,
                 strengths=["Unable to parse response"],
@@ -431,7 +432,7 @@ Return ONLY a JSON object:
                 confidence=float(data.get("confidence", 0.5))
             )
         except Exception as e:
-            logger.error(f"Structure agent improvement parsing error: {e}")
+            logger.error("Structure agent improvement parsing error: %s", e)
             return AgentSuggestions(
                 suggestions=["Unable to generate improvements"],
                 improved_prompt=prompt,
@@ -514,7 +515,7 @@ Return ONLY a JSON object:
                 weaknesses=data.get("weaknesses", [])
             )
         except Exception as e:
-            logger.error(f"Domain agent analysis parsing error: {e}")
+            logger.error("Domain agent analysis parsing error: %s", e)
             return AgentAnalysis(
                 score=5.0,
                 strengths=["Unable to parse response"],
@@ -549,7 +550,7 @@ Return ONLY a JSON object:
                 confidence=float(data.get("confidence", 0.5))
             )
         except Exception as e:
-            logger.error(f"Domain agent improvement parsing error: {e}")
+            logger.error("Domain agent improvement parsing error: %s", e)
             return AgentSuggestions(
                 suggestions=["Unable to generate improvements"],
                 improved_prompt=prompt,
@@ -33,6 +33,10 @@ class TokenUsage(BaseModel):
     timestamp: datetime
     cost_usd: float
 
+def memoized_usage(usage: TokenUsage) -> TokenUsage:
+    """Usage to report when a result is served from a memo: same model, no tokens or cost spent."""
+    return usage.model_copy(update={"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0, "cost_usd": 0.0})
+
 class ComparisonMetrics(BaseModel):
     """Comparison metrics between original and improved"""
     # Original execution
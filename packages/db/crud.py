@@ -78,21 +78,51 @@ def get_token_usage_by_prompt(session: Session, prompt_id: uuid.UUID, limit: int
         .limit(limit)
     ).scalars().all()
 
-def get_token_usage_by_user(session: Session, user_id: str, limit: int = 100) -> list[TokenUsageRecord]:
-    """Get all token usage records for a specific user (USER-SPECIFIC)"""
-    # Join through prompt_versions and prompts to filter by user_id
-    return session.execute(
-        sa.select(TokenUsageRecord)
+def get_token_usage_by_user(session: Session, user_id: str, limit: int = 100, offset: int = 0) -> list[TokenUsageRecord]:
+    """Get a user's token usage records, newest first, paged with limit/offset (USER-SPECIFIC)"""
+    # Join through prompt_versions and prompts to filter by user_id.
+    # lambda_stmt caches the statement's construction; only the parameters change per call.
+    return session.execute(sa.lambda_stmt(
+        lambda: sa.select(TokenUsageRecord)
         .join(PromptVersion, TokenUsageRecord.prompt_version_id == PromptVersion.id)
         .join(Prompt, PromptVersion.prompt_id == Prompt.id)
         .where(Prompt.user_id == user_id)
         .order_by(TokenUsageRecord.created_at.desc())
+        .offset(offset)
         .limit(limit)
-    ).scalars().all()
+    )).scalars().all()
+
+def get_prompt_summaries_by_user(
+    session: Session,
+    user_id: str,
+    limit: int = 50,
+    offset: int = 0,
+    summary_length: int = 60
+) -> list[sa.Row]:
+    """
+    Get a user's prompts as (id, summary, created_at, user_id) rows, newest first,
+    paged with limit/offset (USER-SPECIFIC).
+    
+    summary is the first summary_length + 1 characters of the prompt text, so
+    callers can tell whether it was cut without loading the full text.
+    """
+    # lambda_stmt caches the statement's construction; only the parameters change per call
+    return session.execute(sa.lambda_stmt(
+        lambda: sa.select(
+            Prompt.id,
+            sa.func.substr(Prompt.original_text, 1, summary_length + 1).label("summary"),
+            Prompt.created_at,
+            Prompt.user_id
+        )
+        .where(Prompt.user_id == user_id)
+        .order_by(Prompt.created_at.desc())
+        .offset(offset)
+        .limit(limit)
+    )).all()
 
 def maybe_update_best_head(session: Session, prompt_id: uuid.UUID, version_id: uuid.UUID, score: float):
     """Update best head if score is better than current best"""
-    bh = session.execute(sa.select(BestHead).where(BestHead.prompt_id==prompt_id)).scalar_one_or_none()
+    bh = session.get(BestHead, prompt_id)
     if not bh or score >= bh.score:
         if not bh:
             bh = BestHead(prompt_id=prompt_id, prompt_version_id=version_id, score=score)
@@ -102,8 +132,8 @@ def maybe_update_best_head(session: Session, prompt_id: uuid.UUID, version_id: u
             bh.score = score
 
 def get_prompt_by_id(session: Session, prompt_id: uuid.UUID) -> Prompt | None:
-    """Get prompt by ID"""
-    return session.execute(sa.select(Prompt).where(Prompt.id==prompt_id)).scalar_one_or_none()
+    """Get prompt by ID (primary-key lookup; served from the identity map when already loaded)"""
+    return session.get(Prompt, prompt_id)
 
 def get_prompt_versions(session: Session, prompt_id: uuid.UUID) -> list[PromptVersion]:
     """Get all versions for a prompt"""
@@ -115,7 +145,7 @@ def get_prompt_versions(session: Session, prompt_id: uuid.UUID) -> list[PromptVe
 
 def get_best_head(session: Session, prompt_id: uuid.UUID) -> BestHead | None:
     """Get the best version for a prompt"""
-    return session.execute(sa.select(BestHead).where(BestHead.prompt_id==prompt_id)).scalar_one_or_none()
+    return session.get(BestHead, prompt_id)
 
 def create_security_input_row(session: Session, user_id: str | None, input_text: str, 
                               risk_score: float, label: str, is_blocked: bool, 
@@ -138,6 +168,27 @@ def get_security_inputs(session: Session, limit: int = 100,
                        filter_blocked: bool | None = None,
                        filter_high_risk: bool | None = None) -> list[SecurityInput]:
     """Get security inputs with optional filtering"""
+    query = select_security_inputs(limit, filter_label, filter_blocked, filter_high_risk)
+    return session.execute(query).scalars().all()
+
+def iter_security_input_batches(session: Session, limit: int = 100,
+                                filter_label: str | None = None,
+                                filter_blocked: bool | None = None,
+                                filter_high_risk: bool | None = None,
+                                batch_size: int = 100):
+    """
+    Same rows as get_security_inputs, yielded in lists of at most batch_size.
+    Rows are fetched with yield_per (a server-side cursor where the driver
+    supports one), so the full result is never held in memory at once.
+    """
+    query = select_security_inputs(limit, filter_label, filter_blocked, filter_high_risk)
+    return session.scalars(query.execution_options(yield_per=batch_size)).partitions()
+
+def select_security_inputs(limit: int = 100,
+                           filter_label: str | None = None,
+                           filter_blocked: bool | None = None,
+                           filter_high_risk: bool | None = None) -> sa.Select:
+    """Build the filtered, newest-first security inputs query"""
     query = sa.select(SecurityInput).order_by(SecurityInput.created_at.desc())
     
     if filter_label:
@@ -149,8 +200,7 @@ def get_security_inputs(session: Session, limit: int = 100,
     if filter_high_risk:
         query = query.where(SecurityInput.risk_score >= 70.0)
     
-    query = query.limit(limit)
-    return session.execute(query).scalars().all()
+    return query.limit(limit)
 
 # ============================================================================
 # STORAGE CONSOLIDATION PHASE 1: Database-First CRUD Functions
@@ -169,6 +219,30 @@ def get_all_prompt_versions(session: Session, limit: int = 1000) -> list[PromptV
         .limit(limit)
     ).scalars().all()
 
+def count_prompts_in_versions(session: Session, limit: int = 1000) -> int:
+    """
+    Count distinct prompts among the versions get_all_prompt_versions() returns.
+    Used by the export endpoints to report record counts without loading rows.
+    """
+    recent = (
+        sa.select(PromptVersion.prompt_id)
+        .order_by(PromptVersion.created_at.desc())
+        .limit(limit)
+        .subquery()
+    )
+    return session.execute(
+        sa.select(sa.func.count(sa.distinct(recent.c.prompt_id)))
+    ).scalar_one()
+
+def count_prompt_versions(session: Session, limit: int = 1000) -> int:
+    """
+    Count the versions get_all_prompt_versions() returns (capped at limit).
+    """
+    recent = sa.select(PromptVersion.id).limit(limit).subquery()
+    return session.execute(
+        sa.select(sa.func.count()).select_from(recent)
+    ).scalar_one()
+
 def get_prompt_versions_by_source(session: Session, source: str, limit: int = 1000) -> list[PromptVersion]:
     """
     Get versions by agent source (syntax, structure, domain).
@@ -192,53 +266,66 @@ def get_prompt_version_chain(session: Session, prompt_id: uuid.UUID) -> list[Pro
         .order_by(PromptVersion.created_at)
     ).scalars().all()
 
+def get_judge_totals_by_version(session: Session, version_ids) -> dict[uuid.UUID, float]:
+    """
+    Get the judge score total of each version in a single IN query.
+    Returns: {prompt_version_id: total}; versions without a score are absent.
+    Selects only (version id, total) as plain rows - no ORM objects are built.
+    """
+    version_ids = list(version_ids)
+    if not version_ids:
+        return {}
+    totals = {}
+    for version_id, total in session.execute(
+        sa.select(JudgeScore.prompt_version_id, JudgeScore.total)
+        .where(JudgeScore.prompt_version_id.in_(version_ids))
+    ):
+        totals.setdefault(version_id, total)
+    return totals
+
 def get_agent_effectiveness_stats(session: Session) -> dict[str, dict]:
     """
     Calculate agent effectiveness statistics.
     Returns: {"syntax": {"wins": 10, "total": 30, "win_rate": 0.33, "avg_score": 8.5}, ...}
     """
     try:
-        # Get all versions
-        versions = session.execute(sa.select(PromptVersion)).scalars().all()
+        # One joined pass over all versions: each row carries the version's
+        # judge total (if scored) and its prompt's best version id (if any)
+        rows = session.execute(
+            sa.select(
+                PromptVersion.id,
+                PromptVersion.source,
+                JudgeScore.total,
+                BestHead.prompt_version_id,
+            )
+            .select_from(PromptVersion)
+            .outerjoin(JudgeScore, JudgeScore.prompt_version_id == PromptVersion.id)
+            .outerjoin(BestHead, BestHead.prompt_id == PromptVersion.prompt_id)
+        ).all()
         
         # Handle empty database gracefully
-        if not versions:
+        if not rows:
             return {}
         
         # Calculate stats per agent
         stats = {}
-        for version in versions:
-            source = version.source
-            if not source:  # Skip versions without source
+        seen = set()
+        for version_id, source, total_score, best_version_id in rows:
+            if not source or version_id in seen:  # Skip versions without source / extra score rows
                 continue
-                
+            seen.add(version_id)
+            
             if source not in stats:
                 stats[source] = {"wins": 0, "total": 0, "scores": []}
             
             stats[source]["total"] += 1
             
-            # Get score for this version
-            try:
-                score_row = session.execute(
-                    sa.select(JudgeScore).where(JudgeScore.prompt_version_id == version.id)
-                ).scalar_one_or_none()
+            if total_score is not None:
+                stats[source]["scores"].append(total_score)
                 
-                if score_row:
-                    total_score = (score_row.clarity + score_row.specificity + 
-                                  score_row.actionability + score_row.structure + 
-                                  score_row.context_use)
-                    stats[source]["scores"].append(total_score)
-                    
-                    # Check if this is the best version for its prompt
-                    best = session.execute(
-                        sa.select(BestHead).where(BestHead.prompt_id == version.prompt_id)
-                    ).scalar_one_or_none()
-                    
-                    if best and best.prompt_version_id == version.id:
-                        stats[source]["wins"] += 1
-            except Exception as e:
-                # Skip this version if score query fails
-                continue
+                # Check if this is the best version for its prompt
+                if best_version_id == version_id:
+                    stats[source]["wins"] += 1
         
         # Calculate win rates and averages
         for source in stats:
@@ -272,18 +359,9 @@ def get_temporal_statistics(session: Session, prompt_id: uuid.UUID) -> dict:
         return {"trend": "stable", "avg_score": 0.0, "score_range": [0, 0], 
                 "version_count": 0, "time_span_days": 0.0}
     
-    # Get scores for all versions
-    scores = []
-    for version in versions:
-        score_row = session.execute(
-            sa.select(JudgeScore).where(JudgeScore.prompt_version_id == version.id)
-        ).scalar_one_or_none()
-        
-        if score_row:
-            total_score = (score_row.clarity + score_row.specificity + 
-                          score_row.actionability + score_row.structure + 
-                          score_row.context_use)
-            scores.append(total_score)
+    # Get scores for all versions (one query for the whole chain)
+    score_totals = get_judge_totals_by_version(session, (version.id for version in versions))
+    scores = [score_totals[version.id] for version in versions if version.id in score_totals]
     
     # Calculate trend
     if len(scores) < 2:
@@ -319,37 +397,37 @@ def get_causal_edges(session: Session, prompt_id: uuid.UUID) -> list[dict]:
     versions = get_prompt_version_chain(session, prompt_id)
     edges = []
     
+    # Parents normally sit in the same chain; fetch any that don't in one query
+    versions_by_id = {version.id: version for version in versions}
+    missing_parent_ids = {
+        version.parent_version_id for version in versions
+        if version.parent_version_id is not None and version.parent_version_id not in versions_by_id
+    }
+    if missing_parent_ids:
+        versions_by_id.update(
+            (parent.id, parent) for parent in session.execute(
+                sa.select(PromptVersion).where(PromptVersion.id.in_(missing_parent_ids))
+            ).scalars()
+        )
+    score_totals = get_judge_totals_by_version(session, versions_by_id)
+    
     for version in versions:
         if version.parent_version_id is None:
             continue
         
         # Get parent version
-        parent = session.execute(
-            sa.select(PromptVersion).where(PromptVersion.id == version.parent_version_id)
-        ).scalar_one_or_none()
+        parent = versions_by_id.get(version.parent_version_id)
         
         if not parent:
             continue
         
         # Get scores
-        version_score_row = session.execute(
-            sa.select(JudgeScore).where(JudgeScore.prompt_version_id == version.id)
-        ).scalar_one_or_none()
-        
-        parent_score_row = session.execute(
-            sa.select(JudgeScore).where(JudgeScore.prompt_version_id == parent.id)
-        ).scalar_one_or_none()
+        version_total = score_totals.get(version.id)
+        parent_total = score_totals.get(parent.id)
         
-        if not version_score_row or not parent_score_row:
+        if version_total is None or parent_total is None:
             continue
         
-        version_total = (version_score_row.clarity + version_score_row.specificity + 
-                        version_score_row.actionability + version_score_row.structure + 
-                        version_score_row.context_use)
-        parent_total = (parent_score_row.clarity + parent_score_row.specificity + 
-                       parent_score_row.actionability + parent_score_row.structure + 
-                       parent_score_row.context_use)
-        
         time_delta = version.created_at - parent.created_at
         
         edges.append({
@@ -368,18 +446,12 @@ def get_score_trends(session: Session, prompt_id: uuid.UUID) -> list[tuple]:
     Returns: [(datetime, float), ...]
     """
     versions = get_prompt_version_chain(session, prompt_id)
+    score_totals = get_judge_totals_by_version(session, (version.id for version in versions))
     trends = []
     
     for version in versions:
-        score_row = session.execute(
-            sa.select(JudgeScore).where(JudgeScore.prompt_version_id == version.id)
-        ).scalar_one_or_none()
-        
-        if score_row:
-            total_score = (score_row.clarity + score_row.specificity + 
-                          score_row.actionability + score_row.structure + 
-                          score_row.context_use)
-            trends.append((version.created_at, total_score))
+        if version.id in score_totals:
+            trends.append((version.created_at, score_totals[version.id]))
     
     return trends
 
@@ -1,5 +1,6 @@
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 from sqlalchemy import ForeignKey, JSON
+from sqlalchemy.ext.hybrid import hybrid_property
 import uuid, datetime as dt
 
 class Base(DeclarativeBase): pass
@@ -18,7 +19,7 @@ class PromptVersion(Base):
     prompt_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("prompts.id", ondelete="CASCADE"))
     version_no: Mapped[int]
     text: Mapped[str]
-    explanation: Mapped[dict] = mapped_column(JSON)
+    explanation: Mapped[dict] = mapped_column(JSON, deferred=True)  # loaded only when accessed
     source: Mapped[str]
     created_at: Mapped[dt.datetime] = mapped_column(default=dt.datetime.utcnow)
     # Temporal fields for Week 12
@@ -35,9 +36,14 @@ class JudgeScore(Base):
     actionability: Mapped[float]
     structure: Mapped[float]
     context_use: Mapped[float]
-    feedback: Mapped[dict] = mapped_column(JSON)
+    feedback: Mapped[dict] = mapped_column(JSON, deferred=True)  # loaded only when accessed
     created_at: Mapped[dt.datetime] = mapped_column(default=dt.datetime.utcnow)
 
+    @hybrid_property
+    def total(self):
+        # Sum of the five dimensions; usable on rows and inside SQL queries
+        return self.clarity + self.specificity + self.actionability + self.structure + self.context_use
+
 class BestHead(Base):
     __tablename__ = "best_heads"
     prompt_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("prompts.id", ondelete="CASCADE"), primary_key=True)
@@ -1,10 +1,16 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 from contextlib import contextmanager
 import os
 from pathlib import Path
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to SQLAlchemy's stdlib json
+    orjson = None
+
 # Load .env from project root
 project_root = Path(__file__).parent.parent.parent
 load_dotenv(project_root / '.env')
@@ -15,7 +21,40 @@ db_path = Path(__file__).parent / "prompter.db"
 db_path_absolute = db_path.resolve()  # Convert to absolute path
 DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{db_path_absolute}")
 
-engine = create_engine(DATABASE_URL)
+# Connection pool sizing; FastAPI serves many requests at once, so the
+# default 5 connections would make requests queue on checkout
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 20))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 40))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 10))  # seconds to wait for a free connection
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))  # seconds before a connection is replaced
+
+# JSON columns (explanations, feedback, agent metadata) encoded/decoded with orjson when available
+json_options = {}
+if orjson is not None:
+    json_options = {
+        "json_serializer": lambda value: orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode(),
+        "json_deserializer": orjson.loads,
+    }
+
+# Queue sizing only applies to QueuePool; in-memory SQLite uses SingletonThreadPool,
+# which rejects these arguments
+database_url = make_url(DATABASE_URL)
+pool_options = {}
+if not (database_url.get_backend_name() == "sqlite"
+        and (database_url.database in (None, "", ":memory:") or database_url.query.get("mode") == "memory")):
+    pool_options = {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+    }
+
+engine = create_engine(
+    DATABASE_URL,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=True,  # drop connections the server has closed instead of erroring
+    **pool_options,
+    **json_options,
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 @contextmanager
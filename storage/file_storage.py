@@ -9,6 +9,7 @@ This script provides functionality to save text content to organized folders:
 """
 
 import os
+import sys
 import json
 import csv
 from datetime import datetime, timedelta
@@ -16,6 +17,19 @@ from pathlib import Path
 from typing import Dict, Any, Optional, List, Tuple
 import uuid
 import difflib
+import logging
+from collections import Counter
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    _json_loads = json.loads
+
+logger = logging.getLogger(__name__)
+
+# Project root, so the DB export helpers can import packages.db
+_PROJECT_ROOT = str(Path(__file__).parent.parent)
 
 # Common LLM names for validation
 COMMON_LLMS = [
@@ -45,6 +59,10 @@ class FileStorage:
         self.prompts_dir = self.base_dir / "prompts"
         self.results_dir = self.base_dir / "results"
         self.db_session = db_session  # Database session for exports
+        # csv_path -> ((mtime_ns, size), rows); see read_from_csv
+        self._csv_cache: Dict[Path, Tuple[Tuple[int, int], List[Dict[str, str]]]] = {}
+        # directory -> (dir mtime_ns, *.txt file names); see _list_txt_files
+        self._listing_cache: Dict[Path, Tuple[int, List[str]]] = {}
         
         # Ensure directories exist
         self.prompts_dir.mkdir(exist_ok=True)
@@ -78,10 +96,10 @@ class FileStorage:
         try:
             with open(filepath, 'w', encoding='utf-8') as f:
                 f.write(content)
-            print(f"✅ Prompt saved to: {filepath}")
+            logger.info("Prompt saved to: %s", filepath)
             return filename
         except Exception as e:
-            print(f"❌ Error saving prompt: {e}")
+            logger.error("Error saving prompt: %s", e)
             raise
     
     def save_result(self, text: str, result_id: Optional[str] = None, metadata: Optional[Dict[str, Any]] = None) -> str:
@@ -112,10 +130,10 @@ class FileStorage:
         try:
             with open(filepath, 'w', encoding='utf-8') as f:
                 f.write(content)
-            print(f"✅ Result saved to: {filepath}")
+            logger.info("Result saved to: %s", filepath)
             return filename
         except Exception as e:
-            print(f"❌ Error saving result: {e}")
+            logger.error("Error saving result: %s", e)
             raise
     
     def load_prompt(self, filename: str) -> str:
@@ -125,7 +143,7 @@ class FileStorage:
             with open(filepath, 'r', encoding='utf-8') as f:
                 return f.read()
         except Exception as e:
-            print(f"❌ Error loading prompt {filename}: {e}")
+            logger.error("Error loading prompt %s: %s", filename, e)
             raise
     
     def load_result(self, filename: str) -> str:
@@ -135,16 +153,30 @@ class FileStorage:
             with open(filepath, 'r', encoding='utf-8') as f:
                 return f.read()
         except Exception as e:
-            print(f"❌ Error loading result {filename}: {e}")
+            logger.error("Error loading result %s: %s", filename, e)
             raise
     
     def list_prompts(self) -> list[str]:
         """List all prompt files."""
-        return [f.name for f in self.prompts_dir.glob("*.txt")]
+        return self._list_txt_files(self.prompts_dir)
     
     def list_results(self) -> list[str]:
         """List all result files."""
-        return [f.name for f in self.results_dir.glob("*.txt")]
+        return self._list_txt_files(self.results_dir)
+    
+    def _list_txt_files(self, directory: Path) -> list[str]:
+        """
+        List the *.txt file names in directory, cached on the directory's mtime.
+        
+        Adding, removing or renaming an entry bumps the directory mtime, so the
+        glob only runs again when the listing can actually have changed.
+        """
+        mtime_ns = directory.stat().st_mtime_ns
+        cached = self._listing_cache.get(directory)
+        if cached is None or cached[0] != mtime_ns:
+            cached = (mtime_ns, [f.name for f in directory.glob("*.txt")])
+            self._listing_cache[directory] = cached
+        return list(cached[1])
     
     def _get_next_prompt_id(self, csv_filename: str, is_rewrite: bool = False, base_id: str = None) -> str:
         """
@@ -230,7 +262,7 @@ class FileStorage:
         
         # Validate LLM name
         if 'llm_name' in prompt_data and prompt_data['llm_name'] not in COMMON_LLMS:
-            print(f"⚠️  Warning: '{prompt_data['llm_name']}' is not in common LLMs list")
+            logger.warning("'%s' is not in common LLMs list", prompt_data['llm_name'])
         
         # CSV headers
         headers = [
@@ -255,13 +287,22 @@ class FileStorage:
                 # Write the data row
                 writer.writerow({key: prompt_data.get(key, '') for key in headers})
                 
-            print(f"✅ Data saved to CSV: {csv_path}")
+            self._csv_cache.pop(csv_path, None)  # next read re-parses the file
+            logger.info("Data saved to CSV: %s", csv_path)
             return str(csv_path)
             
         except Exception as e:
-            print(f"❌ Error saving to CSV: {e}")
+            logger.error("Error saving to CSV: %s", e)
             raise
     
+    def _csv_signature(self, csv_path: Path) -> Optional[Tuple[int, int]]:
+        """Return the (mtime_ns, size) cache key for a CSV file, or None if it does not exist."""
+        try:
+            stat = csv_path.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
     def read_from_csv(self, csv_filename: str) -> List[Dict[str, str]]:
         """
         Read all entries from a CSV file.
@@ -271,6 +312,11 @@ class FileStorage:
             
         Returns:
             List of dictionaries containing prompt data
+            
+        Note:
+            Parsed rows are cached per file and keyed on (mtime, size), so
+            repeated reads of an unchanged file skip the disk entirely.
+            Callers get fresh row dicts and may mutate them freely.
         """
         if not csv_filename.endswith('.csv'):
             csv_filename += '.csv'
@@ -278,18 +324,25 @@ class FileStorage:
         csv_path = self.base_dir / csv_filename
         
         if not csv_path.exists():
-            print(f"❌ CSV file not found: {csv_path}")
+            self._csv_cache.pop(csv_path, None)
+            logger.error("CSV file not found: %s", csv_path)
             return []
         
         try:
-            with open(csv_path, 'r', encoding='utf-8') as csvfile:
-                reader = csv.DictReader(csvfile)
-                data = list(reader)
-                print(f"✅ Loaded {len(data)} entries from CSV: {csv_path}")
-                return data
+            signature = self._csv_signature(csv_path)
+            cached = self._csv_cache.get(csv_path)
+            if cached is None or cached[0] != signature:
+                with open(csv_path, 'r', encoding='utf-8') as csvfile:
+                    reader = csv.DictReader(csvfile)
+                    data = list(reader)
+                    logger.info("Loaded %s entries from CSV: %s", len(data), csv_path)
+                cached = (signature, data)
+                self._csv_cache[csv_path] = cached
+            
+            return [dict(row) for row in cached[1]]
                 
         except Exception as e:
-            print(f"❌ Error reading CSV: {e}")
+            logger.error("Error reading CSV: %s", e)
             raise
     
     def collect_prompt_data_interactive(self) -> Dict[str, str]:
@@ -398,7 +451,7 @@ class FileStorage:
                 if found:
                     matches.append(entry)
         
-        print(f"🔍 Found {len(matches)} matches for '{search_term}'")
+        logger.info("Found %s matches for '%s'", len(matches), search_term)
         return matches
     
     def save_version_to_csv(self, prompt_id: str, version) -> str:
@@ -416,6 +469,22 @@ class FileStorage:
                 - explanation (dict)
                 - created_at (datetime)
         
+        Returns:
+            str: Path to the CSV file
+        """
+        return self.save_versions_to_csv(prompt_id, [version])
+    
+    def save_versions_to_csv(self, prompt_id: str, versions: List[Any]) -> str:
+        """
+        Save several prompt versions to the version tracking CSV in one write.
+        
+        The file is opened once for the whole batch (e.g. original + improved
+        version) instead of once per version.
+        
+        Args:
+            prompt_id: UUID of the parent prompt
+            versions: PromptVersion objects (see save_version_to_csv)
+        
         Returns:
             str: Path to the CSV file
         """
@@ -430,15 +499,18 @@ class FileStorage:
         ]
         
         # Prepare version data
-        version_data = {
-            'prompt_id': str(prompt_id),
-            'version_no': str(version.version_no),
-            'version_uuid': str(version.id),
-            'text': version.text,
-            'source': version.source,
-            'explanation': json.dumps(version.explanation),
-            'timestamp': version.created_at.isoformat()
-        }
+        version_rows = [
+            {
+                'prompt_id': str(prompt_id),
+                'version_no': str(version.version_no),
+                'version_uuid': str(version.id),
+                'text': version.text,
+                'source': version.source,
+                'explanation': json.dumps(version.explanation),
+                'timestamp': version.created_at.isoformat()
+            }
+            for version in versions
+        ]
         
         # Check if file exists to determine if we need headers
         file_exists = csv_path.exists()
@@ -451,14 +523,15 @@ class FileStorage:
                 if not file_exists:
                     writer.writeheader()
                 
-                # Write the data row
-                writer.writerow(version_data)
+                # Write all rows in one pass
+                writer.writerows(version_rows)
                 
-            print(f"✅ Version saved to CSV: {csv_path}")
+            self._csv_cache.pop(csv_path, None)  # next read re-parses the file
+            logger.info("%s version(s) saved to CSV: %s", len(version_rows), csv_path)
             return str(csv_path)
             
         except Exception as e:
-            print(f"❌ Error saving version to CSV: {e}")
+            logger.error("Error saving versions to CSV: %s", e)
             raise
     
     def save_multi_agent_result(
@@ -531,11 +604,12 @@ class FileStorage:
                 # Write the data row
                 writer.writerow({key: data.get(key, '') for key in headers})
             
-            print(f"✅ Multi-agent result saved to CSV: {csv_path}")
+            self._csv_cache.pop(csv_path, None)  # next read re-parses the file
+            logger.info("Multi-agent result saved to CSV: %s", csv_path)
             return str(csv_path)
             
         except Exception as e:
-            print(f"❌ Error saving multi-agent result to CSV: {e}")
+            logger.error("Error saving multi-agent result to CSV: %s", e)
             raise
     
     def record_feedback(
@@ -562,13 +636,13 @@ class FileStorage:
         csv_path = self.base_dir / csv_filename
         
         if not csv_path.exists():
-            print(f"❌ CSV file not found: {csv_path}")
+            logger.error("CSV file not found: %s", csv_path)
             return False
         
         # Read all rows
         data = self.read_from_csv(csv_filename)
         if not data:
-            print(f"❌ No data in CSV: {csv_path}")
+            logger.error("No data in CSV: %s", csv_path)
             return False
         
         # Find the row with matching request_id
@@ -584,7 +658,7 @@ class FileStorage:
                 break
         
         if not row_found:
-            print(f"❌ Request ID not found: {request_id}")
+            logger.error("Request ID not found: %s", request_id)
             return False
         
         # Write back to CSV with extended headers
@@ -601,11 +675,11 @@ class FileStorage:
                 for row in data:
                     writer.writerow({key: row.get(key, '') for key in headers})
             
-            print(f"✅ Feedback recorded for request_id: {request_id}")
+            logger.info("Feedback recorded for request_id: %s", request_id)
             return True
             
         except Exception as e:
-            print(f"❌ Error recording feedback: {e}")
+            logger.error("Error recording feedback: %s", e)
             return False
     
     def get_agent_effectiveness(self, csv_filename: str = 'multi_agent_log.csv', user_id: Optional[str] = None) -> Dict[str, Any]:
@@ -647,45 +721,38 @@ class FileStorage:
         if not data:
             return {}
         
-        # Count wins per agent (judge decisions)
-        wins = {}
-        scores = {}
-        user_wins = {}  # User feedback wins (Darwinian)
-        judge_correct = {}  # Judge correctness tracking
-        
-        total_feedback = 0
+        # Judge wins per agent (original logic)
+        wins = Counter(entry.get('selected_agent') or '' for entry in data)
+        wins.pop('', None)
         
-        for entry in data:
-            # Judge wins (original logic)
-            selected = entry.get('selected_agent', '')
-            if selected:
-                wins[selected] = wins.get(selected, 0) + 1
-            
-            # User feedback wins (Darwinian)
-            agent_winner = entry.get('agent_winner', '')
-            if agent_winner and agent_winner != 'none' and agent_winner != 'template':
-                user_wins[agent_winner] = user_wins.get(agent_winner, 0) + 1
-                total_feedback += 1
-                
-                # Track judge correctness
-                is_correct = entry.get('judge_correct', '').lower() == 'true'
-                if selected not in judge_correct:
-                    judge_correct[selected] = {'correct': 0, 'total': 0}
-                judge_correct[selected]['total'] += 1
-                if is_correct:
-                    judge_correct[selected]['correct'] += 1
-            
-            # Aggregate scores for all agents
-            # Dynamically detect agent columns
-            for key in entry.keys():
-                if key.endswith('_score'):
-                    agent_name = key.replace('_score', '')
-                    if agent_name not in scores:
-                        scores[agent_name] = []
-                    try:
-                        scores[agent_name].append(float(entry[key]))
-                    except (ValueError, TypeError):
-                        pass  # Skip invalid scores
+        # User feedback wins (Darwinian): only rows where the user picked an agent
+        feedback_entries = [
+            entry for entry in data
+            if (entry.get('agent_winner') or '') not in ('', 'none', 'template')
+        ]
+        user_wins = Counter(entry['agent_winner'] for entry in feedback_entries)
+        total_feedback = len(feedback_entries)
+        
+        # Track judge correctness on the rows that received feedback
+        judge_total = Counter(entry.get('selected_agent') or '' for entry in feedback_entries)
+        judge_hits = Counter(
+            entry.get('selected_agent') or '' for entry in feedback_entries
+            if (entry.get('judge_correct') or '').lower() == 'true'
+        )
+        
+        # Aggregate scores for all agents
+        # Agent columns are detected once from the CSV header rather than per row
+        scores = {}
+        for key in data[0].keys():
+            if not key.endswith('_score'):
+                continue
+            values = []
+            for entry in data:
+                try:
+                    values.append(float(entry[key]))
+                except (ValueError, TypeError):
+                    pass  # Skip invalid scores
+            scores[key.replace('_score', '')] = values
         
         # Calculate statistics
         total_requests = len(data)
@@ -695,7 +762,6 @@ class FileStorage:
         all_agents = set(wins.keys()) | set(scores.keys()) | set(user_wins.keys())
         
         for agent in all_agents:
-            agent_judge_correct = judge_correct.get(agent, {'correct': 0, 'total': 0})
             effectiveness[agent] = {
                 "wins": wins.get(agent, 0),
                 "total_requests": total_requests,
@@ -703,7 +769,7 @@ class FileStorage:
                 "avg_score": sum(scores.get(agent, [])) / len(scores.get(agent, [])) if agent in scores and scores[agent] else 0.0,
                 "user_wins": user_wins.get(agent, 0),
                 "user_win_rate": user_wins.get(agent, 0) / total_feedback if total_feedback > 0 else 0.0,
-                "judge_accuracy": agent_judge_correct['correct'] / agent_judge_correct['total'] if agent_judge_correct['total'] > 0 else 0.0
+                "judge_accuracy": judge_hits[agent] / judge_total[agent] if judge_total[agent] > 0 else 0.0
             }
         
         # Add overall feedback metrics
@@ -762,7 +828,7 @@ class FileStorage:
                                 'agent_name': agent_name,
                                 'score': float(entry[score_key]),
                                 'confidence': float(entry[confidence_key]),
-                                'suggestions': json.loads(entry[suggestions_key]),
+                                'suggestions': _json_loads(entry[suggestions_key]),
                                 'improved_prompt': entry[improved_key]
                             })
                         except (ValueError, TypeError, json.JSONDecodeError) as e:
@@ -775,7 +841,7 @@ class FileStorage:
                     'selected_agent': entry.get('selected_agent', ''),
                     'decision_rationale': entry.get('decision_rationale', ''),
                     'agent_contributions': agents,
-                    'vote_breakdown': json.loads(entry.get('vote_breakdown', '{}'))
+                    'vote_breakdown': _json_loads(entry.get('vote_breakdown', '{}'))
                 }
         
         return None  # Not found
@@ -811,10 +877,10 @@ class FileStorage:
         try:
             with open(filepath, 'w', encoding='utf-8') as f:
                 json.dump(versions, f, indent=2)
-            print(f"✅ Version chain saved to: {filepath}")
+            logger.info("Version chain saved to: %s", filepath)
             return filename
         except Exception as e:
-            print(f"❌ Error saving version chain: {e}")
+            logger.error("Error saving version chain: %s", e)
             raise
     
     def load_prompt_version_chain(self, prompt_id: str) -> List[Dict[str, Any]]:
@@ -841,7 +907,7 @@ class FileStorage:
             versions.sort(key=lambda v: v['timestamp'])
             return versions
         except Exception as e:
-            print(f"❌ Error loading version chain: {e}")
+            logger.error("Error loading version chain: %s", e)
             return []
     
     def save_causal_edges(self, prompt_id: str, edges: List[Dict[str, Any]]) -> str:
@@ -866,10 +932,10 @@ class FileStorage:
         try:
             with open(filepath, 'w', encoding='utf-8') as f:
                 json.dump(edges, f, indent=2)
-            print(f"✅ Causal edges saved to: {filepath}")
+            logger.info("Causal edges saved to: %s", filepath)
             return filename
         except Exception as e:
-            print(f"❌ Error saving causal edges: {e}")
+            logger.error("Error saving causal edges: %s", e)
             raise
     
     def load_causal_edges(self, prompt_id: str) -> List[Dict[str, Any]]:
@@ -893,7 +959,7 @@ class FileStorage:
                 edges = json.load(f)
             return edges
         except Exception as e:
-            print(f"❌ Error loading causal edges: {e}")
+            logger.error("Error loading causal edges: %s", e)
             return []
     
     def validate_version_chain(self, versions: List[Dict[str, Any]]) -> bool:
@@ -921,7 +987,7 @@ class FileStorage:
         for version in versions:
             parent_id = version.get('parent_version_id')
             if parent_id is not None and parent_id not in version_ids:
-                print(f"❌ Validation failed: Parent {parent_id} not found in chain")
+                logger.warning("Validation failed: Parent %s not found in chain", parent_id)
                 return False
         
         # Check for cycles using DFS
@@ -949,7 +1015,7 @@ class FileStorage:
         for version in versions:
             if version.get('parent_version_id') is None:
                 if has_cycle(version['version_id']):
-                    print(f"❌ Validation failed: Cycle detected")
+                    logger.warning("Validation failed: Cycle detected")
                     return False
         
         # Check timestamp monotonicity along paths
@@ -961,7 +1027,7 @@ class FileStorage:
                     parent_time = datetime.fromisoformat(parent['timestamp'].replace('Z', '+00:00'))
                     child_time = datetime.fromisoformat(version['timestamp'].replace('Z', '+00:00'))
                     if child_time <= parent_time:
-                        print(f"❌ Validation failed: Timestamp not monotonic for {version['version_id']}")
+                        logger.warning("Validation failed: Timestamp not monotonic for %s", version['version_id'])
                         return False
         
         return True
@@ -1013,7 +1079,7 @@ class FileStorage:
     # Purpose: Export-only CSV generation from database (single source of truth)
     # ============================================================================
     
-    def export_multi_agent_results_to_csv(self, csv_filename='multi_agent_log.csv') -> str:
+    def export_multi_agent_results_to_csv(self, csv_filename='multi_agent_log.csv', versions=None) -> str:
         """
         EXPORT ONLY - Read multi-agent results from database, write to CSV.
         
@@ -1024,6 +1090,7 @@ class FileStorage:
         
         Args:
             csv_filename: CSV filename (default: multi_agent_log.csv)
+            versions: Already-loaded PromptVersion rows (queried when omitted)
             
         Returns:
             str: Path to generated CSV file
@@ -1035,12 +1102,13 @@ class FileStorage:
             raise ValueError("Database session required for export. Initialize FileStorage with db_session parameter.")
         
         # Import CRUD functions
-        import sys
-        sys.path.insert(0, str(Path(__file__).parent.parent))
+        if _PROJECT_ROOT not in sys.path:
+            sys.path.insert(0, _PROJECT_ROOT)
         from packages.db.crud import get_all_prompt_versions
         
         # Query database (single source of truth)
-        versions = get_all_prompt_versions(self.db_session, limit=1000)
+        if versions is None:
+            versions = get_all_prompt_versions(self.db_session, limit=1000)
         
         csv_path = self.base_dir / csv_filename
         
@@ -1057,11 +1125,10 @@ class FileStorage:
             # Group versions by prompt_id
             by_prompt = {}
             for v in versions:
-                if v.prompt_id not in by_prompt:
-                    by_prompt[v.prompt_id] = []
-                by_prompt[v.prompt_id].append(v)
+                by_prompt.setdefault(v.prompt_id, []).append(v)
             
             # Export each prompt's versions
+            rows = []
             for prompt_id, prompt_versions in by_prompt.items():
                 # Find original and agent versions
                 original = prompt_versions[0] if prompt_versions else None
@@ -1083,18 +1150,20 @@ class FileStorage:
                     'structure_improved': agent_versions.get('structure').text if agent_versions.get('structure') else '',
                     'domain_improved': agent_versions.get('domain').text if agent_versions.get('domain') else ''
                 }
-                
-                writer.writerow(row)
+                rows.append(row)
+            
+            writer.writerows(rows)
         
-        print(f"✅ Exported {len(by_prompt)} multi-agent results from DB to: {csv_path}")
+        logger.info("Exported %s multi-agent results from DB to: %s", len(by_prompt), csv_path)
         return str(csv_path)
     
-    def export_temporal_versions_to_csv(self, csv_filename='temporal_versions.csv') -> str:
+    def export_temporal_versions_to_csv(self, csv_filename='temporal_versions.csv', versions=None) -> str:
         """
         EXPORT ONLY - Read temporal version chains from database, write to CSV.
         
         Args:
             csv_filename: CSV filename (default: temporal_versions.csv)
+            versions: Already-loaded PromptVersion rows (queried when omitted)
             
         Returns:
             str: Path to generated CSV file
@@ -1102,11 +1171,12 @@ class FileStorage:
         if not self.db_session:
             raise ValueError("Database session required for export.")
         
-        import sys
-        sys.path.insert(0, str(Path(__file__).parent.parent))
+        if _PROJECT_ROOT not in sys.path:
+            sys.path.insert(0, _PROJECT_ROOT)
         from packages.db.crud import get_all_prompt_versions
         
-        versions = get_all_prompt_versions(self.db_session, limit=1000)
+        if versions is None:
+            versions = get_all_prompt_versions(self.db_session, limit=1000)
         
         csv_path = self.base_dir / csv_filename
         
@@ -1118,8 +1188,8 @@ class FileStorage:
             writer = csv.DictWriter(f, fieldnames=fieldnames)
             writer.writeheader()
             
-            for v in versions:
-                writer.writerow({
+            writer.writerows(
+                {
                     'version_id': str(v.id),
                     'parent_version_id': str(v.parent_version_id) if v.parent_version_id else '',
                     'prompt_id': str(v.prompt_id),
@@ -1128,9 +1198,11 @@ class FileStorage:
                     'change_type': v.change_type,
                     'change_magnitude': v.change_magnitude,
                     'source': v.source
-                })
+                }
+                for v in versions
+            )
         
-        print(f"✅ Exported {len(versions)} temporal versions from DB to: {csv_path}")
+        logger.info("Exported %s temporal versions from DB to: %s", len(versions), csv_path)
         return str(csv_path)
     
     def export_all_to_csv(self) -> Dict[str, str]:
@@ -1143,9 +1215,16 @@ class FileStorage:
         if not self.db_session:
             raise ValueError("Database session required for export.")
         
+        if _PROJECT_ROOT not in sys.path:
+            sys.path.insert(0, _PROJECT_ROOT)
+        from packages.db.crud import get_all_prompt_versions
+        
+        # Both exports read the same rows; query them once
+        versions = get_all_prompt_versions(self.db_session, limit=1000)
+        
         return {
-            "multi_agent": self.export_multi_agent_results_to_csv(),
-            "temporal": self.export_temporal_versions_to_csv()
+            "multi_agent": self.export_multi_agent_results_to_csv(versions=versions),
+            "temporal": self.export_temporal_versions_to_csv(versions=versions)
         }
 
 
@@ -1248,4 +1327,5 @@ print(fibonacci(10))  # Output: 55
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     main()
\ No newline at end of file
@@ -4,10 +4,12 @@ Comprehensive test script for the Enhanced Authentication System
 Tests security features, encryption, rate limiting, and API functionality
 """
 
+import pytest
 import requests
 import time
 import json
 import sys
+from datetime import timedelta
 from typing import Dict, Any
 
 # Test configuration
@@ -313,6 +315,52 @@ class AuthSystemTester:
         
         return results
 
+# ============================================================================
+# verify_token cache (runs without the backend server)
+# ============================================================================
+
+@pytest.fixture
+def auth_module(monkeypatch):
+    """backend/auth.py with a test signing key and an empty token cache."""
+    import auth
+    from jose import jwk
+    
+    monkeypatch.setattr(auth, "ALGORITHM", "HS256")
+    monkeypatch.setattr(auth, "SIGNING_KEY", jwk.construct("test-secret-key", "HS256"))
+    auth._token_cache.clear()
+    yield auth
+    auth._token_cache.clear()
+
+def test_verify_token_cache_hit_returns_same_token_data(auth_module, monkeypatch):
+    """A second verification of the same token is served from the cache."""
+    token = auth_module.create_access_token({"sub": "testuser123"})
+    first = auth_module.verify_token(token)
+    assert first is not None and first.username == "testuser123"
+    
+    # A cache hit must not decode the token again
+    monkeypatch.setattr(auth_module, "_decode_access_token", lambda token: pytest.fail("token re-decoded"))
+    assert auth_module.verify_token(token) is first
+
+def test_verify_token_rejects_cached_token_past_exp(auth_module):
+    """A cached token is re-verified, and rejected, once its exp has passed."""
+    token = auth_module.create_access_token({"sub": "testuser123"}, expires_delta=timedelta(seconds=1))
+    assert auth_module.verify_token(token) is not None
+    
+    # exp is stored in whole seconds, so wait long enough for jose to see it as expired
+    time.sleep(2.1)
+    assert auth_module.verify_token(token) is None
+    assert not auth_module._token_cache
+
+def test_verify_token_does_not_cache_failures(auth_module):
+    """Rejected tokens are never stored, so nothing can be served from the cache for them."""
+    refresh_style = auth_module.jwt.encode(
+        {"sub": "testuser123", "type": "refresh_token"}, auth_module.SIGNING_KEY, algorithm="HS256"
+    )
+    for token in ("invalid_token_123", refresh_style):
+        assert auth_module.verify_token(token) is None
+        assert auth_module.verify_token(token) is None
+    assert not auth_module._token_cache
+
 def main():
     """Main test execution."""
     print("Starting Enhanced Authentication System Tests...")
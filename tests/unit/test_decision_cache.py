@@ -0,0 +1,62 @@
+"""
+Cached multi-agent decisions: a decision served from the cache reports zero
+token spend but keeps the rest of each agent's usage record (e.g. the model).
+"""
+import os
+import sys
+
+# Add the project root and backend directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+from packages.core.agent_coordinator import CoordinatorDecision
+from packages.core.multi_agent import AgentAnalysis, AgentResult, AgentSuggestions
+from routers.prompts import decision_without_spend
+
+MODEL_ID = "llama-3.1-8b-instant"
+
+
+def make_decision() -> CoordinatorDecision:
+    usage = {"prompt_tokens": 120, "completion_tokens": 80, "total_tokens": 200, "cost_usd": 0.00002, "model": MODEL_ID}
+    result = AgentResult(
+        agent_name="syntax",
+        analysis=AgentAnalysis(score=7.5, strengths=["clear"], weaknesses=["short"]),
+        suggestions=AgentSuggestions(suggestions=["add examples"], improved_prompt="improved", confidence=0.8),
+        metadata={},
+        token_usage=usage,
+    )
+    return CoordinatorDecision(
+        final_prompt="improved",
+        selected_agent="syntax",
+        decision_rationale="best score",
+        agent_results=[result],
+        vote_breakdown={"syntax": 1.0},
+        token_usage={"syntax": dict(usage)},
+        total_cost_usd=0.00002,
+        total_tokens=200,
+    )
+
+
+def test_cached_decision_reports_zero_spend():
+    """Counts, cost and totals are zero for a cache hit."""
+    cached = decision_without_spend(make_decision())
+    assert cached.total_tokens == 0
+    assert cached.total_cost_usd == 0.0
+    for usage in (cached.token_usage["syntax"], cached.agent_results[0].token_usage):
+        assert usage["prompt_tokens"] == usage["completion_tokens"] == usage["total_tokens"] == 0
+        assert usage["cost_usd"] == 0.0
+
+
+def test_cached_decision_keeps_model():
+    """Non-spend fields such as the model id survive the zeroing."""
+    cached = decision_without_spend(make_decision())
+    assert cached.token_usage["syntax"]["model"] == MODEL_ID
+    assert cached.agent_results[0].token_usage["model"] == MODEL_ID
+
+
+def test_cached_decision_leaves_stored_decision_untouched():
+    """The decision kept in the cache still carries the original run's usage."""
+    decision = make_decision()
+    decision_without_spend(decision)
+    assert decision.total_tokens == 200
+    assert decision.agent_results[0].token_usage["total_tokens"] == 200
@@ -0,0 +1,100 @@
+"""
+Paging contract of the per-user listings: GET /api/prompts and GET /api/tokens
+return one page plus has_more/next_offset telling the client where the next
+page starts (next_offset is None on the last page).
+"""
+import datetime as dt
+import os
+import sys
+import types
+import uuid
+from contextlib import contextmanager
+
+import pytest
+import sqlalchemy as sa
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+# Add the project root and backend directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+from packages.db.models import Base, Prompt, PromptVersion, TokenUsageRecord
+from routers import prompts
+from routers.auth import get_current_user
+
+USER_ID = "1"
+ROW_COUNT = 5
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Prompts router on an in-memory database seeded with ROW_COUNT prompts and token records for USER_ID."""
+    engine = sa.create_engine("sqlite://", poolclass=sa.pool.StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+
+    start = dt.datetime(2025, 1, 1)
+    with Session(engine) as session:
+        for i in range(ROW_COUNT):
+            created_at = start + dt.timedelta(minutes=i)
+            prompt_id, version_id = uuid.uuid4(), uuid.uuid4()
+            session.add(Prompt(id=prompt_id, user_id=USER_ID, original_text=f"prompt {i}", created_at=created_at))
+            session.add(PromptVersion(id=version_id, prompt_id=prompt_id, version_no=0, text=f"prompt {i}",
+                                      explanation={}, source="original", created_at=created_at))
+            session.add(TokenUsageRecord(prompt_version_id=version_id, prompt_tokens=i, completion_tokens=0,
+                                         total_tokens=i, model="test", cost_usd=0.0, created_at=created_at))
+        # Another user's rows never show up in USER_ID's pages
+        session.add(Prompt(user_id="2", original_text="someone else's prompt", created_at=start))
+        session.commit()
+
+    @contextmanager
+    def get_session():
+        with Session(engine) as session:
+            yield session
+
+    monkeypatch.setattr(prompts, "get_session", get_session)
+    app = FastAPI()
+    app.include_router(prompts.router)
+    app.dependency_overrides[get_current_user] = lambda: types.SimpleNamespace(id=USER_ID)
+    return TestClient(app)
+
+
+def test_prompts_pages_report_has_more_and_next_offset(client):
+    """Pages are newest first; next_offset points at the first prompt of the next page."""
+    first = client.get("/api/prompts", params={"limit": 2}).json()
+    assert [p["summary"] for p in first["data"]] == ["prompt 4", "prompt 3"]
+    assert first["has_more"] is True
+    assert first["next_offset"] == 2
+
+    second = client.get("/api/prompts", params={"limit": 2, "offset": first["next_offset"]}).json()
+    assert [p["summary"] for p in second["data"]] == ["prompt 2", "prompt 1"]
+    assert second["next_offset"] == 4
+
+    last = client.get("/api/prompts", params={"limit": 2, "offset": second["next_offset"]}).json()
+    assert [p["summary"] for p in last["data"]] == ["prompt 0"]
+    assert last["has_more"] is False
+    assert last["next_offset"] is None
+
+
+def test_prompts_page_that_exactly_fits_has_no_more(client):
+    """A page holding exactly the remaining prompts does not claim another page."""
+    page = client.get("/api/prompts", params={"limit": ROW_COUNT}).json()
+    assert len(page["data"]) == ROW_COUNT
+    assert page["has_more"] is False
+    assert page["next_offset"] is None
+
+
+def test_tokens_pages_report_has_more_and_next_offset(client):
+    """Token history pages follow the same contract; totals cover the returned page only."""
+    first = client.get("/api/tokens", params={"limit": 3}).json()
+    assert [r["total_tokens"] for r in first["data"]] == [4, 3, 2]
+    assert first["total_records"] == 3
+    assert first["total_tokens"] == 9
+    assert first["has_more"] is True
+    assert first["next_offset"] == 3
+
+    last = client.get("/api/tokens", params={"limit": 3, "offset": first["next_offset"]}).json()
+    assert [r["total_tokens"] for r in last["data"]] == [1, 0]
+    assert last["has_more"] is False
+    assert last["next_offset"] is None